@@ -0,0 +1,77 @@
+"""
+Benchmarks the time to optimal of the batching model with and without the batch
+symmetry breaking constraints, on single-course models of realistic sizes.
+
+    python -m benchmark.batching_symmetry --sizes 50 150 400 1000 --time-limit 60
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from model.batching.schema import CourseStats, TraineeShift, ModelInput
+from model.batching.solver import solve_courses
+from schema import ModelParams
+
+
+def course_input(size: int, capacity: int = 40, trainers: int = 3, seed: int = 0) -> ModelInput:
+    rnd = random.Random(seed)
+    patterns = [[rnd.choice([0, 0, 1, 2, 3]) for _ in range(3)] for _ in range(12)]
+
+    shifts = {}
+    for i in range(size):
+        w1, w2, w3 = rnd.choice(patterns)
+        shifts[f"E{i}"] = TraineeShift(name=f"E{i}", week1=w1, week2=w2, week3=w3, week4=w1)
+
+    course = CourseStats(
+        company="CO1",
+        name=f"Course {size}",
+        trainees=list(shifts),
+        count_trainee=size,
+        count_trainers=trainers,
+        max_venue_capacity_available=capacity
+    )
+
+    return ModelInput(courses={course.name: course}, shifts=shifts)
+
+
+def run(params: ModelParams, data: ModelInput):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = solve_courses(params, "CO1", data, params.num_search_workers)
+
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 150, 400, 1000])
+    parser.add_argument("--time-limit", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    params = ModelParams(
+        file_master_venue="",
+        file_master_trainer="",
+        file_master_course="",
+        file_master_trainee="",
+        file_master_course_trainer="",
+        file_master_course_sequence="",
+        file_master_course_trainee="",
+        start_date="2026-03-02",
+        days=20,
+        max_time_in_seconds=args.time_limit,
+        num_search_workers=args.workers
+    )
+
+    print(f"{'trainees':>8} | {'batches':>7} | {'without symmetry breaking':>28} | {'with symmetry breaking':>28}")
+    for size in args.sizes:
+        data = course_input(size)
+
+        cells = []
+        for is_breaking in (False, True):
+            result, elapsed = run(params.model_copy(update={"is_breaking_batch_symmetry": is_breaking}), data)
+            cells.append(f"{result.status:>10} {elapsed:7.2f}s obj={result.objective}")
+
+        print(f"{size:>8} | {next(iter(data.courses.values())).max_batches:>7} | {cells[0]:>28} | {cells[1]:>28}")
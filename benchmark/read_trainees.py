@@ -0,0 +1,155 @@
+"""
+Benchmarks the merge/groupby group formation of scheduling read_trainees against the
+original per-trainee loop, and checks both produce the same groups.
+
+    python -m benchmark.read_trainees --trainees 20000
+"""
+import argparse
+import tempfile
+import time
+import pandas as pd
+
+from model.scheduling.schema import Trainee, Group
+from model.scheduling.data import read_trainees
+from model.master.data import read_master
+from schema import ModelParams
+from .synthetic import write_dataset
+
+
+def read_trainees_loop(params: ModelParams):
+    """The original O(trainees × enrollments) implementation, kept as the reference."""
+    _df_trainee = pd.read_csv(params.file_master_trainee)
+    _df_trainee['employee_id'] = _df_trainee['employee_id'].astype(str)
+    _df_trainee = _df_trainee.drop_duplicates(subset=["employee_id"])
+    _df_trainee = _df_trainee[_df_trainee['employee_id'].astype(str).str.strip() != '']
+
+    if params.companies is not None:
+        _df_trainee = _df_trainee[_df_trainee['company'].isin(params.companies)]
+
+
+    if 'is_available_saturday' not in _df_trainee.columns:
+        _df_trainee['is_available_saturday'] = False
+        
+    _df_trainee['cycle'] = _df_trainee['is_available_saturday'].apply(lambda x: "WEnd" if x else "WDays")
+    _df_trainee['cycle'] = 'WEnd'
+
+    _df_enrollment = pd.read_csv(params.file_master_course_trainee)
+    _df_enrollment = _df_enrollment[
+        _df_enrollment["course_name"].isin(
+            _df_enrollment.groupby("course_name")["employee_id"].nunique().loc[lambda s: s >= params.minimum_course_participant].index
+        )
+    ]
+
+    _df_enrollment['employee_id'] = _df_enrollment['employee_id'].astype(str)
+    _df_enrollment['course_name'] = _df_enrollment['course_name'].str.strip()
+    _df_enrollment = _df_enrollment[_df_enrollment['course_exist'] == True]
+
+    if params.course_stream is not None:
+        _df_course = pd.read_csv(params.file_master_course)
+        _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
+
+        _course_list = _df_course['course_name'].drop_duplicates().tolist()
+        _df_enrollment = _df_enrollment[_df_enrollment["course_name"].isin(_course_list)]
+
+    
+    if params.is_considering_shift and params.file_master_course_batch is not None:
+        dfs = []
+        for file in params.file_master_course_batch:
+            dfs.append(pd.read_csv(file))
+
+        _df_batch = pd.concat(dfs, ignore_index=True)
+        _df_batch['course_name'] = _df_batch['course_name'].astype(str).str.strip()
+        _df_batch['trainee_id'] = _df_batch['trainee_id'].astype(str).str.strip()
+        
+        batch_lookup = _df_batch.set_index(["company", "course_name", "trainee_id"])["batch_no"]
+
+
+    _trainees = []
+    for _, trainee_row in _df_trainee.iterrows():
+        try:
+            trainee_name = trainee_row['employee_id']
+            trainee_cycle = trainee_row['cycle']
+            trainee_company = trainee_row['company']
+
+            # Get courses for this trainee from enrollment dataframe
+            enrolled_courses = _df_enrollment[_df_enrollment['employee_id'] == trainee_name]['course_name'].drop_duplicates().tolist()
+
+            if enrolled_courses:  # Only include trainees with at least one course
+                enrolled_courses_batches = []
+                for course in enrolled_courses:
+                    if not params.is_considering_shift or params.file_master_course_batch is None:
+                        batch_no = 1
+                    
+                    else:
+                        batch_no = batch_lookup.get((trainee_company, course, trainee_name), 1)
+                    
+                    enrolled_courses_batches.append(
+                        f"[{trainee_company}]-[{course}]-[{batch_no}]"
+                    )
+
+                _trainees.append(
+                    Trainee(
+                        company=trainee_company,
+                        name=trainee_name,
+                        courses=enrolled_courses_batches,
+                        cycle=trainee_cycle
+                    )
+                )
+                # print("Added trainee:", trainee_name, "Shift:", trainee_shift, "Cycle:", trainee_cycle, "Courses:", enrolled_courses)
+
+        except Exception as e:
+            continue
+
+
+    _groups = {}
+    for trainee in _trainees:
+        course_key = tuple(sorted(trainee.courses))
+        # group_key = tuple(list(course_key) + [trainee.shift, trainee.cycle])
+        group_key = tuple(list(course_key))
+        
+        if group_key not in _groups:
+            _groups[group_key] = {
+                "name": f"G{len(_groups) + 1}",
+                "courses": list(course_key),
+                "trainees": [],
+                "cycle": trainee.cycle
+            }
+
+        _groups[group_key]["trainees"].append(trainee.name)
+
+    groups = {}
+    for value in _groups.values():
+        group = Group(**value)
+        groups[group.name] = group
+
+    print("Len Trainees:", len(_trainees), "\nLen Groups:", len(groups))
+
+    return groups
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trainees", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=60)
+    parser.add_argument("--companies", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        params = write_dataset(
+            path, companies=args.companies, trainees=args.trainees, courses=args.courses, master_cache_dir=None
+        )
+
+        start = time.perf_counter()
+        groups_loop = read_trainees_loop(params)
+        time_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        groups = read_trainees(params, read_master(params))
+        time_vectorized = time.perf_counter() - start
+
+    same = [g.model_dump() for g in groups_loop.values()] == [g.model_dump() for g in groups.values()]
+
+    print(f"\nTrainees: {args.trainees}, Groups: {len(groups)}, Same groups: {same}")
+    print(f"Loop:       {time_loop:8.2f}s")
+    print(f"Vectorized: {time_vectorized:8.2f}s  ({time_loop / max(time_vectorized, 1e-9):.1f}x)")
@@ -0,0 +1,111 @@
+"""
+Compares the size of the scheduling model with the trainer max-one-company-per-day
+constraint in its legacy form and in the current reformulation, both posted on the same
+model of a multi-company synthetic dataset.
+
+    python -m benchmark.scheduling_model_size --companies 2 4 6
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from model.scheduling.data import read_data
+from model.scheduling.schema import ModelInput, ScheduleModel
+from model.scheduling.solver import build_model
+from schema import ModelParams
+from .synthetic import write_dataset
+
+
+def add_legacy_trainer_company_day(schedule: ScheduleModel, data: ModelInput, days: int):
+    """The original trainer × course × session × venue × company × day formulation."""
+    model = schedule.model
+    V = data.venues
+    S = schedule.sessions
+
+    unique_companies = list(set(company for v in V.values() for company in v.company))
+    trainer_day_company = {}
+
+    for trainer in data.trainers:
+        for day in range(days):
+            for company in unique_companies:
+                trainer_day_company[trainer, day, company] = model.NewBoolVar(
+                    f"legacy_trainer_{trainer}_day_{day}_company_{company}"
+                )
+
+        for course in schedule.eligible.by_trainer[trainer]:
+            if course not in S:
+                continue
+
+            for session in S[course]:
+                for venue in V.values():
+                    if (course, session, venue.name) not in schedule.venue_session:
+                        continue
+
+                    for company in venue.company:
+                        for day in range(days):
+                            model.Add(
+                                schedule.day_session[course, session] == day
+                            ).OnlyEnforceIf([
+                                schedule.trainer_session[course, session, trainer],
+                                schedule.venue_session[course, session, venue.name],
+                                trainer_day_company[trainer, day, company]
+                            ])
+
+        for day in range(days):
+            model.Add(
+                sum(trainer_day_company[trainer, day, company] for company in unique_companies) <= 1
+            )
+
+
+def model_size(schedule: ScheduleModel) -> tuple[int, int]:
+    proto = schedule.model.Proto()
+    return len(proto.variables), len(proto.constraints)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, nargs="+", default=[2, 4, 6])
+    parser.add_argument("--trainees", type=int, default=120, help="per company")
+    parser.add_argument("--courses", type=int, default=15)
+    parser.add_argument("--trainers", type=int, default=20)
+    parser.add_argument("--venues", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'companies':>9} | {'without':>17} | {'legacy':>17} | {'reformulated':>17} | {'build legacy':>12} | {'build new':>9}")
+    for companies in args.companies:
+        with tempfile.TemporaryDirectory() as path:
+            params = write_dataset(
+                path,
+                companies=companies,
+                trainees=args.trainees * companies,
+                courses=args.courses,
+                trainers=args.trainers,
+                venues=args.venues,
+                master_cache_dir=None,
+                is_limiting_trainer_company=True
+            )
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                data = read_data(params)
+
+        cells = []
+        base = params.model_copy(update={"is_limiting_trainer_company": False})
+
+        schedule = build_model(base, data)
+        cells.append(model_size(schedule))
+
+        start = time.perf_counter()
+        schedule = build_model(base, data)
+        add_legacy_trainer_company_day(schedule, data, params.days)
+        time_legacy = time.perf_counter() - start
+        cells.append(model_size(schedule))
+
+        start = time.perf_counter()
+        schedule = build_model(params, data)
+        time_new = time.perf_counter() - start
+        cells.append(model_size(schedule))
+
+        sizes = " | ".join(f"{v:>7}v {c:>8}c" for v, c in cells)
+        print(f"{companies:>9} | {sizes} | {time_legacy:>11.2f}s | {time_new:>8.2f}s")
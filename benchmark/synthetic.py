@@ -0,0 +1,159 @@
+import os
+import random
+import pandas as pd
+
+from schema import ModelParams
+from model.scheduling.schema import Calendar
+
+
+SHIFT_LABELS = ["Non Shift", "Shift 1", "Shift 2", "Shift 3"]
+
+
+def write_dataset(
+    path: str,
+    companies: int = 2,
+    trainees: int = 2000,
+    courses: int = 40,
+    trainers: int = 30,
+    venues: int = 6,
+    courses_per_trainee: int = 4,
+    blocked: int = 0,
+    seed: int = 0,
+    **params
+) -> ModelParams:
+    """
+    Writes a synthetic master-data set shaped like the production CSVs and returns
+    the ModelParams pointing at it. Extra keyword arguments override ModelParams fields.
+    With blocked > 0 it also writes that many blocked-schedule rows and turns on
+    is_blocking_schedule.
+    """
+    rnd = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+
+    company_names = [f"CO{i + 1}" for i in range(companies)]
+
+    # --- Courses ---
+    course_rows = []
+    for company in company_names:
+        for i in range(courses):
+            course_rows.append({
+                "company": company,
+                "course_name": f"{company} - Course {i + 1:03d}",
+                "stream": rnd.choice(["Finance", "Operation", "Safety"]),
+                "duration_minutes": rnd.choice([60, 120, 120, 180, 240]),
+            })
+    df_course = pd.DataFrame(course_rows)
+
+    # --- Sequences (chains inside each company) ---
+    sequence_rows = []
+    for company in company_names:
+        names = df_course[df_course["company"] == company]["course_name"].tolist()
+        for i in range(1, len(names)):
+            if rnd.random() < 0.2:
+                sequence_rows.append({
+                    "course_name": names[i],
+                    "prerequisite_course_name": names[rnd.randrange(0, i)],
+                    "is_global_sequence": rnd.random() < 0.5,
+                })
+    df_sequence = pd.DataFrame(
+        sequence_rows, columns=["course_name", "prerequisite_course_name", "is_global_sequence"]
+    )
+
+    # --- Trainees ---
+    patterns = [
+        [rnd.choice([0, 0, 1, 2, 3]) for _ in range(4)]
+        for _ in range(12)
+    ]
+    trainee_rows = []
+    for i in range(trainees):
+        pattern = rnd.choice(patterns)
+        trainee_rows.append({
+            "employee_id": str(100000 + i),
+            "company": company_names[i % companies],
+            "shift_w1": SHIFT_LABELS[pattern[0]],
+            "shift_w2": SHIFT_LABELS[pattern[1]],
+            "shift_w3": SHIFT_LABELS[pattern[2]],
+            "shift_w4": SHIFT_LABELS[pattern[3]],
+            "is_available_saturday": rnd.random() < 0.3,
+        })
+    df_trainee = pd.DataFrame(trainee_rows)
+
+    # --- Enrollments ---
+    enrollment_rows = []
+    for row in trainee_rows:
+        names = df_course[df_course["company"] == row["company"]]["course_name"].tolist()
+        for course_name in rnd.sample(names, min(courses_per_trainee, len(names))):
+            enrollment_rows.append({
+                "employee_id": row["employee_id"],
+                "course_name": course_name,
+                "course_exist": True,
+            })
+    df_enrollment = pd.DataFrame(enrollment_rows)
+
+    # --- Trainers ---
+    df_trainer = pd.DataFrame({"trainer_id": [str(5000 + i) for i in range(trainers)]})
+
+    eligible_rows = []
+    for _, course_row in df_course.iterrows():
+        for trainer_id in rnd.sample(df_trainer["trainer_id"].tolist(), min(3, trainers)):
+            eligible_rows.append({
+                "trainer_id": trainer_id,
+                "company": course_row["company"],
+                "course_name": course_row["course_name"],
+            })
+    df_eligible = pd.DataFrame(eligible_rows)
+
+    # --- Venues ---
+    venue_rows = []
+    for company in company_names:
+        for i in range(venues):
+            venue_rows.append({
+                "venue_name": f"{company} Room {i + 1}",
+                "company": company,
+                "capacity": rnd.choice([20, 30, 40, 60]),
+                "is_virtual": i == venues - 1,
+            })
+    df_venue = pd.DataFrame(venue_rows)
+
+    # --- Blocked schedule ---
+    calendar = Calendar(start_date=params.get("start_date", "2026-03-02"), days=params.get("days", 20))
+    blocked_rows = []
+    for _ in range(blocked):
+        enrollment = rnd.choice(enrollment_rows)
+        start_hour = rnd.randrange(8, 16)
+        blocked_rows.append({
+            "course_name": enrollment["course_name"],
+            "trainer_id": rnd.choice(df_eligible[df_eligible["course_name"] == enrollment["course_name"]]["trainer_id"].tolist()),
+            "employee_id": enrollment["employee_id"],
+            "date": rnd.choice(calendar.dates).date,
+            "start_time": f"{start_hour:02d}:00",
+            "end_time": f"{min(start_hour + rnd.choice([1, 2, 4]), 16):02d}:00",
+        })
+
+    if blocked:
+        file = os.path.join(path, "blocked_schedule.csv")
+        pd.DataFrame(blocked_rows).to_csv(file, index=False)
+        params.setdefault("file_blocked_schedule", file)
+        params.setdefault("is_blocking_schedule", True)
+
+    files = {
+        "file_master_venue": df_venue,
+        "file_master_trainer": df_trainer,
+        "file_master_course": df_course,
+        "file_master_trainee": df_trainee,
+        "file_master_course_trainer": df_eligible,
+        "file_master_course_sequence": df_sequence,
+        "file_master_course_trainee": df_enrollment,
+    }
+
+    for key, df in files.items():
+        file = os.path.join(path, f"{key.removeprefix('file_master_')}.csv")
+        df.to_csv(file, index=False)
+        params[key] = params.get(key, file)
+
+    params.setdefault("start_date", "2026-03-02")
+    params.setdefault("days", 20)
+    params.setdefault("companies", company_names)
+    params.setdefault("report_name", "synthetic")
+
+    return ModelParams(**params)
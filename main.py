@@ -2,6 +2,7 @@ import json
 import os
 # from solver import run_solver
 from schema import ModelParams
+from model.master.data import read_master
 from model.batching.solver import run_solver as batching_solver
 from model.scheduling.solver import run_solver as scheduling_solver
 
@@ -16,11 +17,13 @@ if __name__ == "__main__":
         params = json.load(f)
         params = ModelParams(**params)
 
+    master = read_master(params)
+
     if params.is_splitting_batch:
         params.file_master_course_batch = [f"export/{params.report_name}_batch.csv"]
-        batching_solver(params)
+        batching_solver(params, master)
 
     if params.is_scheduling_course:
-        scheduling_solver(params)
+        scheduling_solver(params, master)
 
     
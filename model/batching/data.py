@@ -1,57 +1,80 @@
 from .schema import *
 from schema import ModelParams
+from model.master.data import read_master
+from model.master.schema import MasterData
 import pandas as pd
 from pygments import highlight, lexers, formatters
+from typing import Optional
 import json
 
 
-def read_data(params: ModelParams, company: str) -> ModelInput:
+def read_data(params: ModelParams, master: Optional[MasterData] = None) -> dict[str, ModelInput]:
+    """
+    Reads the batching input of every company in params.companies. The master frames are
+    filtered once and partitioned by company, so no company re-reads or re-filters them.
+    """
+    if master is None:
+        master = read_master(params)
 
-    courses = read_courses(params, company)
-    shifts = read_trainees(params, company)
+    courses = read_courses(params, master)
+    shifts = read_trainees(params, master)
 
-    print_group = {group.name: group.model_dump() for group in courses.values()}
-    for key in list(print_group.keys()):
-        print_group[key]["trainees"] = len(print_group[key]["trainees"])
-        print_group[key]["max_batches"] = courses[key].max_batches
+    data = {}
+    for company in params.companies:
+        company_courses = courses.get(company, {})
 
-    print("\n", highlight(json.dumps(print_group, indent=4), lexers.JsonLexer(), formatters.TerminalFormatter()), "\n")
+        print_group = {group.name: group.model_dump() for group in company_courses.values()}
+        for key in list(print_group.keys()):
+            print_group[key]["trainees"] = len(print_group[key]["trainees"])
+            print_group[key]["max_batches"] = company_courses[key].max_batches
 
-    print("Len Courses: ", len(courses))
+        print("\n", highlight(json.dumps(print_group, indent=4), lexers.JsonLexer(), formatters.TerminalFormatter()), "\n")
 
-    return ModelInput(
-        courses=courses,
-        shifts=shifts
-    )
+        print(f"Len Courses {company}: ", len(company_courses))
+
+        data[company] = ModelInput(
+            courses=company_courses,
+            shifts=shifts.get(company, {})
+        )
 
+    return data
 
-def read_courses(params: ModelParams, company: str):
-    _df_venue = pd.read_csv(params.file_master_venue)
-    _df_venue = _df_venue[_df_venue['company']==company]
-    max_venue_capacity_available = _df_venue['capacity'].max()
 
-    _df_trainee = pd.read_csv(params.file_master_trainee)
-    _df_trainee['employee_id'] = _df_trainee['employee_id'].astype(str).str.strip()
-    _df_trainee['company'] = _df_trainee['company'].astype(str).str.strip()
+def _read_trainee_frame(master: MasterData) -> pd.DataFrame:
+    _df_trainee = master.trainee.dropna(subset=["employee_id"])
     _df_trainee = _df_trainee.drop_duplicates(subset=["employee_id"])
-    _df_trainee = _df_trainee[_df_trainee['employee_id'].astype(str).str.strip() != '']
-    _df_trainee = _df_trainee[_df_trainee['company']==company]
-    trainee_list = _df_trainee['employee_id'].unique().tolist()
-    print("Len Trainee List: ", len(trainee_list))
+    _df_trainee = _df_trainee[_df_trainee['employee_id'] != '']
 
+    return _df_trainee
 
-    _df_enrollment = pd.read_csv(params.file_master_course_trainee)
-    _df_enrollment['employee_id'] = _df_enrollment['employee_id'].astype(str).str.strip()
-    _df_enrollment['course_name'] = _df_enrollment['course_name'].astype(str).str.strip()
+
+def _read_enrollment_frame(params: ModelParams, master: MasterData) -> pd.DataFrame:
+    _df_enrollment = master.course_trainee
     _df_enrollment = _df_enrollment[_df_enrollment['course_exist'] == True]
 
-    if params.course_stream is not None or params.companies is not None:
-        _df_course = pd.read_csv(params.file_master_course)
-        _df_course['stream'] = _df_course['stream'].astype(str).str.strip()
-        _df_course['company'] = _df_course['company'].astype(str).str.strip()
+    if params.course_stream is not None:
+        _df_course = master.course
+        _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
+
+        _course_list = _df_course['course_name'].drop_duplicates().tolist()
+        _df_enrollment = _df_enrollment[_df_enrollment["course_name"].isin(_course_list)]
+
+    return _df_enrollment
+
+
+def read_courses(params: ModelParams, master: MasterData) -> dict[str, dict[str, CourseStats]]:
+    _df_venue = master.venue
+    max_venue_capacity_available = _df_venue.groupby('company')['capacity'].max().to_dict()
+
+    _df_trainee = _read_trainee_frame(master)
+    _df_trainee = _df_trainee[_df_trainee['company'].isin(params.companies)]
+    print("Len Trainee List: ", _df_trainee.groupby('company', sort=False).size().to_dict())
+
+    _df_enrollment = _read_enrollment_frame(params, master)
 
-        if params.companies is not None:
-            _df_course = _df_course[_df_course["company"].isin(params.companies)]
+    if params.companies is not None:
+        _df_course = master.course
+        _df_course = _df_course[_df_course["company"].isin(params.companies)]
 
         if params.course_stream is not None:
             _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
@@ -59,63 +82,50 @@ def read_courses(params: ModelParams, company: str):
         _course_list = _df_course['course_name'].drop_duplicates().tolist()
         _df_enrollment = _df_enrollment[_df_enrollment["course_name"].isin(_course_list)]
 
-    _df_enrollment = _df_enrollment[_df_enrollment["employee_id"].isin(trainee_list)]
+    # Partition: every enrollment row gets the company of its trainee
+    _df_enrollment = _df_enrollment[['employee_id', 'course_name']].merge(
+        _df_trainee[['employee_id', 'company']],
+        on='employee_id',
+        how='inner',
+        sort=False
+    ).drop_duplicates(subset=['company', 'course_name', 'employee_id'])
 
-
-    _df_trainer = pd.read_csv(params.file_master_trainer)
-    _df_trainer = _df_trainer.drop_duplicates(subset=["trainer_id"])
-    _df_trainer['trainer_id'] = _df_trainer['trainer_id'].astype(str).str.strip()
+    _df_trainer = master.trainer.dropna(subset=["trainer_id"])
     _df_trainer = _df_trainer[_df_trainer['trainer_id'] != '']
-    trainer_list = _df_trainer['trainer_id'].unique().tolist()
-    
-    _df_eligible = pd.read_csv(params.file_master_course_trainer)
-    _df_eligible['trainer_id'] = _df_eligible['trainer_id'].astype(str).str.strip()
-    _df_eligible = _df_eligible[_df_eligible["trainer_id"].isin(trainer_list)]
+    trainer_list = set(_df_trainer['trainer_id'])
 
+    eligibility = master.eligibility
 
-    course_list = _df_enrollment['course_name'].unique().tolist()
-    print("Len Course List: ", len(course_list))
-    
     courses = {}
-    for course in course_list:
-        trainees = _df_enrollment[_df_enrollment['course_name'] == course]['employee_id'].unique().tolist()
-        trainer = _df_eligible[_df_eligible['course_name'] == course]['trainer_id'].unique().tolist()
-
-        if trainees and trainer:
-            courses[course] = CourseStats(
-                company=company,
-                name=course,
-                trainees=trainees,
-                count_trainee=len(trainees),
-                count_trainers=len(trainer),
-                max_venue_capacity_available=max_venue_capacity_available
-            )
+    for company, _df_company in _df_enrollment.groupby('company', sort=False):
+        course_trainees = _df_company.groupby('course_name', sort=False)['employee_id'].agg(list)
+        print(f"Len Course List {company}: ", len(course_trainees))
+
+        courses[company] = {}
+        for course, trainees in course_trainees.items():
+            trainer = [t for t in eligibility.trainers_of(course) if t in trainer_list]
+
+            if trainees and trainer:
+                courses[company][course] = CourseStats(
+                    company=company,
+                    name=course,
+                    trainees=trainees,
+                    count_trainee=len(trainees),
+                    count_trainers=len(trainer),
+                    max_venue_capacity_available=max_venue_capacity_available.get(company)
+                )
 
     return courses
 
 
-def read_trainees(params: ModelParams, company: str):
-    _df_trainee = pd.read_csv(params.file_master_trainee)
-    _df_trainee['employee_id'] = _df_trainee['employee_id'].astype(str)
-    _df_trainee = _df_trainee.drop_duplicates(subset=["employee_id"])
-    _df_trainee = _df_trainee[_df_trainee['employee_id'].astype(str).str.strip() != '']
-    _df_trainee['company'] = _df_trainee['company'].astype(str).str.strip()
-    _df_trainee = _df_trainee[_df_trainee['company']==company]
-
-    _df_enrollment = pd.read_csv(params.file_master_course_trainee)
-    _df_enrollment['employee_id'] = _df_enrollment['employee_id'].astype(str)
-    _df_enrollment['course_name'] = _df_enrollment['course_name'].str.strip()
-    _df_enrollment = _df_enrollment[_df_enrollment['course_exist'] == True]
+def read_trainees(params: ModelParams, master: MasterData) -> dict[str, dict[str, TraineeShift]]:
+    _df_trainee = _read_trainee_frame(master)
+    _df_trainee = _df_trainee[_df_trainee['company'].isin(params.companies)]
 
-    if params.course_stream is not None:
-        _df_course = pd.read_csv(params.file_master_course)
-        _df_course['stream'] = _df_course['stream'].astype(str).str.strip()
-        _df_course['course_name'] = _df_course['course_name'].astype(str).str.strip()
-        _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
+    # Only trainees with at least one course
+    _df_enrollment = _read_enrollment_frame(params, master)
+    _df_trainee = _df_trainee[_df_trainee['employee_id'].isin(_df_enrollment['employee_id'])].copy()
 
-        _course_list = _df_course['course_name'].drop_duplicates().tolist()
-        _df_enrollment = _df_enrollment[_df_enrollment["course_name"].isin(_course_list)]
-    
     mapping = {
         "Shift 1": 1,
         "Shift 2": 2,
@@ -128,30 +138,18 @@ def read_trainees(params: ModelParams, company: str):
     )
 
     shifts = {}
-    for _, trainee_row in _df_trainee.iterrows():
-        try:
-            trainee_name = trainee_row['employee_id']
-
-            shift_w1 = trainee_row['shift_w1']
-            shift_w2 = trainee_row['shift_w2']
-            shift_w3 = trainee_row['shift_w3']
-            shift_w4 = trainee_row['shift_w4']
-            shift_w4 = shift_w1
-            
-            # Get courses for this trainee from enrollment dataframe
-            enrolled_courses = _df_enrollment[_df_enrollment['employee_id'] == trainee_name]['course_name'].drop_duplicates().tolist()
-
-            if enrolled_courses:  # Only include trainees with at least one course
-                shifts[trainee_name] = TraineeShift(
-                    name=trainee_name,
-                    week1=shift_w1,
-                    week2=shift_w2,
-                    week3=shift_w3,
-                    week4=shift_w4
-                )
-  
-        except Exception as e:
-            # print(f"Error processing trainee row: {trainee_row}, error: {e}")
-            continue
+    for company, _df_company in _df_trainee.groupby('company', sort=False):
+        shifts[company] = {}
+
+        for trainee_name, shift_w1, shift_w2, shift_w3 in zip(
+            _df_company['employee_id'], _df_company['shift_w1'], _df_company['shift_w2'], _df_company['shift_w3']
+        ):
+            shifts[company][trainee_name] = TraineeShift(
+                name=trainee_name,
+                week1=shift_w1,
+                week2=shift_w2,
+                week3=shift_w3,
+                week4=shift_w1
+            )
 
-    return shifts
\ No newline at end of file
+    return shifts
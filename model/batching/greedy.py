@@ -0,0 +1,150 @@
+from schema import ModelParams
+from .schema import *
+from .utils import *
+
+
+def week_shift(patterns: list[list[int]], week: int) -> int:
+    """Overlapped shift of a set of rotating patterns in a week, SHIFT3 if they cannot share it."""
+    shifts = {pattern[week] for pattern in patterns}
+
+    if SHIFT3 in shifts or {1, 2} <= shifts:
+        return SHIFT3
+
+    return max(shifts, default=0)
+
+
+def greedy_course(course: CourseStats, patterns: dict[str, list[int]]) -> Optional[list[Batch]]:
+    """
+    Packs the trainees of one course into at most max_batches batches without CP-SAT.
+
+    First-fit decreasing over the trainees, most constrained first: earliest week where the
+    trainee is not on Shift 3, Shift 1 and Shift 2 before NonShift, fewest available weeks.
+    A trainee goes into the first batch of that week it can join, else a new batch opens in
+    that week. Once max_batches are open, the trainees left go into the first batch they can
+    join in a later week they are available, moving the batch there when all its trainees
+    can follow. Batches of the same week are then evened out, largest to smallest.
+
+    Returns None when a trainee fits in no batch, e.g. it is on Shift 3 in every week or
+    every batch it could join is full.
+    """
+    capacity = course.max_venue_capacity_available
+    order = {i: n for n, i in enumerate(course.trainees)}
+
+    def pattern_of(i):
+        return patterns.get(i, [0] * len(WEEKS))
+
+    def joins(i, batch, week):
+        """Room left and, in that week, no Shift 3 and not Shift 1 with Shift 2."""
+        shifts = {pattern_of(j)[week] for j in batch.trainees + [i]}
+        return len(batch.trainees) < capacity and SHIFT3 not in shifts and not {1, 2} <= shifts
+
+    weeks = {i: [w for w in WEEKS if pattern_of(i)[w] != SHIFT3] for i in course.trainees}
+    if any(not available for available in weeks.values()):
+        return None
+
+    trainees = sorted(
+        course.trainees,
+        key=lambda i: (weeks[i][0], pattern_of(i)[weeks[i][0]] == 0, len(weeks[i]), order[i])
+    )
+
+    batches = []
+    spilled = []
+    for i in trainees:
+        week = weeks[i][0]
+        batch = next((b for b in batches if b.week == week and joins(i, b, week)), None)
+
+        if batch is None and len(batches) < course.max_batches:
+            batch = Batch(course=course.name, week=week, trainees=[], week_shifts=[])
+            batches.append(batch)
+
+        if batch is None:
+            spilled.append(i)
+            continue
+
+        batch.trainees.append(i)
+
+    for i in spilled:
+        # Batches already in the week first, then the ones that would have to move
+        week, batch = next(
+            (
+                (w, b) for w in weeks[i][1:]
+                    for b in sorted(batches, key=lambda b: b.week != w)
+                        if joins(i, b, w)
+            ),
+            (None, None)
+        )
+        if batch is None:
+            return None
+
+        batch.week = week
+        batch.trainees.append(i)
+
+    for w in WEEKS:
+        week_batches = [b for b in batches if b.week == w]
+
+        while len(week_batches) > 1:
+            largest = max(week_batches, key=lambda b: len(b.trainees))
+            smallest = min(week_batches, key=lambda b: len(b.trainees))
+            if len(largest.trainees) - len(smallest.trainees) <= 1:
+                break
+
+            i = next((i for i in reversed(largest.trainees) if joins(i, smallest, w)), None)
+            if i is None:
+                break
+
+            largest.trainees.remove(i)
+            smallest.trainees.append(i)
+
+    for batch in batches:
+        batch.trainees.sort(key=order.get)
+        batch.week_shifts = [week_shift([patterns[i] for i in batch.trainees if i in patterns], v) for v in WEEKS]
+
+    # Same order as the symmetry breaking of the CP model: largest first, then by week
+    return sorted(batches, key=lambda b: (-len(b.trainees), b.week))
+
+
+def batching_objective(courses: dict[str, CourseStats], batches: list[Batch]) -> float:
+    """Scores a batching the way the CP-SAT objective does, unused candidate batches count as fully feasible."""
+    makespan = max((b.week + 1 for b in batches), default=0)
+
+    spread = 0
+    feasible = 0
+    for course in courses.values():
+        sizes = [len(b.trainees) for b in batches if b.course == course.name]
+        if sizes:
+            spread += max(sizes) - min(sizes)
+
+        feasible += sum(
+            shift != SHIFT3
+            for b in batches if b.course == course.name
+            for shift in b.week_shifts
+        )
+        feasible += (course.max_batches - len(sizes)) * len(WEEKS)
+
+    return BIG * makespan + ALPHA * len(batches) + GAMMA * spread - BETA * feasible
+
+
+def solve_greedy(params: ModelParams, company: str, data: ModelInput) -> BatchingResult:
+    patterns = {trainee.name: trainee.rotating_shift_list for trainee in data.shifts.values()}
+
+    result = BatchingResult(
+        company=company,
+        courses=list(data.courses),
+        status="FEASIBLE"
+    )
+
+    for course in data.courses.values():
+        batches = greedy_course(course, patterns)
+
+        if batches is None:
+            print(f"Greedy: {course.name} does not fit in {course.max_batches} batches")
+            result.status = "INFEASIBLE"
+            return result
+
+        result.batches.extend(batches)
+
+    result.objective = batching_objective(data.courses, result.batches)
+    result.makespan = max((b.week + 1 for b in result.batches), default=0)
+    result.rows = batch_rows(company, result.batches, data)
+
+    return result
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import BaseModel
 import math
 
@@ -49,3 +49,21 @@ class TraineeShift(BaseModel):
 class ModelInput(BaseModel):
     courses: dict[str, CourseStats]
     shifts: dict[str, TraineeShift]
+
+
+class Batch(BaseModel):
+    course: str
+    week: int  # run week, 0-based
+    trainees: list[str]
+    week_shifts: list[int]  # overlapped shift per week, 3 = unavailable
+
+
+class BatchingResult(BaseModel):
+    company: str
+    courses: list[str]
+    status: str
+    objective: Optional[float] = None
+    makespan: Optional[int] = None
+    batches: list[Batch] = []
+    rows: list[dict] = []
+
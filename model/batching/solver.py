@@ -1,370 +1,597 @@
 from ortools.sat.python import cp_model
 from schema import ModelParams
 from .data import read_data
+from .greedy import solve_greedy
+from .schema import *
+from .utils import *
 from schema import *
+from model.master.data import read_master
+from model.master.schema import MasterData
+from typing import Optional
 
+from concurrent.futures import ProcessPoolExecutor
+import os
 import pandas as pd
 pd.set_option("display.max_colwidth", None)
 
 
-def run_solver(params: ModelParams):
-    if params.companies is None or not params.companies:
-        return
+def solve_company(params: ModelParams, company: str, data: ModelInput, num_search_workers: int) -> Optional[pd.DataFrame]:
+    if params.batching_engine == "greedy":
+        result = solve_greedy(params, company, data)
+        print(f"Greedy objective value {company}: {result.objective}")
 
-    WEEKS = [0,1,2,3]  # 4 weeks
-    SHIFTS = [0,1,2]   # 0=NonShift,1=Shift1,2=Shift2
-    SHIFT3 = 3         # unavailable
+    else:
+        result = solve_courses(params, company, data, num_search_workers)
 
-    dfs_batch = {}
-    for company in params.companies:
-        data = read_data(params, company)
+    if result.rows:
+        return pd.DataFrame(result.rows)
 
-        # -------------------------
-        # SETS
-        # -------------------------
-        C = data.courses
-        S = {trainee.name: trainee.rotating_shift for trainee in data.shifts.values()}
+    print(f"No batch solution for {company} found")
+    return None
 
-        # -------------------------
-        # CONSTANTS
-        # -------------------------
-        CAPACITY = next(iter(C.values())).max_venue_capacity_available
 
-        model = cp_model.CpModel()
+def solve_courses(
+    params: ModelParams,
+    company: str,
+    data: ModelInput,
+    num_search_workers: int,
+    makespan_limit: Optional[int] = None,
+    is_minimizing_makespan: bool = True
+) -> BatchingResult:
+    # -------------------------
+    # SETS
+    # -------------------------
+    C = data.courses
+    S = {trainee.name: trainee.rotating_shift for trainee in data.shifts.values()}
 
-        x = {}
-        run = {}
-        z = {}
-        batch_used = {}
-        M = {}
-        feasible = {}
-        size = {}
-        min_size = {}
-        max_size = {}
+    # Trainees with the same rotating shift pattern are interchangeable, the model only
+    # decides how many of each pattern go to a batch (x is then an integer count)
+    U = {
+        course: trainee_units(C[course].trainees, S, params.is_aggregating_shift_pattern)
+        for course in C
+    }
 
-        T = model.NewIntVar(0, len(WEEKS), "Global_Makespan")
+    # -------------------------
+    # CONSTANTS
+    # -------------------------
+    CAPACITY = next(iter(C.values())).max_venue_capacity_available
 
-        # -------------------------
-        # VARIABLES
-        # -------------------------
+    model = cp_model.CpModel()
 
-        for course in C:
-            max_batches = C[course].max_batches
+    x = {}
+    run = {}
+    z = {}
+    batch_used = {}
+    M = {}
+    feasible = {}
+    size = {}
+    min_size = {}
+    max_size = {}
 
-            M[course] = model.NewIntVar(0, len(WEEKS), f"M_{course}")
+    T = model.NewIntVar(0, len(WEEKS), "Global_Makespan")
+
+    # -------------------------
+    # VARIABLES
+    # -------------------------
 
-            min_size[course] = model.NewIntVar(0, C[course].count_trainee, f"min_size_{course}")
-            max_size[course] = model.NewIntVar(0, C[course].count_trainee, f"max_size_{course}")
+    for course in C:
+        max_batches = C[course].max_batches
 
-            for b in range(max_batches):
+        M[course] = model.NewIntVar(0, len(WEEKS), f"M_{course}")
 
-                batch_used[(course,b)] = model.NewBoolVar(f"batch_used_{course}_{b}")
+        min_size[course] = model.NewIntVar(0, C[course].count_trainee, f"min_size_{course}")
+        max_size[course] = model.NewIntVar(0, C[course].count_trainee, f"max_size_{course}")
 
-                size[(course,b)] = model.NewIntVar(0, CAPACITY, f"size_{course}_{b}")
+        for b in range(max_batches):
 
-                for i in C[course].trainees:
-                    x[(course,i,b)] = model.NewBoolVar(f"x_{course}_{i}_{b}")
+            batch_used[(course,b)] = model.NewBoolVar(f"batch_used_{course}_{b}")
 
-                for w in WEEKS:
-                    run[(course,b,w)] = model.NewBoolVar(f"run_{course}_{b}_{w}")
-                    feasible[(course,b,w)] = model.NewBoolVar(f"feasible_{course}_{b}_{w}")
+            size[(course,b)] = model.NewIntVar(0, CAPACITY, f"size_{course}_{b}")
 
-                    for s in SHIFTS:
-                        z[(course,b,w,s)] = model.NewBoolVar(f"z_{course}_{b}_{w}_{s}")
+            for u, (_, members) in U[course].items():
+                if len(members) == 1:
+                    x[(course,u,b)] = model.NewBoolVar(f"x_{course}_{u}_{b}")
+                else:
+                    x[(course,u,b)] = model.NewIntVar(0, min(len(members), CAPACITY), f"x_{course}_{u}_{b}")
 
-        # -------------------------
-        # CONSTRAINTS
-        # -------------------------
+            for w in WEEKS:
+                run[(course,b,w)] = model.NewBoolVar(f"run_{course}_{b}_{w}")
+                feasible[(course,b,w)] = model.NewBoolVar(f"feasible_{course}_{b}_{w}")
 
-        for course in C:
-            trainees = C[course].trainees
-            trainers = C[course].count_trainers
-            max_batches = C[course].max_batches
+                for s in SHIFTS:
+                    z[(course,b,w,s)] = model.NewBoolVar(f"z_{course}_{b}_{w}_{s}")
 
-            # Each employee assigned exactly once
-            for i in trainees:
-                model.Add(sum(x[(course,i,b)] for b in range(max_batches)) == 1)
+    # -------------------------
+    # CONSTRAINTS
+    # -------------------------
 
-            for b in range(max_batches):
+    for course in C:
+        units = U[course]
+        trainers = C[course].count_trainers
+        max_batches = C[course].max_batches
 
-                # Define batch size
-                model.Add(size[(course,b)] == sum(x[(course,i,b)] for i in trainees))
+        # Each employee assigned exactly once
+        for u, (_, members) in units.items():
+            model.Add(sum(x[(course,u,b)] for b in range(max_batches)) == len(members))
 
-                # Capacity
-                model.Add(size[(course,b)] <= CAPACITY)
+        for b in range(max_batches):
 
-                # Link batch_used
-                for i in trainees:
-                    model.Add(x[(course,i,b)] <= batch_used[(course,b)])
+            # Define batch size
+            model.Add(size[(course,b)] == sum(x[(course,u,b)] for u in units))
 
-                # Batch runs exactly once if used
-                model.Add(sum(run[(course,b,w)] for w in WEEKS) == batch_used[(course,b)])
+            # Capacity
+            model.Add(size[(course,b)] <= CAPACITY)
 
-                # Balance size spread
-                model.Add(min_size[course] <= size[(course,b)]).OnlyEnforceIf(batch_used[(course,b)])
-                model.Add(max_size[course] >= size[(course,b)]).OnlyEnforceIf(batch_used[(course,b)])
+            # Link batch_used
+            for u, (_, members) in units.items():
+                model.Add(x[(course,u,b)] <= min(len(members), CAPACITY) * batch_used[(course,b)])
 
-                for w in WEEKS:
-                    model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
+            # Batch runs exactly once if used
+            model.Add(sum(run[(course,b,w)] for w in WEEKS) == batch_used[(course,b)])
 
-                    model.Add(
-                        sum(z[(course,b,w,s)] for s in SHIFTS) == 1
-                    ).OnlyEnforceIf(feasible[(course,b,w)])
+            # Balance size spread
+            model.Add(min_size[course] <= size[(course,b)]).OnlyEnforceIf(batch_used[(course,b)])
+            model.Add(max_size[course] >= size[(course,b)]).OnlyEnforceIf(batch_used[(course,b)])
 
-                    model.Add(
-                        sum(z[(course,b,w,s)] for s in SHIFTS) == 0
-                    ).OnlyEnforceIf(feasible[(course,b,w)].Not())
+            for w in WEEKS:
+                model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
 
-                    # --- Count S1, S2, S3 ---
-                    s1_count = sum(
-                        x[(course,i,b)]
-                        for i in trainees
-                        if i in S and w < len(S[i]) and S[i][w] == 1
-                    )
+                model.Add(
+                    sum(z[(course,b,w,s)] for s in SHIFTS) == 1
+                ).OnlyEnforceIf(feasible[(course,b,w)])
 
-                    s2_count = sum(
-                        x[(course,i,b)]
-                        for i in trainees
-                        if i in S and w < len(S[i]) and S[i][w] == 2
-                    )
+                model.Add(
+                    sum(z[(course,b,w,s)] for s in SHIFTS) == 0
+                ).OnlyEnforceIf(feasible[(course,b,w)].Not())
 
-                    s3_count = sum(
-                        x[(course,i,b)]
-                        for i in trainees
-                        if i in S and w < len(S[i]) and S[i][w] == SHIFT3
-                    )
+                # --- Count S1, S2, S3 ---
+                s1_count = sum(
+                    x[(course,u,b)]
+                    for u, (pattern, _) in units.items()
+                    if pattern is not None and w < len(pattern) and pattern[w] == 1
+                )
 
-                    # --- Create presence booleans properly ---
-                    s1_present = model.NewBoolVar(f"s1_present_{course}_{b}_{w}")
-                    s2_present = model.NewBoolVar(f"s2_present_{course}_{b}_{w}")
-                    s3_present = model.NewBoolVar(f"s3_present_{course}_{b}_{w}")
+                s2_count = sum(
+                    x[(course,u,b)]
+                    for u, (pattern, _) in units.items()
+                    if pattern is not None and w < len(pattern) and pattern[w] == 2
+                )
 
-                    model.Add(s1_count >= 1).OnlyEnforceIf(s1_present)
-                    model.Add(s1_count == 0).OnlyEnforceIf(s1_present.Not())
+                s3_count = sum(
+                    x[(course,u,b)]
+                    for u, (pattern, _) in units.items()
+                    if pattern is not None and w < len(pattern) and pattern[w] == SHIFT3
+                )
 
-                    model.Add(s2_count >= 1).OnlyEnforceIf(s2_present)
-                    model.Add(s2_count == 0).OnlyEnforceIf(s2_present.Not())
+                # --- Create presence booleans properly ---
+                s1_present = model.NewBoolVar(f"s1_present_{course}_{b}_{w}")
+                s2_present = model.NewBoolVar(f"s2_present_{course}_{b}_{w}")
+                s3_present = model.NewBoolVar(f"s3_present_{course}_{b}_{w}")
 
-                    model.Add(s3_count >= 1).OnlyEnforceIf(s3_present)
-                    model.Add(s3_count == 0).OnlyEnforceIf(s3_present.Not())
+                model.Add(s1_count >= 1).OnlyEnforceIf(s1_present)
+                model.Add(s1_count == 0).OnlyEnforceIf(s1_present.Not())
 
-                    # --- S3 makes infeasible ---
-                    model.Add(feasible[(course,b,w)] == 0).OnlyEnforceIf(s3_present)
+                model.Add(s2_count >= 1).OnlyEnforceIf(s2_present)
+                model.Add(s2_count == 0).OnlyEnforceIf(s2_present.Not())
 
-                    # --- S1 and S2 together makes infeasible ---
-                    conflict = model.NewBoolVar(f"conflict_{course}_{b}_{w}")
-                    model.AddBoolAnd([s1_present, s2_present]).OnlyEnforceIf(conflict)
-                    model.AddBoolOr([s1_present.Not(), s2_present.Not()]).OnlyEnforceIf(conflict.Not())
+                model.Add(s3_count >= 1).OnlyEnforceIf(s3_present)
+                model.Add(s3_count == 0).OnlyEnforceIf(s3_present.Not())
 
-                    model.Add(feasible[(course,b,w)] == 0).OnlyEnforceIf(conflict)
+                # --- S3 makes infeasible ---
+                model.Add(feasible[(course,b,w)] == 0).OnlyEnforceIf(s3_present)
 
-                    # --- Dominant shift selection ---
-                    model.Add(z[(course,b,w,1)] == 1)\
-                        .OnlyEnforceIf([feasible[(course,b,w)], s1_present, s2_present.Not()])
+                # --- S1 and S2 together makes infeasible ---
+                conflict = model.NewBoolVar(f"conflict_{course}_{b}_{w}")
+                model.AddBoolAnd([s1_present, s2_present]).OnlyEnforceIf(conflict)
+                model.AddBoolOr([s1_present.Not(), s2_present.Not()]).OnlyEnforceIf(conflict.Not())
 
-                    model.Add(z[(course,b,w,2)] == 1)\
-                        .OnlyEnforceIf([feasible[(course,b,w)], s2_present, s1_present.Not()])
+                model.Add(feasible[(course,b,w)] == 0).OnlyEnforceIf(conflict)
 
-                    model.Add(z[(course,b,w,0)] == 1)\
-                        .OnlyEnforceIf([feasible[(course,b,w)], s1_present.Not(), s2_present.Not()])
+                # --- Dominant shift selection ---
+                model.Add(z[(course,b,w,1)] == 1)\
+                    .OnlyEnforceIf([feasible[(course,b,w)], s1_present, s2_present.Not()])
 
-                # for w in WEEKS:
-                #     model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
+                model.Add(z[(course,b,w,2)] == 1)\
+                    .OnlyEnforceIf([feasible[(course,b,w)], s2_present, s1_present.Not()])
 
-                #     model.Add(
-                #         sum(z[(course,b,w,s)] for s in SHIFTS) == 1
-                #     ).OnlyEnforceIf(feasible[(course,b,w)])
+                model.Add(z[(course,b,w,0)] == 1)\
+                    .OnlyEnforceIf([feasible[(course,b,w)], s1_present.Not(), s2_present.Not()])
 
-                #     model.Add(
-                #         sum(z[(course,b,w,s)] for s in SHIFTS) == 0
-                #     ).OnlyEnforceIf(feasible[(course,b,w)].Not())
+            # for w in WEEKS:
+            #     model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
 
-                #     # ---- Detect S1 and S2 presence ----
+            #     model.Add(
+            #         sum(z[(course,b,w,s)] for s in SHIFTS) == 1
+            #     ).OnlyEnforceIf(feasible[(course,b,w)])
 
-                #     s1_present = model.NewBoolVar(f"s1_present_{course}_{b}_{w}")
-                #     s2_present = model.NewBoolVar(f"s2_present_{course}_{b}_{w}")
+            #     model.Add(
+            #         sum(z[(course,b,w,s)] for s in SHIFTS) == 0
+            #     ).OnlyEnforceIf(feasible[(course,b,w)].Not())
 
-                #     s1_count = sum(
-                #         x[(course,i,b)]
-                #         for i in trainees
-                #         if i in S and w < len(S[i]) and S[i][w] == 1
-                #     )
+            #     # ---- Detect S1 and S2 presence ----
 
-                #     s2_count = sum(
-                #         x[(course,i,b)]
-                #         for i in trainees
-                #         if i in S and w < len(S[i]) and S[i][w] == 2
-                #     )
+            #     s1_present = model.NewBoolVar(f"s1_present_{course}_{b}_{w}")
+            #     s2_present = model.NewBoolVar(f"s2_present_{course}_{b}_{w}")
 
-                #     # Link presence booleans
-                #     model.Add(s1_count >= 1).OnlyEnforceIf(s1_present)
-                #     model.Add(s1_count == 0).OnlyEnforceIf(s1_present.Not())
+            #     s1_count = sum(
+            #         x[(course,i,b)]
+            #         for i in trainees
+            #         if i in S and w < len(S[i]) and S[i][w] == 1
+            #     )
 
-                #     model.Add(s2_count >= 1).OnlyEnforceIf(s2_present)
-                #     model.Add(s2_count == 0).OnlyEnforceIf(s2_present.Not())
+            #     s2_count = sum(
+            #         x[(course,i,b)]
+            #         for i in trainees
+            #         if i in S and w < len(S[i]) and S[i][w] == 2
+            #     )
 
-                #     # ---- SHIFT3 makes infeasible ----
-                #     for i in trainees:
-                #         if i in S and w < len(S[i]) and S[i][w] == SHIFT3:
-                #             model.Add(feasible[(course,b,w)] == 0)\
-                #                 .OnlyEnforceIf(x[(course,i,b)])
+            #     # Link presence booleans
+            #     model.Add(s1_count >= 1).OnlyEnforceIf(s1_present)
+            #     model.Add(s1_count == 0).OnlyEnforceIf(s1_present.Not())
 
-                #     # ---- If both S1 and S2 present → infeasible ----
-                #     model.Add(feasible[(course,b,w)] == 0)\
-                #         .OnlyEnforceIf([s1_present, s2_present])
+            #     model.Add(s2_count >= 1).OnlyEnforceIf(s2_present)
+            #     model.Add(s2_count == 0).OnlyEnforceIf(s2_present.Not())
 
-                #     # ---- Dominant shift selection ----
-                #     model.Add(z[(course,b,w,1)] == 1)\
-                #         .OnlyEnforceIf([s1_present, s2_present.Not(), feasible[(course,b,w)]])
+            #     # ---- SHIFT3 makes infeasible ----
+            #     for i in trainees:
+            #         if i in S and w < len(S[i]) and S[i][w] == SHIFT3:
+            #             model.Add(feasible[(course,b,w)] == 0)\
+            #                 .OnlyEnforceIf(x[(course,i,b)])
 
-                #     model.Add(z[(course,b,w,2)] == 1)\
-                #         .OnlyEnforceIf([s2_present, s1_present.Not(), feasible[(course,b,w)]])
+            #     # ---- If both S1 and S2 present → infeasible ----
+            #     model.Add(feasible[(course,b,w)] == 0)\
+            #         .OnlyEnforceIf([s1_present, s2_present])
 
-                #     model.Add(z[(course,b,w,0)] == 1)\
-                #         .OnlyEnforceIf([s1_present.Not(), s2_present.Not(), feasible[(course,b,w)]])
+            #     # ---- Dominant shift selection ----
+            #     model.Add(z[(course,b,w,1)] == 1)\
+            #         .OnlyEnforceIf([s1_present, s2_present.Not(), feasible[(course,b,w)]])
 
+            #     model.Add(z[(course,b,w,2)] == 1)\
+            #         .OnlyEnforceIf([s2_present, s1_present.Not(), feasible[(course,b,w)]])
 
-                # for w in WEEKS:
-                #     model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
+            #     model.Add(z[(course,b,w,0)] == 1)\
+            #         .OnlyEnforceIf([s1_present.Not(), s2_present.Not(), feasible[(course,b,w)]])
 
-                #     model.Add(
-                #         sum(z[(course,b,w,s)] for s in SHIFTS) == 1
-                #     ).OnlyEnforceIf(feasible[(course,b,w)])
 
-                #     model.Add(
-                #         sum(z[(course,b,w,s)] for s in SHIFTS) == 0
-                #     ).OnlyEnforceIf(feasible[(course,b,w)].Not())
+            # for w in WEEKS:
+            #     model.Add(run[(course,b,w)] <= feasible[(course,b,w)])
 
-                #     for s in SHIFTS:
-                #         for i in trainees:
-                #             if i in S and w < len(S[i]):
-                #                 trainee_shift = S[i][w]
+            #     model.Add(
+            #         sum(z[(course,b,w,s)] for s in SHIFTS) == 1
+            #     ).OnlyEnforceIf(feasible[(course,b,w)])
 
-                #                 # If trainee unavailable → batch infeasible
-                #                 if trainee_shift == SHIFT3:
-                #                     model.Add(feasible[(course,b,w)] == 0)\
-                #                         .OnlyEnforceIf(x[(course,i,b)])
+            #     model.Add(
+            #         sum(z[(course,b,w,s)] for s in SHIFTS) == 0
+            #     ).OnlyEnforceIf(feasible[(course,b,w)].Not())
+
+            #     for s in SHIFTS:
+            #         for i in trainees:
+            #             if i in S and w < len(S[i]):
+            #                 trainee_shift = S[i][w]
+
+            #                 # If trainee unavailable → batch infeasible
+            #                 if trainee_shift == SHIFT3:
+            #                     model.Add(feasible[(course,b,w)] == 0)\
+            #                         .OnlyEnforceIf(x[(course,i,b)])
+
+            #                 else:
+            #                     # If batch chooses shift s,
+            #                     # trainee must be compatible with s
+            #                     compatible = False
+
+            #                     if trainee_shift == 0:
+            #                         compatible = True
+            #                     elif trainee_shift == 1 and s == 1:
+            #                         compatible = True
+            #                     elif trainee_shift == 2 and s == 2:
+            #                         compatible = True
+
+            #                     if not compatible:
+            #                         model.Add(z[(course,b,w,s)] == 0)\
+            #                             .OnlyEnforceIf(x[(course,i,b)])
+
+            # Course makespan
+            for w in WEEKS:
+                model.Add(M[course] >= (w+1) * run[(course,b,w)])
+
+        # # Trainer concurrency
+        # for w in WEEKS:
+        #     model.Add(
+        #         sum(run[(course,b,w)] for b in range(max_batches))
+        #         <= trainers
+        #     )
+
+        # Symmetry breaking: candidate batches are interchangeable, so only keep the
+        # ordering where used batches come first, sorted by size and then by run week
+        if params.is_breaking_batch_symmetry:
+            for b in range(max_batches - 1):
+                model.Add(batch_used[(course,b)] >= batch_used[(course,b+1)])
+                model.Add(size[(course,b)] >= size[(course,b+1)])
+
+                same_size = model.NewBoolVar(f"same_size_{course}_{b}")
+                model.Add(size[(course,b)] == size[(course,b+1)]).OnlyEnforceIf(same_size)
+                model.Add(size[(course,b)] > size[(course,b+1)]).OnlyEnforceIf(same_size.Not())
+
+                model.Add(
+                    sum(w * run[(course,b,w)] for w in WEEKS) <= sum(w * run[(course,b+1,w)] for w in WEEKS)
+                ).OnlyEnforceIf([same_size, batch_used[(course,b+1)]])
+
+        model.Add(T >= M[course])
+
+    if makespan_limit is not None:
+        model.Add(T <= makespan_limit)
+
+    # -------------------------
+    # WARM START
+    # -------------------------
+    greedy = None
+    if params.is_hinting_batching:
+        greedy = solve_greedy(params, company, data)
+
+    if greedy is not None and greedy.objective is not None and (makespan_limit is None or greedy.makespan <= makespan_limit):
+        for course in C:
+            batches = [batch for batch in greedy.batches if batch.course == course]
 
-                #                 else:
-                #                     # If batch chooses shift s,
-                #                     # trainee must be compatible with s
-                #                     compatible = False
+            for b in range(C[course].max_batches):
+                batch = batches[b] if b < len(batches) else None
+                members = set(batch.trainees) if batch else set()
 
-                #                     if trainee_shift == 0:
-                #                         compatible = True
-                #                     elif trainee_shift == 1 and s == 1:
-                #                         compatible = True
-                #                     elif trainee_shift == 2 and s == 2:
-                #                         compatible = True
+                model.AddHint(batch_used[(course,b)], batch is not None)
+                model.AddHint(size[(course,b)], len(members))
 
-                #                     if not compatible:
-                #                         model.Add(z[(course,b,w,s)] == 0)\
-                #                             .OnlyEnforceIf(x[(course,i,b)])
+                for u, (_, unit_members) in U[course].items():
+                    model.AddHint(x[(course,u,b)], sum(1 for i in unit_members if i in members))
 
-                # Course makespan
                 for w in WEEKS:
-                    model.Add(M[course] >= (w+1) * run[(course,b,w)])
+                    shift = batch.week_shifts[w] if batch else 0
 
-            # # Trainer concurrency
-            # for w in WEEKS:
-            #     model.Add(
-            #         sum(run[(course,b,w)] for b in range(max_batches))
-            #         <= trainers
-            #     )
+                    model.AddHint(run[(course,b,w)], batch is not None and batch.week == w)
+                    model.AddHint(feasible[(course,b,w)], shift != SHIFT3)
+
+                    for s in SHIFTS:
+                        model.AddHint(z[(course,b,w,s)], shift == s)
 
-            model.Add(T >= M[course])
+            model.AddHint(M[course], max((batch.week + 1 for batch in batches), default=0))
 
-        # -------------------------
-        # OBJECTIVE
-        # -------------------------
+    # -------------------------
+    # OBJECTIVE
+    # -------------------------
 
-        BIG = 10000   # Makespan priority
-        ALPHA = 200   # Fewer batches
-        GAMMA = 10    # Balance size
-        BETA = 1      # Flexibility reward
+    # Without the makespan term the model only spends the slack below makespan_limit
+    model.Minimize(
+        (BIG * T if is_minimizing_makespan else 0)
+        + ALPHA * sum(batch_used.values())
+        + GAMMA * sum(max_size[course] - min_size[course] for course in C)
+        - BETA * sum(feasible.values())
+    )
 
-        model.Minimize(
-            BIG * T
-            + ALPHA * sum(batch_used.values())
-            + GAMMA * sum(max_size[course] - min_size[course] for course in C)
-            - BETA * sum(feasible.values())
-        )
+    # -------------------------
+    # SOLVE
+    # -------------------------
 
-        # -------------------------
-        # SOLVE
-        # -------------------------
+    print("Solving starts at:", pd.Timestamp.now())
 
-        print("Solving starts at:", pd.Timestamp.now())
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = params.max_time_in_seconds
+    solver.parameters.num_search_workers = num_search_workers
 
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = params.max_time_in_seconds
-        solver.parameters.num_search_workers = params.num_search_workers
+    status = solver.Solve(model)
 
-        status = solver.Solve(model)
+    print("Solving ends at:", pd.Timestamp.now())
 
-        print("Solving ends at:", pd.Timestamp.now())
+    print("Status:", solver.StatusName(status))
+    print(f"Objective value: {solver.ObjectiveValue()}")
 
-        print("Status:", solver.StatusName(status))
-        print(f"Objective value: {solver.ObjectiveValue()}")
+    if greedy is not None:
+        print(f"Greedy objective value: {greedy.objective}")
 
-        # -------------------------
-        # OUTPUT
-        # -------------------------
+    result = BatchingResult(
+        company=company,
+        courses=list(C),
+        status=solver.StatusName(status)
+    )
 
-        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            print("\nGLOBAL MAKESPAN:", solver.Value(T))
+    # -------------------------
+    # OUTPUT
+    # -------------------------
 
-            rows = []
-            for course in C:
-                max_batches = C[course].max_batches
-                batch_counter = 1
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print("\nGLOBAL MAKESPAN:", solver.Value(T))
+
+        result.objective = solver.ObjectiveValue()
+        result.makespan = solver.Value(T)
+
+        for course in C:
+            max_batches = C[course].max_batches
 
+            # Expand the unit counts back to individual trainees
+            batch_members = {b: set() for b in range(max_batches)}
+            for u, (_, members) in U[course].items():
+                pool = iter(members)
                 for b in range(max_batches):
-                    if solver.Value(batch_used[(course, b)]):
+                    for _ in range(solver.Value(x[(course, u, b)])):
+                        batch_members[b].add(next(pool))
 
-                        members = [
-                            i for i in C[course].trainees
-                            if solver.Value(x[(course, i, b)])
-                        ]
+            for b in range(max_batches):
+                if solver.Value(batch_used[(course, b)]):
+
+                    members = [
+                        i for i in C[course].trainees
+                        if i in batch_members[b]
+                    ]
+
+                    # Determine overlapped shift per week
+                    week_shifts = {}
+                    for w in WEEKS:
+
+                        # Default = unavailable
+                        shift_value = SHIFT3
+
+                        if solver.Value(feasible[(course, b, w)]):
+                            for s in SHIFTS:
+                                if solver.Value(z[(course, b, w, s)]):
+                                    shift_value = s
+                                    break
+
+                        week_shifts[w] = shift_value
+
+                    result.batches.append(
+                        Batch(
+                            course=course,
+                            week=next(w for w in WEEKS if solver.Value(run[(course, b, w)])),
+                            trainees=members,
+                            week_shifts=[week_shifts[w] for w in WEEKS]
+                        )
+                    )
+
+        result.rows = batch_rows(company, result.batches, data)
+        print(pd.DataFrame(result.rows))
+
+    return result
+
+
+def course_data(data: ModelInput, course: str) -> ModelInput:
+    return ModelInput(
+        courses={course: data.courses[course]},
+        shifts={i: data.shifts[i] for i in data.courses[course].trainees if i in data.shifts}
+    )
+
+
+def run_decomposed(params: ModelParams, partitions: dict[str, ModelInput]) -> dict[str, pd.DataFrame]:
+    """
+    Courses only interact through the global makespan T >= M[course], so every course is
+    solved as its own model, in parallel, and T is the max of the course makespans. The
+    courses on the critical path that were not proven optimal are then re-optimized with
+    T - 1 as their makespan limit, until T cannot be lowered anymore.
+
+    A course model alone also minimizes its own makespan, which the coupled model does not
+    do below T. So once T is known, the courses that finish before it are solved again with
+    T as their limit and without the makespan term, trading that slack for fewer and more
+    even batches as in the coupled model. This second pass adds up to one more
+    max_time_in_seconds to the wall time.
+    """
+    jobs = [(company, course) for company, data in partitions.items() for course in data.courses]
 
-                        # Determine overlapped shift per week
-                        week_shifts = {}
-                        for w in WEEKS:
+    cores = os.cpu_count() or 1
+    processes = max(1, min(len(jobs), cores))
+    num_search_workers = max(1, min(params.num_search_workers, cores // processes))
 
-                            # Default = unavailable
-                            shift_value = SHIFT3
+    print(f"Solving {len(jobs)} course models on {processes} processes, {num_search_workers} workers each")
 
-                            if solver.Value(feasible[(course, b, w)]):
-                                for s in SHIFTS:
-                                    if solver.Value(z[(course, b, w, s)]):
-                                        shift_value = s
-                                        break
+    results: dict[tuple[str, str], BatchingResult] = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
 
-                            week_shifts[w] = shift_value
+        def solve_all(keys: list[tuple[str, str]], makespan_limit: Optional[int] = None, is_minimizing_makespan: bool = True):
+            futures = {
+                (company, course): pool.submit(
+                    solve_courses,
+                    params,
+                    company,
+                    course_data(partitions[company], course),
+                    num_search_workers,
+                    makespan_limit,
+                    is_minimizing_makespan
+                )
+                for company, course in keys
+            }
+            return {key: future.result() for key, future in futures.items()}
 
-                        for trainee in members:
-                            rows.append({
-                                "company": company,
-                                "course_name": course,
-                                "batch_no": batch_counter,
-                                "trainee_id": trainee,
-                                "week1": week_shifts[0],
-                                "week2": week_shifts[1],
-                                "week3": week_shifts[2],
-                                "week4": week_shifts[3],
-                                "rotating_shift": data.shifts[trainee].rotating_shift_list
-                            })
+        results.update(solve_all(jobs))
 
-                        batch_counter += 1
+        for company in partitions:
+            company_results = {key: r for key, r in results.items() if key[0] == company and r.rows}
 
-            df = pd.DataFrame(rows)
-            print(df)
+            while company_results:
+                makespan = max(r.makespan for r in company_results.values())
+                critical = [key for key, r in company_results.items() if r.makespan == makespan]
+
+                if makespan == 0 or any(company_results[key].status == "OPTIMAL" for key in critical):
+                    break
+
+                print(f"Re-optimizing {len(critical)} critical courses of {company} below makespan {makespan}")
+
+                improved = solve_all(critical, makespan - 1)
+                if not all(r.rows for r in improved.values()):
+                    break
+
+                company_results.update(improved)
+                results.update(improved)
+
+            # Non-critical courses use their slack below the company makespan
+            if company_results:
+                makespan = max(r.makespan for r in company_results.values())
+                slack = [key for key, r in company_results.items() if r.makespan < makespan]
+
+                if slack:
+                    print(f"Re-solving {len(slack)} non-critical courses of {company} within makespan {makespan}")
+
+                    relaxed = solve_all(slack, makespan, is_minimizing_makespan=False)
+                    results.update({key: r for key, r in relaxed.items() if r.rows})
+
+    dfs_batch = {}
+    for company in partitions:
+        rows = [
+            row
+            for (c, course), r in results.items() if c == company
+            for row in r.rows
+        ]
 
-            dfs_batch[company] = df.copy()
+        missing = [course for (c, course), r in results.items() if c == company and not r.rows]
+        if missing:
+            print(f"No batch solution for {company} courses: {missing}")
 
-        else:
-            print(f"No batch solution for {company} found")
+        if rows:
+            print(f"{company} makespan: {max(r.makespan for (c, _), r in results.items() if c == company and r.rows)}")
+            dfs_batch[company] = pd.DataFrame(rows)
 
+    return dfs_batch
+
+
+def run_solver(params: ModelParams, master: Optional[MasterData] = None):
+    if params.companies is None or not params.companies:
+        return
+
+    if master is None:
+        master = read_master(params)
+
+    partitions = read_data(params, master)
+
+    companies = []
+    for company in params.companies:
+        if not partitions[company].courses:
+            print(f"No course to batch for {company}")
+            continue
+
+        companies.append(company)
+
+    dfs_batch = {}
+    if params.is_decomposing_batching and params.batching_engine == "cpsat":
+        dfs_batch = run_decomposed(params, {company: partitions[company] for company in companies})
+
+    elif params.is_parallel_batching and len(companies) > 1:
+        # Split the cores between the company models, every model keeps at least one worker
+        cores = os.cpu_count() or 1
+        processes = min(len(companies), cores)
+        num_search_workers = max(1, min(params.num_search_workers, cores // processes))
+
+        print(f"Solving {len(companies)} companies on {processes} processes, {num_search_workers} workers each")
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                company: pool.submit(solve_company, params, company, partitions[company], num_search_workers)
+                for company in companies
+            }
+
+            for company, future in futures.items():
+                df = future.result()
+                if df is not None:
+                    dfs_batch[company] = df
+
+    else:
+        for company in companies:
+            df = solve_company(params, company, partitions[company], params.num_search_workers)
+            if df is not None:
+                dfs_batch[company] = df
 
     if len(dfs_batch):
         batch = pd.concat(dfs_batch.values(), ignore_index=True)
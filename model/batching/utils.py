@@ -0,0 +1,51 @@
+from .schema import *
+
+
+WEEKS = [0,1,2,3]  # 4 weeks
+SHIFTS = [0,1,2]   # 0=NonShift,1=Shift1,2=Shift2
+SHIFT3 = 3         # unavailable
+
+BIG = 10000   # Makespan priority
+ALPHA = 200   # Fewer batches
+GAMMA = 10    # Balance size
+BETA = 1      # Flexibility reward
+
+
+def batch_rows(company: str, batches: list[Batch], data: ModelInput) -> list[dict]:
+    rows = []
+    batch_counter = {}
+    for batch in batches:
+        batch_counter[batch.course] = batch_counter.get(batch.course, 0) + 1
+
+        for trainee in batch.trainees:
+            rows.append({
+                "company": company,
+                "course_name": batch.course,
+                "batch_no": batch_counter[batch.course],
+                "trainee_id": trainee,
+                "week1": batch.week_shifts[0],
+                "week2": batch.week_shifts[1],
+                "week3": batch.week_shifts[2],
+                "week4": batch.week_shifts[3],
+                "rotating_shift": data.shifts[trainee].rotating_shift_list
+            })
+
+    return rows
+
+
+def trainee_units(trainees: list[str], S: dict[str, dict[int, int]], is_aggregating: bool) -> dict:
+    """
+    Splits the trainees of a course into interchangeable units. With aggregation every
+    rotating shift pattern is one unit, otherwise every trainee is its own unit.
+
+    Returns:
+        unit key -> (shift pattern or None, list of trainees)
+    """
+    units = {}
+    for i in trainees:
+        pattern = tuple(S[i][w] for w in WEEKS if w in S[i]) if i in S else None
+        key = pattern if is_aggregating else i
+
+        units.setdefault(key, (pattern, []))[1].append(i)
+
+    return units
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import pandas as pd
+
+from .schema import *
+from schema import ModelParams
+
+try:
+    import pyarrow  # noqa: F401
+    IS_PARQUET_AVAILABLE = True
+except ImportError:
+    IS_PARQUET_AVAILABLE = False
+
+
+# frame name -> (ModelParams field, id/name columns normalized to stripped strings)
+MASTER_FILES = {
+    "venue": ("file_master_venue", ["venue_name", "company"]),
+    "trainer": ("file_master_trainer", ["trainer_id"]),
+    "course": ("file_master_course", ["course_name", "company", "stream"]),
+    "trainee": ("file_master_trainee", ["employee_id", "company"]),
+    "course_trainer": ("file_master_course_trainer", ["trainer_id", "company", "course_name"]),
+    "course_sequence": ("file_master_course_sequence", ["course_name", "prerequisite_course_name"]),
+    "course_trainee": ("file_master_course_trainee", ["employee_id", "course_name"]),
+}
+
+CACHE_VERSION = 1
+
+
+def read_master(params: ModelParams) -> MasterData:
+    frames = {}
+    for name, (field, columns) in MASTER_FILES.items():
+        frames[name] = read_master_file(getattr(params, field), columns, params.master_cache_dir)
+
+    return MasterData(**frames)
+
+
+def read_master_file(file: str, columns: list[str], cache_dir: str = None) -> pd.DataFrame:
+    cache_file, meta_file = None, None
+    if cache_dir and IS_PARQUET_AVAILABLE:
+        key = hashlib.sha1(os.path.abspath(file).encode()).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(file))[0]
+        cache_file = os.path.join(cache_dir, f"{name}-{key}.parquet")
+        meta_file = os.path.join(cache_dir, f"{name}-{key}.json")
+
+        df = read_cache(file, cache_file, meta_file, columns)
+        if df is not None:
+            return df
+
+    df = pd.read_csv(file, dtype={col: str for col in columns})
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].str.strip()
+
+    if cache_file is not None:
+        write_cache(df, file, cache_file, meta_file, columns)
+
+    return df
+
+
+def file_hash(file: str) -> str:
+    h = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+
+def read_cache(file: str, cache_file: str, meta_file: str, columns: list[str]):
+    if not (os.path.exists(cache_file) and os.path.exists(meta_file)):
+        return None
+
+    # A truncated or unreadable meta file is a miss, the cache is written again
+    try:
+        with open(meta_file, "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != CACHE_VERSION or meta.get("columns") != columns:
+        return None
+
+    stat = os.stat(file)
+    if (meta.get("mtime"), meta.get("size")) != (stat.st_mtime, stat.st_size):
+        # Touched but maybe not changed, only the content hash decides
+        if meta.get("sha256") != file_hash(file):
+            return None
+
+        meta["mtime"], meta["size"] = stat.st_mtime, stat.st_size
+        with open(meta_file, "w") as f:
+            json.dump(meta, f)
+
+    print(f"Master file loaded from cache: {file}")
+
+    return pd.read_parquet(cache_file)
+
+
+def write_cache(df: pd.DataFrame, file: str, cache_file: str, meta_file: str, columns: list[str]):
+    stat = os.stat(file)
+    meta = {
+        "version": CACHE_VERSION,
+        "file": os.path.abspath(file),
+        "columns": columns,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "sha256": file_hash(file),
+    }
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        df.to_parquet(cache_file, index=False)
+
+        with open(meta_file, "w") as f:
+            json.dump(meta, f)
+
+    except Exception as e:
+        print(f"\033[93mWarning: master file cache not written for {file}: {e}\033[0m")
+
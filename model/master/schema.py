@@ -0,0 +1,65 @@
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from typing import Optional
+import pandas as pd
+
+
+class MasterData(BaseModel):
+    """
+    Parsed master files of one run. Id and name columns are already stripped strings,
+    consumers must copy a frame before mutating it.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    venue: pd.DataFrame
+    trainer: pd.DataFrame
+    course: pd.DataFrame
+    trainee: pd.DataFrame
+    course_trainer: pd.DataFrame
+    course_sequence: pd.DataFrame
+    course_trainee: pd.DataFrame
+
+    _eligibility: Optional["EligibilityIndex"] = PrivateAttr(default=None)
+
+    @property
+    def eligibility(self) -> "EligibilityIndex":
+        """Trainer eligibility of course_trainer, built on first use and shared by every reader."""
+        if self._eligibility is None:
+            self._eligibility = EligibilityIndex.from_frame(self.course_trainer)
+
+        return self._eligibility
+
+
+class EligibilityIndex(BaseModel):
+    # trainer_id -> list of (company, course_name) the trainer may deliver
+    pairs: dict[str, list[tuple[str, str]]]
+
+    # course_name -> list of (company, trainer_id), the reverse view of pairs
+    _by_course: dict[str, list[tuple[str, str]]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context):
+        for trainer, pairs in self.pairs.items():
+            for company, course_name in pairs:
+                self._by_course.setdefault(course_name, []).append((company, trainer))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        _df_eligible = df[['trainer_id', 'company', 'course_name']].dropna()
+        _df_eligible = _df_eligible.drop_duplicates(subset=['trainer_id', 'company', 'course_name'])
+
+        _df_eligible['pair'] = list(zip(_df_eligible['company'], _df_eligible['course_name']))
+
+        return cls(pairs=_df_eligible.groupby('trainer_id', sort=False)['pair'].agg(list).to_dict())
+
+    def trainers_of(self, course_name: str, company: Optional[str] = None) -> list[str]:
+        return list(dict.fromkeys(
+            trainer
+            for c, trainer in self._by_course.get(course_name, [])
+            if company is None or c == company
+        ))
+
+    def course_batches(self, trainer: str, course_batches_mapping: dict[tuple[str, str], list[str]]) -> list[str]:
+        return [
+            item
+            for pair in self.pairs.get(trainer, [])
+            for item in course_batches_mapping.get(pair, [])
+        ]
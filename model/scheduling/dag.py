@@ -0,0 +1,170 @@
+from typing import Optional
+from .schema import CourseBatch, Group
+
+
+def find_cycle(successors: dict[str, list[str]]) -> Optional[list[str]]:
+    """Returns one cycle of the graph as [a, b, ..., a], None if it is a DAG."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = {}
+
+    for root in successors:
+        if color.get(root, WHITE) != WHITE:
+            continue
+
+        # Iterative DFS, the stack holds (node, iterator over its successors)
+        path = [root]
+        stack = [(root, iter(successors.get(root, [])))]
+        color[root] = GREY
+
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                color[node] = BLACK
+                stack.pop()
+                path.pop()
+
+            elif color.get(child, WHITE) == GREY:
+                return path[path.index(child):] + [child]
+
+            elif color.get(child, WHITE) == WHITE:
+                color[child] = GREY
+                path.append(child)
+                stack.append((child, iter(successors.get(child, []))))
+
+    return None
+
+
+def check_prerequisite_cycles(courses: dict[str, CourseBatch]):
+    """Stops the run when prerequisites and global sequences of the course batches form a cycle."""
+    successors = {}
+    for course in courses.values():
+        for prereq in dict.fromkeys(course.prerequisites + course.global_sequence):
+            if prereq in courses:
+                successors.setdefault(prereq, []).append(course.id)
+
+    cycle = find_cycle(successors)
+    if cycle is not None:
+        print(f"\033[91mWarning: Prerequisite cycle between courses: {' -> '.join(cycle)}\033[0m")
+        raise SystemExit("Stopping program")
+
+
+def course_precedences(
+    groups: dict[str, Group],
+    courses: dict[str, CourseBatch],
+    scheduled: set[str],
+    is_using_global_sequence: bool = True
+) -> dict[tuple[str, str], int]:
+    """
+    (prereq, course) -> offset, start[course] >= start[prereq] + offset, between scheduled
+    course batches. A personal prerequisite only binds when a group takes both courses.
+    """
+    edges = {}
+    for group in groups.values():
+        for course in group.courses:
+            for prereq in courses[course].prerequisites:
+                if prereq in group.courses and course in scheduled and prereq in scheduled:
+                    edges[prereq, course] = max(edges.get((prereq, course), 1), 1)
+
+    if is_using_global_sequence:
+        for course in courses:
+            for prereq in courses[course].global_sequence:
+                if course in scheduled and prereq in scheduled:
+                    offset = courses[prereq].course_batch_duration
+                    edges[prereq, course] = max(edges.get((prereq, course), offset), offset)
+
+    return edges
+
+
+def topological_order(nodes: list[str], edges: dict[tuple[str, str], int]) -> list[str]:
+    indegree = {node: 0 for node in nodes}
+    successors = {node: [] for node in nodes}
+    for before, after in edges:
+        successors[before].append(after)
+        indegree[after] += 1
+
+    order = [node for node in nodes if indegree[node] == 0]
+    for node in order:
+        for after in successors[node]:
+            indegree[after] -= 1
+            if indegree[after] == 0:
+                order.append(after)
+
+    return order
+
+
+def critical_path(nodes: list[str], edges: dict[tuple[str, str], int], durations: dict[str, int]) -> tuple[int, list[str]]:
+    """
+    Longest chain in slot units, the offsets of its precedences plus the duration of its
+    last course, with the courses on it.
+    """
+    if not nodes:
+        return 0, []
+
+    successors = {node: [] for node in nodes}
+    for (before, after), offset in edges.items():
+        successors[before].append((after, offset))
+
+    head = {node: 0 for node in nodes}
+    previous = {}
+
+    for node in topological_order(nodes, edges):
+        for after, offset in successors[node]:
+            if head[after] < head[node] + offset:
+                head[after] = head[node] + offset
+                previous[after] = node
+
+    last = max(nodes, key=lambda node: head[node] + durations[node])
+    chain = [last]
+    while chain[-1] in previous:
+        chain.append(previous[chain[-1]])
+
+    return head[last] + durations[last], chain[::-1]
+
+
+def start_bounds(
+    domains: dict[str, list[int]],
+    edges: dict[tuple[str, str], int]
+) -> dict[str, tuple[Optional[int], Optional[int]]]:
+    """
+    Earliest and latest start of every course from its predecessor and successor chains,
+    edges mean start[after] >= start[before] + offset. Bounds snap to the sorted start
+    domains, so a chain that skips blocked slots or nights is counted exactly. A course
+    whose bounds cross gets (None, None).
+    """
+    nodes = list(domains)
+    order = topological_order(nodes, edges)
+
+    predecessors = {node: [] for node in nodes}
+    successors = {node: [] for node in nodes}
+    for (before, after), offset in edges.items():
+        predecessors[after].append((before, offset))
+        successors[before].append((after, offset))
+
+    earliest = {}
+    for node in order:
+        if any(earliest[before] is None for before, _ in predecessors[node]):
+            earliest[node] = None
+            continue
+
+        bound = max((earliest[before] + offset for before, offset in predecessors[node]), default=None)
+        earliest[node] = next((v for v in domains[node] if bound is None or v >= bound), None)
+
+    latest = {}
+    for node in reversed(order):
+        if any(latest[after] is None for after, _ in successors[node]):
+            latest[node] = None
+            continue
+
+        bound = min((latest[after] - offset for after, offset in successors[node]), default=None)
+        latest[node] = next((v for v in reversed(domains[node]) if bound is None or v <= bound), None)
+
+    bounds = {}
+    for node in nodes:
+        if earliest[node] is None or latest[node] is None or earliest[node] > latest[node]:
+            bounds[node] = (None, None)
+        else:
+            bounds[node] = (earliest[node], latest[node])
+
+    return bounds
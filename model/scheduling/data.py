@@ -8,14 +8,20 @@ from typing import Optional
 from .schema import *
 from schema import ModelParams
 from .utils import *
+from .dag import check_prerequisite_cycles
+from model.master.data import read_master
+from model.master.schema import MasterData
 
 
-def read_data(params: ModelParams) -> ModelInput:
+def read_data(params: ModelParams, master: Optional[MasterData] = None) -> ModelInput:
+    if master is None:
+        master = read_master(params)
+
     calendar = read_calendar(params)
 
-    course_batches, course_batches_mapping = read_courses(params, calendar)
+    course_batches, course_batches_mapping = read_courses(params, calendar, master)
 
-    trainers = read_trainers(params, course_batches_mapping)
+    trainers = read_trainers(params, course_batches_mapping, master.eligibility, master)
     unique_trained_courses_list = list(
         dict.fromkeys(
             course
@@ -27,7 +33,7 @@ def read_data(params: ModelParams) -> ModelInput:
     print_trainers = {trainer.name: trainer.model_dump() for trainer in trainers.values() if len(trainer.eligible) > 0}
     # print("\n", highlight(json.dumps(print_trainers, indent=4), lexers.JsonLexer(), formatters.TerminalFormatter()), "\n")
 
-    groups = read_trainees(params)
+    groups = read_trainees(params, master)
     course_list = set(course_batches.keys())
     for key, group in groups.items():
         groups[key].courses = [x for x in group.courses if x in course_list and x in unique_trained_courses_list]
@@ -53,7 +59,7 @@ def read_data(params: ModelParams) -> ModelInput:
     print("\n\n\n", highlight(json.dumps(print_course_batches, indent=4), lexers.JsonLexer(), formatters.TerminalFormatter()), "\n")
 
 
-    venue = read_venue(params)
+    venue = read_venue(params, master)
 
     if params.is_blocking_schedule:
         trainers, groups = read_blocked_schedule(params, calendar, trainers, groups)
@@ -67,8 +73,8 @@ def read_data(params: ModelParams) -> ModelInput:
     )
 
 
-def read_venue(params: ModelParams):
-    _df_venue = pd.read_csv(params.file_master_venue)
+def read_venue(params: ModelParams, master: MasterData):
+    _df_venue = master.venue
 
     if params.companies:
         _df_venue = _df_venue[_df_venue['company'].isin(params.companies)]
@@ -94,12 +100,10 @@ def read_venue(params: ModelParams):
     return venues
 
 
-def read_courses(params: ModelParams, calendar: Calendar):
-    _df_course = pd.read_csv(params.file_master_course)
-    _df_course['course_name'] = _df_course['course_name'].str.strip()
+def read_courses(params: ModelParams, calendar: Calendar, master: MasterData):
+    _df_course = master.course.copy()
     _df_course = _df_course[_df_course['course_name']!= '']
 
-    _df_course['stream'] = _df_course['stream'].str.strip()
     if 'duration_minutes' not in _df_course.columns:
         _df_course['duration_minutes'] = _df_course['duration']
 
@@ -109,24 +113,19 @@ def read_courses(params: ModelParams, calendar: Calendar):
     # If duration_minutes < 0, replace with default_course_duration*60 as well
     _df_course.loc[_df_course['duration_minutes'] < 0, 'duration_minutes'] = params.default_course_duration * 60
 
-    _df_prereq = pd.read_csv(params.file_master_course_sequence)
+    _df_prereq = master.course_sequence.copy()
     _df_prereq = _df_prereq[
         _df_prereq['prerequisite_course_name'].notna() &
-        (_df_prereq['prerequisite_course_name'].str.strip() != "")
+        (_df_prereq['prerequisite_course_name'] != "")
     ]
 
-    _df_prereq['course_name'] = _df_prereq['course_name'].str.strip()
-    _df_prereq['prerequisite_course_name'] = _df_prereq['prerequisite_course_name'].str.strip()
-    
     if 'is_global_sequence' not in _df_prereq.columns:
         _df_prereq['is_global_sequence'] = False
 
     if params.course_stream is not None:
-        _df_course['stream'] = _df_course['stream'].str.strip()
         _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
 
     if params.companies is not None:
-        _df_course['company'] = _df_course['company'].str.strip()
         _df_course = _df_course[_df_course["company"].isin(params.companies)]
     
 
@@ -136,6 +135,22 @@ def read_courses(params: ModelParams, calendar: Calendar):
         (_df_prereq['prerequisite_course_name'].isin(list_course_name))
     ]
 
+    # Prerequisite and global sequence index, course_name -> prerequisite course names.
+    # Duplicates are dropped after the split, a pair is global if any of its rows is flagged.
+    prereq_index = (
+        _df_prereq.drop_duplicates(subset=['course_name', 'prerequisite_course_name'])
+            .groupby('course_name', sort=False)['prerequisite_course_name']
+            .agg(list)
+            .to_dict()
+    )
+    sequence_index = (
+        _df_prereq[_df_prereq['is_global_sequence'].fillna(False).astype(bool)]
+            .drop_duplicates(subset=['course_name', 'prerequisite_course_name'])
+            .groupby('course_name', sort=False)['prerequisite_course_name']
+            .agg(list)
+            .to_dict()
+    )
+
     courses = {}
     for _, course_row in _df_course.iterrows():
         try:
@@ -156,15 +171,13 @@ def read_courses(params: ModelParams, calendar: Calendar):
                 if pd.notnull(val) and str(val).strip() != "":
                     valid_end_date = str(val).strip()
 
-            prereqs = _df_prereq[_df_prereq['course_name'] == course_name]
-            prerequisites = [] if prereqs.empty else prereqs['prerequisite_course_name'].drop_duplicates().tolist()
+            prerequisites = prereq_index.get(course_name, [])
 
             if prerequisites and course_name in prerequisites:
                 print(f"\033[91mWarning: Course '{course_name}' has itself as a prerequisite. Removing it from the prerequisites list.\033[0m")
                 raise SystemExit("Stopping program")
             
-            seq = _df_prereq[(_df_prereq['course_name'] == course_name) & (_df_prereq['is_global_sequence'])]
-            sequence = [] if seq.empty else seq['prerequisite_course_name'].drop_duplicates().tolist()
+            sequence = sequence_index.get(course_name, [])
 
             courses[course_company, course_name] = Course(
                 company=course_company,
@@ -198,7 +211,7 @@ def read_courses(params: ModelParams, calendar: Calendar):
         else:
             dfs = []
             for file in params.file_master_course_batch:
-                dfs.append(pd.read_csv(file))
+                dfs.append(pd.read_csv(file, dtype={"company": str, "course_name": str}))
 
             _df_batch = pd.concat(dfs, ignore_index=True)
             _df_batch['course_name'] = _df_batch['course_name'].str.strip()
@@ -252,96 +265,60 @@ def read_courses(params: ModelParams, calendar: Calendar):
             course_batches_mapping[course.company, course.name].append(batch.id)
 
     # Updating prerequsites and global sequence with batch id
+    course_name_batches: dict[str, list[str]] = {}
+    for (company, course_name), items in course_batches_mapping.items():
+        course_name_batches.setdefault(course_name, []).extend(items)
+
     for batch_id, batch in course_batches.items():
-        prerequisites = batch.prerequisites
-        if prerequisites is not None:
-            batch_prerequisites = [
+        if batch.prerequisites is not None:
+            course_batches[batch_id].prerequisites = [
                 item
-                for k in prerequisites
-                for (company, course_name), items in course_batches_mapping.items()
-                if course_name == k
-                for item in items
+                for k in batch.prerequisites
+                for item in course_name_batches.get(k, [])
             ]
-            course_batches[batch_id].prerequisites = batch_prerequisites
 
-        sequence = batch.global_sequence
-        if sequence is not None:
-            batch_sequence = [
+        if batch.global_sequence is not None:
+            course_batches[batch_id].global_sequence = [
                 item
-                for k in sequence
-                for (company, course_name), items in course_batches_mapping.items()
-                if course_name == k
-                for item in items
+                for k in batch.global_sequence
+                for item in course_name_batches.get(k, [])
             ]
-            course_batches[batch_id].global_sequence = batch_sequence
+
+    check_prerequisite_cycles(course_batches)
 
     print("Len Course Batches:", len(course_batches))
 
     return course_batches, course_batches_mapping
 
 
-def read_trainers(params: ModelParams, course_batches_mapping: dict[tuple[str, str], list[str]]):
-    _df_trainer = pd.read_csv(params.file_master_trainer)
-    _df_trainer = _df_trainer.drop_duplicates(subset=["trainer_id"])
-    _df_trainer['trainer_id'] = _df_trainer['trainer_id'].astype(str).str.strip()
+def read_trainers(
+    params: ModelParams,
+    course_batches_mapping: dict[tuple[str, str], list[str]],
+    eligibility: EligibilityIndex,
+    master: MasterData
+):
+    _df_trainer = master.trainer.dropna(subset=["trainer_id"])
     _df_trainer = _df_trainer[_df_trainer['trainer_id'] != '']
-    
-    _df_eligible = pd.read_csv(params.file_master_course_trainer)
-    _df_eligible['trainer_id'] = _df_eligible['trainer_id'].astype(str).str.strip()
-    _df_eligible['company'] = _df_eligible['company'].astype(str).str.strip()
-    _df_eligible['course_name'] = _df_eligible['course_name'].astype(str).str.strip()
 
     trainers = {}
-    for _, trainer_row in _df_trainer.iterrows():
-        try:
-            trainer_id = trainer_row['trainer_id']
-            eligible_pairs = list(
-                _df_eligible[_df_eligible['trainer_id'] == trainer_id]
-                    .drop_duplicates(subset=['company', 'course_name'])
-                    [['company', 'course_name']]
-                    .itertuples(index=False, name=None)
-            )
+    for trainer_id in _df_trainer['trainer_id'].drop_duplicates():
+        eligible_course_batches = eligibility.course_batches(trainer_id, course_batches_mapping)
 
-            # if trainer_id == '6838':
-            #     print(f"Processing trainer: {trainer_id}, Eligible pairs: {eligible_pairs}")
-
-            #     print(course_batches_mapping['SMU HO', '(EUT) SMU HO - WGO - Display Material Master'])
-            #     print(type(eligible_pairs))
-
-            #     raise SystemExit("Stopping program")
-
-            eligible_course_batches = [
-                item
-                for company, course_name in eligible_pairs
-                    if (company, course_name) in course_batches_mapping
-                        for item in course_batches_mapping[(company, course_name)]
-            ]
-
-            # print(f"Trainer: {trainer_id}, Eligible course batches: {eligible_course_batches}")
-
-            if eligible_course_batches:
-                trainers[trainer_id] = Trainer(
-                    name=trainer_id,
-                    eligible=eligible_course_batches
-                )
-
-                # if trainer_id == '6838':
-                #     print(f"Added trainer: {trainer_id}, Eligible courses: {eligible_course_batches}")
-                #     raise SystemExit("Stopping program")
-
-        except Exception as e:
-            continue
+        if eligible_course_batches:
+            trainers[trainer_id] = Trainer(
+                name=trainer_id,
+                eligible=eligible_course_batches
+            )
 
     print("Len Trainers:", len(trainers))
 
     return trainers
 
 
-def read_trainees(params: ModelParams):
-    _df_trainee = pd.read_csv(params.file_master_trainee)
-    _df_trainee['employee_id'] = _df_trainee['employee_id'].astype(str)
+def read_trainees(params: ModelParams, master: MasterData):
+    _df_trainee = master.trainee.dropna(subset=["employee_id"])
     _df_trainee = _df_trainee.drop_duplicates(subset=["employee_id"])
-    _df_trainee = _df_trainee[_df_trainee['employee_id'].astype(str).str.strip() != '']
+    _df_trainee = _df_trainee[_df_trainee['employee_id'] != ''].copy()
 
     if params.companies is not None:
         _df_trainee = _df_trainee[_df_trainee['company'].isin(params.companies)]
@@ -353,19 +330,17 @@ def read_trainees(params: ModelParams):
     _df_trainee['cycle'] = _df_trainee['is_available_saturday'].apply(lambda x: "WEnd" if x else "WDays")
     _df_trainee['cycle'] = 'WEnd'
 
-    _df_enrollment = pd.read_csv(params.file_master_course_trainee)
+    _df_enrollment = master.course_trainee
     _df_enrollment = _df_enrollment[
         _df_enrollment["course_name"].isin(
             _df_enrollment.groupby("course_name")["employee_id"].nunique().loc[lambda s: s >= params.minimum_course_participant].index
         )
     ]
 
-    _df_enrollment['employee_id'] = _df_enrollment['employee_id'].astype(str)
-    _df_enrollment['course_name'] = _df_enrollment['course_name'].str.strip()
     _df_enrollment = _df_enrollment[_df_enrollment['course_exist'] == True]
 
     if params.course_stream is not None:
-        _df_course = pd.read_csv(params.file_master_course)
+        _df_course = master.course
         _df_course = _df_course[_df_course["stream"].isin(params.course_stream)]
 
         _course_list = _df_course['course_name'].drop_duplicates().tolist()
@@ -375,74 +350,84 @@ def read_trainees(params: ModelParams):
     if params.is_considering_shift and params.file_master_course_batch is not None:
         dfs = []
         for file in params.file_master_course_batch:
-            dfs.append(pd.read_csv(file))
+            dfs.append(pd.read_csv(file, dtype={"company": str, "course_name": str, "trainee_id": str}))
 
         _df_batch = pd.concat(dfs, ignore_index=True)
         _df_batch['course_name'] = _df_batch['course_name'].astype(str).str.strip()
         _df_batch['trainee_id'] = _df_batch['trainee_id'].astype(str).str.strip()
         
-        batch_lookup = _df_batch.set_index(["company", "course_name", "trainee_id"])["batch_no"]
+        batch_lookup = (
+            _df_batch[["company", "course_name", "trainee_id", "batch_no"]]
+                .drop_duplicates(subset=["company", "course_name", "trainee_id"])
+                .rename(columns={"trainee_id": "employee_id"})
+        )
 
 
-    _trainees = []
-    for _, trainee_row in _df_trainee.iterrows():
-        try:
-            trainee_name = trainee_row['employee_id']
-            trainee_cycle = trainee_row['cycle']
-            trainee_company = trainee_row['company']
-
-            # Get courses for this trainee from enrollment dataframe
-            enrolled_courses = _df_enrollment[_df_enrollment['employee_id'] == trainee_name]['course_name'].drop_duplicates().tolist()
-
-            if enrolled_courses:  # Only include trainees with at least one course
-                enrolled_courses_batches = []
-                for course in enrolled_courses:
-                    if not params.is_considering_shift or params.file_master_course_batch is None:
-                        batch_no = 1
-                    
-                    else:
-                        batch_no = batch_lookup.get((trainee_company, course, trainee_name), 1)
-                    
-                    enrolled_courses_batches.append(
-                        f"[{trainee_company}]-[{course}]-[{batch_no}]"
-                    )
-
-                _trainees.append(
-                    Trainee(
-                        company=trainee_company,
-                        name=trainee_name,
-                        courses=enrolled_courses_batches,
-                        cycle=trainee_cycle
-                    )
-                )
-                # print("Added trainee:", trainee_name, "Shift:", trainee_shift, "Cycle:", trainee_cycle, "Courses:", enrolled_courses)
+    # ===============================
+    # GROUP FORMATION
+    # ===============================
+    # One merge of trainees with their (deduplicated) enrollments, then every trainee's
+    # sorted course-batch set becomes its group key. The trainee file order decides the
+    # group numbering.
+    _df_enrolled = (
+        _df_trainee[['employee_id', 'company', 'cycle']]
+            .assign(order=range(len(_df_trainee)))
+            .dropna(subset=['company'])
+            .merge(
+                _df_enrollment[['employee_id', 'course_name']].drop_duplicates(),
+                on='employee_id',
+                how='inner',
+                sort=False
+            )
+    )
 
-        except Exception as e:
-            continue
+    if params.is_considering_shift and params.file_master_course_batch is not None:
+        _df_enrolled = _df_enrolled.merge(
+            batch_lookup,
+            on=['company', 'course_name', 'employee_id'],
+            how='left',
+            sort=False
+        )
+        _df_enrolled['batch_no'] = _df_enrolled['batch_no'].fillna(1).astype(int)
 
+    else:
+        _df_enrolled['batch_no'] = 1
 
-    _groups = {}
-    for trainee in _trainees:
-        course_key = tuple(sorted(trainee.courses))
-        # group_key = tuple(list(course_key) + [trainee.shift, trainee.cycle])
-        group_key = tuple(list(course_key))
-        
-        if group_key not in _groups:
-            _groups[group_key] = {
-                "name": f"G{len(_groups) + 1}",
-                "courses": list(course_key),
-                "trainees": [],
-                "cycle": trainee.cycle
-            }
+    _df_enrolled['course_batch'] = (
+        "[" + _df_enrolled['company'].astype(str) + "]-[" + _df_enrolled['course_name'].astype(str)
+        + "]-[" + _df_enrolled['batch_no'].astype(str) + "]"
+    )
 
-        _groups[group_key]["trainees"].append(trainee.name)
+    _df_trainee_courses = (
+        _df_enrolled
+            .sort_values(['order', 'course_batch'], kind='stable')
+            .groupby('order', sort=True)
+            .agg(
+                employee_id=('employee_id', 'first'),
+                cycle=('cycle', 'first'),
+                courses=('course_batch', tuple)
+            )
+    )
+
+    group_codes, group_keys = pd.factorize(_df_trainee_courses['courses'])
+    _df_trainee_courses['group'] = group_codes
+
+    _df_groups = _df_trainee_courses.groupby('group', sort=True).agg(
+        trainees=('employee_id', list),
+        cycle=('cycle', 'first')
+    )
 
     groups = {}
-    for value in _groups.values():
-        group = Group(**value)
+    for code, row in _df_groups.iterrows():
+        group = Group(
+            name=f"G{code + 1}",
+            courses=list(group_keys[code]),
+            trainees=row['trainees'],
+            cycle=row['cycle']
+        )
         groups[group.name] = group
 
-    print("Len Trainees:", len(_trainees), "\nLen Groups:", len(groups))
+    print("Len Trainees:", len(_df_trainee_courses), "\nLen Groups:", len(groups))
 
     return groups
 
@@ -0,0 +1,74 @@
+from .schema import ModelInput
+
+
+def interaction_components(data: ModelInput) -> list[ModelInput]:
+    """
+    Splits the input into parts that share no constraint. Groups, course batches, trainers
+    and venues are the nodes, a group is linked to its courses, a course to its eligible
+    trainers, to the venues of its company and to its prerequisites and global sequence.
+    Every connected component with at least one course taken by a group becomes its own
+    ModelInput, largest first. Trainers and venues that no such course can use are left out.
+    """
+    G = data.groups
+    T = data.trainers
+    V = data.venues
+    C = data.courses
+
+    # Union-find over (kind, name) nodes
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(a, b):
+        parent[find(a)] = find(b)
+
+    courses = {course for group in G.values() for course in group.courses if course in C}
+
+    for group in G:
+        for course in G[group].courses:
+            if course in courses:
+                union(("group", group), ("course", course))
+
+    for trainer in T:
+        for course in T[trainer].eligible:
+            if course in courses:
+                union(("trainer", trainer), ("course", course))
+
+    for venue in V:
+        for course in courses:
+            if C[course].company in V[venue].company:
+                union(("venue", venue), ("course", course))
+
+    for course in courses:
+        for prereq in C[course].prerequisites + C[course].global_sequence:
+            if prereq in courses:
+                union(("course", prereq), ("course", course))
+
+    members = {}
+    for kind, name in list(parent):
+        members.setdefault(find((kind, name)), {}).setdefault(kind, set()).add(name)
+
+    components = []
+    for nodes in members.values():
+        if "course" not in nodes:
+            continue
+
+        components.append(ModelInput(
+            calendar=data.calendar,
+            venues={venue: V[venue] for venue in V if venue in nodes.get("venue", ())},
+            trainers={
+                trainer: T[trainer].model_copy(
+                    update={"eligible": [course for course in T[trainer].eligible if course in nodes["course"]]}
+                )
+                    for trainer in T if trainer in nodes.get("trainer", ())
+            },
+            courses={course: C[course] for course in C if course in nodes["course"]},
+            groups={group: G[group] for group in G if group in nodes.get("group", ())}
+        ))
+
+    return sorted(components, key=lambda component: len(component.courses), reverse=True)
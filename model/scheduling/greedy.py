@@ -0,0 +1,164 @@
+from schema import ModelParams
+from .schema import *
+from .dag import course_precedences, topological_order
+import time
+
+
+def greedy_schedule(params: ModelParams, data: ModelInput, schedule: ScheduleModel) -> ScheduleSolution:
+    """
+    List scheduling without CP-SAT. Sessions go in prerequisite topological rank, then least
+    slack first, each at the earliest slot of its start domain where every group is free and
+    under the daily limit, an eligible trainer is free, and a room of a candidate venue class
+    is free. Occupancy is kept as one bitmap per group, trainer and room over the horizon.
+
+    Every group of a course takes its first session. Sessions that find no slot are left out,
+    so the result may only cover part of the courses.
+    """
+    started = time.perf_counter()
+
+    G = data.groups
+    T = data.trainers
+    V = data.venues
+    C = data.courses
+    S = schedule.sessions
+    HOURS_PER_DAY = params.hours_per_day
+    MAX_SESSION_LENGTH = params.maximum_session_length
+
+    is_limiting_company = (
+        params.is_limiting_trainer_company and params.companies is not None and len(params.companies) > 1
+    )
+
+    # ===============================
+    # ORDER
+    # ===============================
+    courses = [course for course in C if course in S]
+    edges = course_precedences(G, C, set(courses), params.is_using_global_sequence)
+
+    predecessors = {course: [] for course in courses}
+    for (prereq, course), offset in edges.items():
+        predecessors[course].append((prereq, offset))
+
+    rank = {}
+    for course in topological_order(courses, edges):
+        rank[course] = max((rank[prereq] + 1 for prereq, _ in predecessors[course]), default=0)
+
+    def slack(course):
+        domain = schedule.start_domain[course]
+        return domain[-1] - domain[0]
+
+    def occupancy(course):
+        return sum(len(G[group].trainees) for group in schedule.course_groups.get(course, []))
+
+    order = sorted(
+        (course for course in courses if course in rank),
+        key=lambda course: (rank[course], slack(course), -occupancy(course))
+    )
+
+    # Virtual rooms last, they are penalized in the CP objective
+    rooms = {
+        course: [
+            room
+                for venue in sorted(schedule.venue_candidates[course], key=lambda v: V[schedule.venue_rooms[v][0]].is_virtual)
+                    for room in schedule.venue_rooms[venue]
+        ]
+        for course in order
+    }
+
+    # ===============================
+    # PLACEMENT
+    # ===============================
+    group_busy = {group: 0 for group in G}
+    trainer_busy = {trainer: 0 for trainer in T}
+    room_busy = {room: 0 for room in V}
+    group_day_load = {}
+    trainer_day_company = {}
+    trainer_load = {trainer: 0 for trainer in T}
+
+    sessions = {}
+    assigned = {}
+
+    for course in order:
+        session = S[course][0]
+        dur = C[course].course_batch_duration
+        daily = min(dur, MAX_SESSION_LENGTH)
+        company = C[course].company
+        groups = schedule.course_groups.get(course, [])
+        seats = occupancy(course)
+
+        if any((prereq, S[prereq][0]) not in sessions for prereq, _ in predecessors[course]):
+            print(f"Greedy: {course} skipped, a prerequisite is not placed")
+            continue
+
+        earliest = max(
+            (sessions[prereq, S[prereq][0]].start + offset for prereq, offset in predecessors[course]),
+            default=0
+        )
+
+        # Least loaded trainers first
+        trainers = sorted(schedule.eligible.by_course.get(course, []), key=trainer_load.get)
+
+        placed = None
+        for start in schedule.start_domain[course]:
+            if start < earliest:
+                continue
+
+            mask = ((1 << dur) - 1) << start
+            day = start // HOURS_PER_DAY
+
+            if any(
+                group_busy[group] & mask or group_day_load.get((group, day), 0) + daily > MAX_SESSION_LENGTH
+                    for group in groups
+            ):
+                continue
+
+            trainer = next(
+                (
+                    trainer for trainer in trainers
+                        if not trainer_busy[trainer] & mask
+                        and not (params.is_blocking_schedule and start in (T[trainer].blocked_start_time or []))
+                        and not (is_limiting_company and trainer_day_company.get((trainer, day), company) != company)
+                ),
+                None
+            )
+            if trainer is None:
+                continue
+
+            room = next(
+                (room for room in rooms[course] if not room_busy[room] & mask and V[room].capacity >= seats),
+                None
+            )
+            if room is None:
+                continue
+
+            placed = (start, mask, day, trainer, room)
+            break
+
+        if placed is None:
+            print(f"Greedy: no slot found for {course}")
+            continue
+
+        start, mask, day, trainer, room = placed
+
+        for group in groups:
+            group_busy[group] |= mask
+            group_day_load[group, day] = group_day_load.get((group, day), 0) + daily
+            assigned[group, course] = session
+
+        trainer_busy[trainer] |= mask
+        trainer_day_company[trainer, day] = company
+        trainer_load[trainer] += dur
+        room_busy[room] |= mask
+
+        sessions[course, session] = SessionSlot(start=start, end=start + dur, venue=room, trainer=trainer)
+
+    print(f"Greedy schedule: {len(sessions)} of {len(courses)} sessions placed in {time.perf_counter() - started:.2f}s")
+
+    return ScheduleSolution(sessions=sessions, assigned=assigned)
+
+
+def solution_hints(solution: ScheduleSolution) -> dict[tuple, dict]:
+    """(course, session) -> start/venue/trainer, the input of add_schedule_hints."""
+    return {
+        key: {"start": slot.start, "venue": slot.venue, "trainer": slot.trainer}
+            for key, slot in solution.sessions.items()
+    }
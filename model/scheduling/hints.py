@@ -0,0 +1,68 @@
+import pandas as pd
+from typing import Optional
+
+from .schema import ModelInput, ScheduleModel
+
+
+def read_schedule_hints(file: str, data: ModelInput, hours_per_day: int) -> dict[tuple, dict]:
+    """
+    Reads a group-level schedule export into (course, session) -> start, venue and trainer.
+    Starts come from the Date column, so a previous run on a shifted calendar still maps.
+    """
+    df = pd.read_csv(file, dtype={"Course": str, "Date": str, "Venue": str, "Trainer": str})
+    df = df.drop_duplicates(subset=["Course", "Session"])
+
+    hints = {}
+    for course, session, date, start_hour, venue, trainer in zip(
+        df["Course"], df["Session"], df["Date"], df["Start Hour"], df["Venue"], df["Trainer"]
+    ):
+        day = data.calendar.index.get(date)
+
+        hints[course, int(session)] = {
+            "start": None if day is None else day * hours_per_day + int(start_hour),
+            "venue": venue if pd.notnull(venue) else None,
+            "trainer": trainer if pd.notnull(trainer) else None,
+        }
+
+    return hints
+
+
+def add_schedule_hints(schedule: ScheduleModel, hints: dict[tuple, dict], hours_per_day: int) -> dict[str, int]:
+    """
+    Loads (course, session) -> start/venue/trainer as solution hints. A value that no longer
+    fits the model (unknown course batch, start outside the start domain, venue or trainer
+    no longer a candidate) is skipped. Returns how many hints of each kind were applied.
+    """
+    model = schedule.model
+    class_of = {room: venue for venue, rooms in schedule.venue_rooms.items() for room in rooms}
+
+    counts = {"sessions": 0, "start": 0, "venue": 0, "trainer": 0, "skipped": 0}
+    for (course, session), hint in hints.items():
+        if (course, session) not in schedule.start_session:
+            counts["skipped"] += 1
+            continue
+
+        counts["sessions"] += 1
+
+        start = hint["start"]
+        if start is not None and start in set(schedule.start_domain[course]):
+            day = start // hours_per_day
+
+            model.AddHint(schedule.start_session[course, session], start)
+            model.AddHint(schedule.day_session[course, session], day)
+            model.AddHint(schedule.on_day[course, session, day], True)
+            counts["start"] += 1
+
+        venue = class_of.get(hint["venue"])
+        if (course, session, venue) in schedule.venue_session:
+            for candidate in schedule.venue_candidates[course]:
+                model.AddHint(schedule.venue_session[course, session, candidate], candidate == venue)
+            counts["venue"] += 1
+
+        trainer = hint["trainer"]
+        if (course, session, trainer) in schedule.trainer_session:
+            for candidate in schedule.eligible.by_course.get(course, []):
+                model.AddHint(schedule.trainer_session[course, session, candidate], candidate == trainer)
+            counts["trainer"] += 1
+
+    return counts
@@ -0,0 +1,74 @@
+from ortools.sat.python import cp_model
+from typing import Optional
+
+from schema import ModelParams
+from .schema import ScheduleModel
+from .streaming import ScheduleStreamer
+
+
+def solve_lexicographic(
+    params: ModelParams,
+    schedule: ScheduleModel,
+    streamer: Optional[ScheduleStreamer] = None
+) -> tuple[cp_model.CpSolver, int]:
+    """
+    Minimizes the objective terms one at a time in priority order, daily imbalance, virtual
+    sessions, then trainer imbalance, instead of their weighted sum. Every stage gets its
+    share of max_time_in_seconds, keeps the value it reached as an upper bound for the next
+    stages, and hints the next stage with its whole solution.
+
+    Returns the solver of the last stage that found a solution, with OPTIMAL only when every
+    stage was solved to optimality. A term that is a constant (trainer imbalance in matching
+    mode) is skipped. A streamer is attached to every stage.
+    """
+    model = schedule.model
+
+    stages = [
+        (name, term) for name, term in (
+            ("daily imbalance", schedule.daily_imbalance),
+            ("virtual sessions", schedule.virtual_sessions),
+            ("trainer imbalance", schedule.trainer_imbalance),
+        ) if not isinstance(term, int)
+    ]
+
+    shares = params.lexicographic_time_shares[:len(stages)]
+    total_share = sum(shares)
+
+    solved, status = None, cp_model.UNKNOWN
+    is_optimal = True
+
+    for stage, ((name, term), share) in enumerate(zip(stages, shares), start=1):
+        model.Minimize(term)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = params.max_time_in_seconds * share / total_share
+        solver.parameters.num_search_workers = params.num_search_workers
+
+        stage_status = solver.Solve(model) if streamer is None else streamer.solve(solver, model, name)
+
+        print(
+            f"Stage {stage} {name}: {solver.StatusName(stage_status)}, objective {solver.ObjectiveValue()}, "
+            f"bound {solver.BestObjectiveBound()}, {solver.WallTime():.2f}s"
+        )
+
+        if stage_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # Later stages keep the last solution, the first one has nothing to fall back on
+            if solved is None:
+                status = stage_status
+            break
+
+        solved, status = solver, stage_status
+        is_optimal = is_optimal and stage_status == cp_model.OPTIMAL
+
+        # Fix the reached value and start the next stage from this solution
+        model.Add(term <= int(solver.ObjectiveValue()))
+
+        model.ClearHints()
+        for index in range(len(model.Proto().variables)):
+            var = model.GetIntVarFromProtoIndex(index)
+            model.AddHint(var, solver.Value(var))
+
+    if solved is None:
+        return solver, status
+
+    return solved, cp_model.OPTIMAL if is_optimal else cp_model.FEASIBLE
@@ -0,0 +1,105 @@
+from ortools.sat.python import cp_model
+from typing import Optional
+
+from schema import ModelParams
+from .schema import ModelInput, TrainerEligibility
+
+
+def match_trainers(
+    params: ModelParams,
+    data: ModelInput,
+    eligible: TrainerEligibility,
+    times: dict[tuple, tuple[int, int]],
+    max_time_in_seconds: float
+) -> Optional[dict[tuple, str]]:
+    """
+    Assigns a trainer to every (course, session) of a solved schedule, times are the fixed
+    (start, end) of the sessions. With the times fixed, a trainer conflict is an at-most-one
+    over the sessions covering one of its slots, so the assignment is a bipartite matching
+    of sessions to trainers with those slot cliques as side constraints. Blocked start
+    times and the one-company-per-day rule are kept, trainer workload balance is the
+    objective. Returns None when no assignment exists.
+
+    The slot cliques and the company rule do not fit a plain max-flow, which cannot express
+    partially overlapping intervals, so the matching is a small boolean CP-SAT model with
+    its own time budget, max_time_in_seconds.
+    """
+    T = data.trainers
+    C = data.courses
+    model = cp_model.CpModel()
+
+    x = {}
+    for (course, session), (start, end) in times.items():
+        candidates = [
+            trainer for trainer in eligible.by_course.get(course, [])
+                if not (params.is_blocking_schedule and start in (T[trainer].blocked_start_time or []))
+        ]
+
+        if not candidates:
+            print(f"Trainer matching: no available trainer for {course} at slot {start}")
+            return None
+
+        for trainer in candidates:
+            x[course, session, trainer] = model.NewBoolVar(f"match_{course}_{session}_{trainer}")
+
+        model.AddExactlyOne(x[course, session, trainer] for trainer in candidates)
+
+    # One session at a time per trainer
+    busy = {}
+    for (course, session, trainer), literal in x.items():
+        start, end = times[course, session]
+        for slot in range(start, end):
+            busy.setdefault((trainer, slot), []).append(literal)
+
+    for literals in busy.values():
+        if len(literals) > 1:
+            model.AddAtMostOne(literals)
+
+    # Max 1 company per trainer per day
+    if params.is_limiting_trainer_company and params.companies is not None and len(params.companies) > 1:
+        trainer_day = {}
+        for (course, session, trainer), literal in x.items():
+            day = times[course, session][0] // params.hours_per_day
+            trainer_day.setdefault((trainer, day), {}).setdefault(C[course].company, []).append(literal)
+
+        for (trainer, day), companies in trainer_day.items():
+            if len(companies) <= 1:
+                continue
+
+            serves = {}
+            for company, literals in companies.items():
+                serves[company] = model.NewBoolVar(f"serves_{trainer}_{day}_{company}")
+                for literal in literals:
+                    model.AddImplication(literal, serves[company])
+
+            model.AddAtMostOne(serves.values())
+
+    # Trainer workload balance
+    horizon = params.days * params.hours_per_day
+    max_load = model.NewIntVar(0, horizon, "max_trainer_load")
+    min_load = model.NewIntVar(0, horizon, "min_trainer_load")
+
+    load = {trainer: [] for trainer in T}
+    for (course, session, trainer), literal in x.items():
+        load[trainer].append(C[course].course_batch_duration * literal)
+
+    for trainer in T:
+        model.Add(sum(load[trainer]) <= max_load)
+        model.Add(sum(load[trainer]) >= min_load)
+
+    model.Minimize(max_load - min_load)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_time_in_seconds
+    solver.parameters.num_search_workers = params.num_search_workers
+
+    status = solver.Solve(model)
+    print(f"Trainer matching: {solver.StatusName(status)}, workload imbalance {solver.ObjectiveValue()}")
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    return {
+        (course, session): trainer
+            for (course, session, trainer), literal in x.items() if solver.Value(literal)
+    }
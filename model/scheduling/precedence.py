@@ -0,0 +1,107 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+
+
+class PrecedenceRegistry(BaseModel):
+    """
+    Collects start_session[after] >= start_session[before] + offset constraints before they
+    are posted. Duplicates are merged, keeping the largest offset, and constraints implied by
+    a chain of unconditional ones (transitive reduction on the prerequisite DAG) are dropped.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # (before, after, enforcement) -> offset, before/after are (course, session) and
+    # enforcement a sorted tuple of literal indices, empty when unconditional
+    edges: dict[tuple, int] = {}
+    literals: dict[int, Any] = {}
+    added: int = 0
+
+    def add(self, before: tuple, after: tuple, offset: int, enforcement: list = ()):
+        self.added += 1
+
+        for literal in enforcement:
+            self.literals[literal.Index()] = literal
+
+        key = (before, after, tuple(sorted({literal.Index() for literal in enforcement})))
+        self.edges[key] = max(self.edges.get(key, offset), offset)
+
+    def longest_paths(self) -> Optional[tuple[dict, dict]]:
+        """
+        Longest unconditional path between every pair of connected sessions, with the
+        unconditional successors of every session. None if the unconditional edges have a cycle.
+        """
+        successors = {}
+        for (before, after, enforcement), offset in self.edges.items():
+            if not enforcement:
+                successors.setdefault(before, {})[after] = offset
+                successors.setdefault(after, {})
+
+        # Kahn's topological order
+        indegree = {node: 0 for node in successors}
+        for node in successors:
+            for after in successors[node]:
+                indegree[after] += 1
+
+        order = [node for node, degree in indegree.items() if degree == 0]
+        for node in order:
+            for after in successors[node]:
+                indegree[after] -= 1
+                if indegree[after] == 0:
+                    order.append(after)
+
+        if len(order) < len(successors):
+            return None
+
+        # paths[a][c] = longest path from a to c, filled in reverse topological order
+        paths = {}
+        for node in reversed(order):
+            paths[node] = {node: 0}
+            for after, offset in successors[node].items():
+                for target, length in paths[after].items():
+                    if paths[node].get(target, -1) < offset + length:
+                        paths[node][target] = offset + length
+
+        return paths, successors
+
+    def reduce(self) -> int:
+        """Drops edges implied by a longer chain of unconditional edges, returns how many."""
+        result = self.longest_paths()
+        if result is None:
+            print("\033[93mWarning: Precedence cycle found, transitive reduction skipped.\033[0m")
+            return 0
+
+        paths, successors = result
+
+        redundant = []
+        for key, offset in self.edges.items():
+            before, after, enforcement = key
+
+            if enforcement:
+                # Any unconditional chain at least as long implies it
+                implied = paths.get(before, {}).get(after, -1)
+            else:
+                # Only chains through another successor, the longest path may be the edge itself
+                implied = max(
+                    (
+                        weight + paths[middle][after]
+                            for middle, weight in successors[before].items()
+                                if middle != after and after in paths[middle]
+                    ),
+                    default=-1
+                )
+
+            if implied >= offset:
+                redundant.append(key)
+
+        for key in redundant:
+            del self.edges[key]
+
+        return len(redundant)
+
+    def post(self, model, start_session: dict):
+        for (before, after, enforcement), offset in self.edges.items():
+            model.Add(
+                start_session[after] >= start_session[before] + offset
+            ).OnlyEnforceIf(
+                [self.literals[index] for index in enforcement]
+            )
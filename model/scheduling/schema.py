@@ -1,9 +1,11 @@
-from pydantic import BaseModel
-from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Literal, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
 from datetime import datetime, timedelta
 
+from model.master.schema import EligibilityIndex
+
 
 class Venue(BaseModel):
     company: list[str]
@@ -18,6 +20,27 @@ class Trainer(BaseModel):
     blocked_start_time: Optional[list[int]] = None
 
 
+class TrainerEligibility(BaseModel):
+    """
+    Course batch level view of the master EligibilityIndex. Trainer.eligible already holds
+    the batch ids the index resolves, so both directions are built from the trainers.
+    """
+    by_course: dict[str, list[str]]   # course batch id -> eligible trainers
+    by_trainer: dict[str, list[str]]  # trainer -> eligible course batch ids
+
+    @classmethod
+    def from_trainers(cls, trainers: dict[str, Trainer]):
+        by_course = {}
+        by_trainer = {}
+        for trainer in trainers.values():
+            by_trainer[trainer.name] = list(dict.fromkeys(trainer.eligible))
+
+            for course in by_trainer[trainer.name]:
+                by_course.setdefault(course, []).append(trainer.name)
+
+        return cls(by_course=by_course, by_trainer=by_trainer)
+
+
 class Course(BaseModel):
     company: str
     name: str
@@ -134,4 +157,46 @@ class ModelInput(BaseModel):
     venues: dict[str, Venue]
     trainers: dict[str, Trainer]
     courses: dict[str, CourseBatch]
-    groups: dict[str, Group]
\ No newline at end of file
+    groups: dict[str, Group]
+
+
+class ScheduleModel(BaseModel):
+    """CP-SAT model of a schedule with the variables the solve, export and checks read back."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: Any  # cp_model.CpModel
+    sessions: dict[str, list[int]]
+    eligible: TrainerEligibility
+    course_groups: dict[str, list[str]]
+    start_domain: dict[str, list[int]]
+    precedences: dict[tuple[str, str], int]  # unconditional (prereq, course) -> start offset
+    venue_rooms: dict[str, list[str]]  # venue class -> rooms, one room per class unless pooled
+    venue_candidates: dict[str, list[str]]  # course batch id -> venue classes
+
+    # Variables keyed like in the solver, e.g. (course, session) or (course, session, trainer)
+    active_session: dict[tuple, Any]
+    start_session: dict[tuple, Any]
+    end_session: dict[tuple, Any]
+    day_session: dict[tuple, Any]
+    on_day: dict[tuple, Any]
+    venue_session: dict[tuple, Any]
+    trainer_session: dict[tuple, Any]
+    assign: dict[tuple, Any]
+    trainer_day_company: dict[tuple, Any]
+
+    # Objective terms
+    daily_imbalance: Any
+    virtual_sessions: Any
+    trainer_imbalance: Any
+
+
+class SessionSlot(BaseModel):
+    start: int
+    end: int
+    venue: Optional[str] = None  # concrete room
+    trainer: Optional[str] = None
+
+
+class ScheduleSolution(BaseModel):
+    sessions: dict[tuple[str, int], SessionSlot]  # active (course, session) -> slot
+    assigned: dict[tuple[str, str], int]  # (group, course) -> session
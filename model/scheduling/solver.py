@@ -3,14 +3,26 @@ from ortools.sat.python import cp_model
 from pandas.io.sql import com
 from schema import ModelParams
 from .schema import *
-from .utils import hour_index_to_time
+from .utils import hour_index_to_time, compile_start_domain, venue_classes, assign_rooms
+from .precedence import PrecedenceRegistry
+from .dag import critical_path, start_bounds, course_precedences
+from .matching import match_trainers
+from .greedy import greedy_schedule, solution_hints
+from .lexicographic import solve_lexicographic
+from .streaming import ScheduleStreamer, write_csv_atomic
+from .decomposition import interaction_components
+from .hints import read_schedule_hints, add_schedule_hints
 import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from .data import read_data
+from model.master.schema import MasterData
+from typing import Callable, Optional
 pd.set_option('display.max_columns', None)
 
 
-def run_solver(params: ModelParams):
-    data = read_data(params)
+def build_model(params: ModelParams, data: ModelInput, daily_offset: Optional[dict[int, int]] = None) -> ScheduleModel:
     model = cp_model.CpModel()
 
     # ===============================
@@ -47,6 +59,126 @@ def run_solver(params: ModelParams):
     for course in unique_trained_courses:
         S[course] = [0]
 
+    # Courses with exactly one session: every group of the course is assigned to it, so
+    # assign and active are the constant 1. Their intervals have a fixed presence and their
+    # precedences are unconditional, only multi-session courses keep the general encoding.
+    SINGLE_SESSION = {course for course in S if len(S[course]) == 1}
+
+    # ===============================
+    # TRAINER ELIGIBILITY INDEX
+    # ===============================
+    # course -> eligible trainers and trainer -> eligible courses, built once so every
+    # section below only loops over eligible pairs
+    ELIGIBLE = TrainerEligibility.from_trainers(T)
+
+    # ===============================
+    # START DOMAIN COMPILATION
+    # ===============================
+    # Feasible start slots per course batch. Weekday cycle and group blocks are only
+    # folded in for single-session courses, where every group of the course is assigned
+    # to that session. Trainer blocks are folded in at slots where every eligible trainer
+    # is blocked, the remaining ones stay conditional on the trainer choice.
+    COURSE_GROUPS = {}
+    for group in G:
+        for course in G[group].courses:
+            COURSE_GROUPS.setdefault(course, []).append(group)
+
+    START_DOMAIN = {}
+    for course in C:
+        if course in S:
+            is_single_session = len(S[course]) == 1
+            blocked = set()
+
+            if params.is_blocking_schedule:
+                trainer_blocks = [T[trainer].blocked_start_time for trainer in ELIGIBLE.by_course.get(course, [])]
+                if trainer_blocks and all(trainer_blocks):
+                    blocked |= set.intersection(*(set(block) for block in trainer_blocks))
+
+                if is_single_session:
+                    for group in COURSE_GROUPS.get(course, []):
+                        if G[group].blocked_start_time:
+                            blocked |= set(G[group].blocked_start_time)
+
+            START_DOMAIN[course] = compile_start_domain(
+                C[course],
+                CALENDAR,
+                HOURS_PER_DAY,
+                is_considering_shift=params.is_considering_shift,
+                is_weekdays_only=is_single_session and any(
+                    G[group].cycle == "WDays" for group in COURSE_GROUPS.get(course, [])
+                ),
+                blocked_start_time=blocked
+            )
+
+            if not START_DOMAIN[course]:
+                print(f"\033[91mWarning: Course {course} has no feasible start slot.\033[0m")
+                raise SystemExit("Stopping program")
+
+    # ===============================
+    # VENUE CLASSES
+    # ===============================
+    # Pooled, venues with the same companies, capacity and virtual flag form one class,
+    # modeled as a cumulative with one unit per room. Concrete rooms are assigned after
+    # the solve. Otherwise every venue is a class of one room.
+    VENUE_ROOMS = venue_classes(V, params.is_pooling_venues)
+    VENUE_CLASS = {name: V[rooms[0]] for name, rooms in VENUE_ROOMS.items()}
+
+    # ===============================
+    # VENUE CANDIDATES
+    # ===============================
+    # Venues of the course company that can hold the smallest possible occupancy: every
+    # group of a single-session course, the smallest group otherwise
+    VENUE_CANDIDATES = {}
+    for course in C:
+        if course in S:
+            group_sizes = [len(G[group].trainees) for group in COURSE_GROUPS.get(course, [])]
+            if len(S[course]) == 1:
+                min_occupancy = sum(group_sizes)
+            else:
+                min_occupancy = min(group_sizes, default=0)
+
+            VENUE_CANDIDATES[course] = [
+                venue for venue in VENUE_CLASS
+                    if C[course].company in VENUE_CLASS[venue].company and VENUE_CLASS[venue].capacity >= min_occupancy
+            ]
+
+            # Every course holds at least one active session, without a venue it cannot
+            if not VENUE_CANDIDATES[course]:
+                print(
+                    f"\033[91mWarning: Course {course} has no venue of company {C[course].company} "
+                    f"with capacity for {min_occupancy} trainees.\033[0m"
+                )
+                raise SystemExit("Stopping program")
+
+    # ===============================
+    # PREREQUISITE CHAINS
+    # ===============================
+    # Unconditional precedences between single-session courses, the same ones the
+    # prerequisite sections post below. Their longest predecessor and successor chains
+    # tighten every start domain within the horizon.
+    CHAIN_EDGES = course_precedences(G, C, SINGLE_SESSION, params.is_using_global_sequence)
+
+    chain_courses = list(dict.fromkeys(course for edge in CHAIN_EDGES for course in edge))
+
+    chain_length, chain = critical_path(
+        chain_courses, CHAIN_EDGES, {course: C[course].course_batch_duration for course in chain_courses}
+    )
+    if len(chain) > 1:
+        print(f"Critical prerequisite chain: {chain_length} slots over {len(chain)} courses, {' -> '.join(chain)}")
+
+    if chain_length > HORIZON:
+        print(f"\033[93mWarning: Critical prerequisite chain of {chain_length} slots exceeds the horizon of {HORIZON}.\033[0m")
+
+    for course, (earliest, latest) in start_bounds(
+        {course: START_DOMAIN[course] for course in chain_courses}, CHAIN_EDGES
+    ).items():
+        if earliest is None:
+            print(f"\033[91mWarning: Course {course} cannot fit its prerequisite chain within the horizon.\033[0m")
+            raise SystemExit("Stopping program")
+
+        START_DOMAIN[course] = [v for v in START_DOMAIN[course] if earliest <= v <= latest]
+
+
     # ===============================
     # SESSION VARIABLES
     # ===============================
@@ -60,21 +192,18 @@ def run_solver(params: ModelParams):
     for course in C:
         if course in S:
             dur = C[course].course_batch_duration
-            start_session_valid_domain = C[course].valid_start_domain
 
             for session in S[course]:
-                active_session[course, session] = model.NewBoolVar(f"active_{course}_{session}")
-
-                if start_session_valid_domain is not None and params.is_considering_shift:
-                    # print(f"Course {course} duration: {dur}, valid start domain: {start_session_valid_domain}")
-                    
-                    start_session[course, session] = model.NewIntVarFromDomain(
-                        cp_model.Domain.FromValues(start_session_valid_domain),
-                        f"start_{course}_{session}"
-                    )
-
+                if course in SINGLE_SESSION:
+                    active_session[course, session] = 1
                 else:
-                    start_session[course, session] = model.NewIntVar(0, HORIZON, f"start_{course}_{session}")
+                    active_session[course, session] = model.NewBoolVar(f"active_{course}_{session}")
+
+                # Shift domain, same-day rule, valid dates and blockings are all in the domain
+                start_session[course, session] = model.NewIntVarFromDomain(
+                    cp_model.Domain.FromValues(START_DOMAIN[course]),
+                    f"start_{course}_{session}"
+                )
 
                 end_session[course, session] = model.NewIntVar(0, HORIZON, f"end_{course}_{session}")
 
@@ -87,46 +216,52 @@ def run_solver(params: ModelParams):
                     day_session[course, session], start_session[course, session], HOURS_PER_DAY
                 )
 
-                # Same-day constraint
-                end_day = model.NewIntVar(0, DAYS - 1, f"endday_{course}_{session}")
-                model.AddDivisionEquality(
-                    end_day, end_session[course, session] - 1, HOURS_PER_DAY
-                )
-                
-                model.Add(
-                    day_session[course, session] == end_day
-                ).OnlyEnforceIf(active_session[course, session])
-
                 # Venue Assignment
-                for venue in V:
+                for venue in VENUE_CANDIDATES[course]:
                     venue_session[course, session, venue] = model.NewBoolVar(f"venue_{course}_{session}_{venue}")
 
                 model.Add(
                     sum(
                         venue_session[course, session, venue]
-                            for venue in V
+                            for venue in VENUE_CANDIDATES[course]
                     ) == active_session[course, session]
                 )
 
-                # Trainer Assignment
-                eligible = {
-                    (trainer, course): 1
-                    for trainer in T for course in T[trainer].eligible
-                }
+                # Trainer Assignment, matched after the solve in matching mode
+                if params.is_matching_trainers:
+                    continue
 
-                for trainer in T:
-                    if eligible.get((trainer, course), 0):
-                        trainer_session[course, session, trainer] = model.NewBoolVar(f"trainer_{course}_{session}_{trainer}")
+                for trainer in ELIGIBLE.by_course.get(course, []):
+                    trainer_session[course, session, trainer] = model.NewBoolVar(f"trainer_{course}_{session}_{trainer}")
 
                 model.Add(
                     sum(
                         trainer_session[course, session, trainer]
-                        for trainer in T
-                            if (course, session, trainer) in trainer_session
+                        for trainer in ELIGIBLE.by_course.get(course, [])
                     ) == active_session[course, session]
                 )
 
 
+    # ===============================
+    # SESSION ON DAY
+    # ===============================
+    # One literal per (session, day), channeled to day_session with an exactly-one over
+    # the days. Every section that needs "session is on this day" reuses these literals.
+    on_day = {}
+
+    for course in C:
+        if course in S:
+            for session in S[course]:
+                for day in range(DAYS):
+                    on_day[course, session, day] = model.NewBoolVar(f"on_day_{course}_{session}_{day}")
+
+                model.AddExactlyOne(on_day[course, session, day] for day in range(DAYS))
+
+                model.Add(
+                    day_session[course, session] == sum(day * on_day[course, session, day] for day in range(DAYS))
+                )
+
+
     # ===============================
     # SUBGROUP → SESSION ASSIGNMENT
     # ===============================
@@ -134,6 +269,10 @@ def run_solver(params: ModelParams):
 
     for group in G:
         for course in G[group].courses:
+            if course in SINGLE_SESSION:
+                assign[group, course, S[course][0]] = 1
+                continue
+
             assign_vars = []
 
             for session in S[course]:
@@ -147,7 +286,7 @@ def run_solver(params: ModelParams):
     # SESSION ACTIVE IF USED
     # ===============================
     for course in C:
-        if course in S:
+        if course in S and course not in SINGLE_SESSION:
             for session in S[course]:
 
                 model.AddMaxEquality(
@@ -194,10 +333,14 @@ def run_solver(params: ModelParams):
     # ===============================
     # WEEKEND CONSTRINTS
     # ===============================
+    # Single-session courses have the weekday cycle in their start domain
     if CALENDAR.weekend_index:
         for group in G:
             if G[group].cycle == "WDays":
                 for course in G[group].courses:
+                    if len(S[course]) == 1:
+                        continue
+
                     for session in S[course]:
 
                         for wd in CALENDAR.weekend_index:
@@ -209,54 +352,44 @@ def run_solver(params: ModelParams):
     # ===============================
     # VALID PERIOD CONSTRAINTS FOR COURSES
     # ===============================
-    # print(CALENDAR)
-    # for course in C:
-    #     if course in S:
-    #         valid_start = C[course].valid_start_date
-    #         valid_end = C[course].valid_end_date
-
-    #         if valid_start:
-    #             valid_start_day = CALENDAR.index[valid_start]
-
-    #             for session in S[course]:
-    #                 model.Add(
-    #                     day_session[course, session] >= valid_start_day
-    #                 ).OnlyEnforceIf(active_session[course, session])
-
-    #         if valid_end:
-    #             valid_end_day = CALENDAR.index[valid_end]
-
-    #             for session in S[course]:
-    #                 model.Add(
-    #                     day_session[course, session] <= valid_end_day
-    #                 ).OnlyEnforceIf(active_session[course, session])
+    # Valid course dates are compiled into the start domain, see START DOMAIN COMPILATION
 
     
     # ===============================
     # BLOCKED PERIOD FOR TRAINER
     # ===============================
-    if params.is_blocking_schedule:
+    if params.is_blocking_schedule and not params.is_matching_trainers:
         for trainer in T:
             if T[trainer].blocked_start_time:
-                for course in C:
+                for course in ELIGIBLE.by_trainer[trainer]:
                     if course in S:
-                        if eligible.get((trainer, course), 0):
-                            for session in S[course]:
-                                model.AddForbiddenAssignments(
-                                    [start_session[course, session]],
-                                    [[v] for v in T[trainer].blocked_start_time]
-                                ).OnlyEnforceIf(
-                                    trainer_session[course, session, trainer],
-                                    active_session[course, session]
-                                )
+                        # Slots already out of the start domain need no constraint
+                        domain = set(START_DOMAIN[course])
+                        blocked = [v for v in T[trainer].blocked_start_time if v in domain]
+                        if not blocked:
+                            continue
+
+                        for session in S[course]:
+                            enforcement = [trainer_session[course, session, trainer]]
+                            if course not in SINGLE_SESSION:
+                                enforcement.append(active_session[course, session])
+
+                            model.AddForbiddenAssignments(
+                                [start_session[course, session]],
+                                [[v] for v in blocked]
+                            ).OnlyEnforceIf(enforcement)
     
 
     # ===============================
     # BLOCKED PERIOD FOR TRAINEE
     # ===============================
+    # Single-session courses have the group blocks in their start domain
     if params.is_blocking_schedule:
         for group in G:
             for course in G[group].courses:
+                if len(S[course]) == 1:
+                    continue
+
                 for session in S[course]:
                     if G[group].blocked_start_time:
                         model.AddForbiddenAssignments(
@@ -280,17 +413,11 @@ def run_solver(params: ModelParams):
 
                 for session in S[course]:
 
-                    is_day = model.NewBoolVar(
-                        f"isday_{group}_{course}_{session}_{day}"
-                    )
-
-                    model.Add(
-                        day_session[course, session] == day
-                    ).OnlyEnforceIf(is_day)
+                    is_day = on_day[course, session, day]
 
-                    model.Add(
-                        day_session[course, session] != day
-                    ).OnlyEnforceIf(is_day.Not())
+                    if course in SINGLE_SESSION:
+                        terms.append(dur * is_day)
+                        continue
 
                     attend_today = model.NewBoolVar(
                         f"attend_{group}_{course}_{session}_{day}"
@@ -322,13 +449,21 @@ def run_solver(params: ModelParams):
             dur = C[course].course_batch_duration
 
             for session in S[course]:
-                interval = model.NewOptionalIntervalVar(
-                    start_session[course, session],
-                    dur,
-                    end_session[course, session],
-                    assign[group, course, session],
-                    f"interval_group_{group}_{course}_{session}"
-                )
+                if course in SINGLE_SESSION:
+                    interval = model.NewIntervalVar(
+                        start_session[course, session],
+                        dur,
+                        end_session[course, session],
+                        f"interval_group_{group}_{course}_{session}"
+                    )
+                else:
+                    interval = model.NewOptionalIntervalVar(
+                        start_session[course, session],
+                        dur,
+                        end_session[course, session],
+                        assign[group, course, session],
+                        f"interval_group_{group}_{course}_{session}"
+                    )
 
                 interval_session.append(interval)
 
@@ -336,17 +471,59 @@ def run_solver(params: ModelParams):
 
 
     # ===============================
-    # TRAINER NO-OVERLAP
+    # TRAINER POOLS (MATCHING MODE)
     # ===============================
-    for trainer in T:
-        interval_session = []
-
+    # Trainers are matched after the solve. For every set of eligible trainers, the sessions
+    # of the courses it covers can only run as many at once as the set has trainers.
+    if params.is_matching_trainers:
+        interval_pool = {}
         for course in C:
             if course in S:
                 dur = C[course].course_batch_duration
 
                 for session in S[course]:
-                    if (course, session, trainer) in trainer_session:
+                    if course in SINGLE_SESSION:
+                        interval_pool[course, session] = model.NewIntervalVar(
+                            start_session[course, session],
+                            dur,
+                            end_session[course, session],
+                            f"interval_pool_{course}_{session}"
+                        )
+                    else:
+                        interval_pool[course, session] = model.NewOptionalIntervalVar(
+                            start_session[course, session],
+                            dur,
+                            end_session[course, session],
+                            active_session[course, session],
+                            f"interval_pool_{course}_{session}"
+                        )
+
+        # A course without eligible trainers is in no pool, the empty set covers nothing
+        pooled = {course: frozenset(ELIGIBLE.by_course[course]) for course in S if ELIGIBLE.by_course.get(course)}
+
+        for pool in dict.fromkeys(pooled.values()):
+            interval_session = [
+                interval_pool[course, session]
+                    for course, session in interval_pool
+                        if course in pooled and pool.issuperset(pooled[course])
+            ]
+
+            if len(interval_session) > len(pool):
+                model.AddCumulative(interval_session, [1] * len(interval_session), len(pool))
+
+
+    # ===============================
+    # TRAINER NO-OVERLAP
+    # ===============================
+    if not params.is_matching_trainers:
+        for trainer in T:
+            interval_session = []
+
+            for course in ELIGIBLE.by_trainer[trainer]:
+                if course in S:
+                    dur = C[course].course_batch_duration
+
+                    for session in S[course]:
                         interval = model.NewOptionalIntervalVar(
                             start_session[course, session],
                             dur,
@@ -357,27 +534,19 @@ def run_solver(params: ModelParams):
 
                         interval_session.append(interval)
 
-        if interval_session:
-            model.AddNoOverlap(interval_session)
+            if interval_session:
+                model.AddNoOverlap(interval_session)
 
 
     # ===============================
     # VENUE NO-OVERLAP
     # ===============================
-    for course in C:
-        if course in S:
-            course_company = C[course].company
-
-            for session in S[course]:
-                for venue in V:
-                    if course_company not in V[venue].company:
-                        model.Add(venue_session[course, session, venue] == 0)
-                    
-    for venue in V:
+    # A class of several rooms holds as many concurrent sessions as it has rooms
+    for venue in VENUE_ROOMS:
         interval_session = []
 
         for course in C:
-            if course in S:
+            if course in S and venue in VENUE_CANDIDATES[course]:
                 dur = C[course].course_batch_duration
 
                 for session in S[course]:
@@ -393,7 +562,10 @@ def run_solver(params: ModelParams):
                     interval_session.append(interval)
 
         if interval_session:
-            model.AddNoOverlap(interval_session)
+            if len(VENUE_ROOMS[venue]) == 1:
+                model.AddNoOverlap(interval_session)
+            else:
+                model.AddCumulative(interval_session, [1] * len(interval_session), len(VENUE_ROOMS[venue]))
 
 
     # ===============================
@@ -404,18 +576,27 @@ def run_solver(params: ModelParams):
             for session in S[course]:
                 occupancy = sum(
                     len(G[group].trainees) * assign[group, course, session]
-                        for group in G if course in G[group].courses
+                        for group in COURSE_GROUPS.get(course, [])
                 )
+                max_occupancy = sum(len(G[group].trainees) for group in COURSE_GROUPS.get(course, []))
+
+                for venue in VENUE_CANDIDATES[course]:
+                    # Venues that hold every group of the course can never be breached
+                    if VENUE_CLASS[venue].capacity >= max_occupancy:
+                        continue
 
-                for venue in V.values():
                     model.Add(
-                        occupancy <= venue.capacity).OnlyEnforceIf(venue_session[course, session, venue.name]
+                        occupancy <= VENUE_CLASS[venue].capacity).OnlyEnforceIf(venue_session[course, session, venue]
                     )
 
 
     # ===============================
     # PREREQUISITES (PERSONAL LEVEL)
     # ===============================
+    # Sessions are shared, so the same precedence comes from every group taking both
+    # courses. They are collected in a registry, merged and reduced, and posted once below.
+    PRECEDENCE = PrecedenceRegistry()
+
     for group in G:
         for course in G[group].courses:
             for prereq in C[course].prerequisites:
@@ -427,12 +608,15 @@ def run_solver(params: ModelParams):
                             for s2 in S[course]:
                                 if (group, course, s2) in assign:
 
-                                    model.Add(
-                                        start_session[prereq, s1] < start_session[course, s2]
-                                    ).OnlyEnforceIf(
+                                    # start_session[prereq, s1] < start_session[course, s2]
+                                    PRECEDENCE.add(
+                                        (prereq, s1),
+                                        (course, s2),
+                                        1,
                                         [
-                                            assign[group, prereq, s1],
-                                            assign[group, course, s2]
+                                            assign[group, c, s]
+                                                for c, s in ((prereq, s1), (course, s2))
+                                                    if c not in SINGLE_SESSION
                                         ]
                                     )
 
@@ -448,69 +632,68 @@ def run_solver(params: ModelParams):
 
                 for s_course in S[course]:
                     for s_pre in S[prereq]:
-                        
 
-                        model.Add(
-                            end_session[prereq, s_pre] <= start_session[course, s_course]
-                        ).OnlyEnforceIf(
+                        # end_session[prereq, s_pre] <= start_session[course, s_course]
+                        PRECEDENCE.add(
+                            (prereq, s_pre),
+                            (course, s_course),
+                            C[prereq].course_batch_duration,
                             [
-                                active_session[prereq, s_pre],
-                                active_session[course, s_course]
+                                active_session[c, s]
+                                    for c, s in ((prereq, s_pre), (course, s_course))
+                                        if c not in SINGLE_SESSION
                             ]
                         )
 
+    merged = PRECEDENCE.added - len(PRECEDENCE.edges)
+    reduced = PRECEDENCE.reduce()
+    PRECEDENCE.post(model, start_session)
+
+    print(f"Precedences: {len(PRECEDENCE.edges)} posted, {merged} duplicates merged, {reduced} transitively implied")
+
 
     # ===============================
     # TRAINER: MAX 1 COMPANY PER DAY
     # ===============================
-    if params.companies is not None and len(params.companies)>1:
+    # The company of a session is the company of its course, every venue candidate belongs
+    # to it, so a session runs for that company exactly when it is active, and it is active
+    # whenever a trainer is assigned. A trainer serves a company on a day as soon as one of
+    # its sessions of that company is on that day. Size is O(eligible pairs x days).
+    trainer_day_company = {}
+
+    if (
+        params.is_limiting_trainer_company and not params.is_matching_trainers
+        and params.companies is not None and len(params.companies) > 1
+    ):
+        for trainer in T:
+            courses = [course for course in ELIGIBLE.by_trainer[trainer] if course in S]
+            companies = list(dict.fromkeys(C[course].company for course in courses))
 
-        unique_companies = list(set(company for v in V.values() for company in v.company))
-        trainer_day_company = {}
+            # A trainer of a single company can never serve two
+            if len(companies) <= 1:
+                continue
 
-        for trainer in T:
             for day in range(DAYS):
-                for company in unique_companies:
+                for company in companies:
                     trainer_day_company[trainer, day, company] = model.NewBoolVar(
                         f"trainer_{trainer}_day_{day}_company_{company}"
                     )
 
-            # Link sessions
-            for course in C:
-                if course not in S:
-                    continue
-
-                for session in S[course]:
+                model.AddAtMostOne(
+                    trainer_day_company[trainer, day, company] for company in companies
+                )
 
-                    if (course, session, trainer) not in trainer_session:
-                        continue
+            for course in courses:
+                company = C[course].company
 
-                    for venue in V.values():
-
-                        companies = venue.company
-                        for company in companies:
-                            # For each day, link via reification
-                            for day in range(DAYS):
-
-                                # If trainer assigned AND venue chosen
-                                # AND session is on this day
-                                # → activate trainer_day_company
-                                model.Add(
-                                    day_session[course, session] == day
-                                ).OnlyEnforceIf([
-                                    trainer_session[course, session, trainer],
-                                    venue_session[course, session, venue.name],
-                                    trainer_day_company[trainer, day, company]
-                                ])
-
-            # Enforce max 1 company per day
-            for day in range(DAYS):
-                model.Add(
-                    sum(
-                        trainer_day_company[trainer, day, company]
-                        for company in unique_companies
-                    ) <= 1
-                )
+                for session in S[course]:
+                    for day in range(DAYS):
+                        # trainer assigned AND session on this day → trainer_day_company
+                        model.AddBoolOr([
+                            trainer_session[course, session, trainer].Not(),
+                            on_day[course, session, day].Not(),
+                            trainer_day_company[trainer, day, company]
+                        ])
 
 
     # ===============================
@@ -532,8 +715,11 @@ def run_solver(params: ModelParams):
     # --- Minimize Daily Session Imbalance
     daily_duration = {}
 
+    # The load of other components comes on top of the sessions of this one
+    DAILY_BOUND = HORIZON * len(C) + max(daily_offset.values(), default=0) if daily_offset else HORIZON * len(C)
+
     for day in range(DAYS):
-        daily_duration[day] = model.NewIntVar(0, HORIZON * len(C), f"daily_dur_{day}")
+        daily_duration[day] = model.NewIntVar(0, DAILY_BOUND, f"daily_dur_{day}")
 
         terms = []
         for course in C:
@@ -541,64 +727,69 @@ def run_solver(params: ModelParams):
                 dur = C[course].course_batch_duration
 
                 for session in S[course]:
-                    b = model.NewBoolVar(f"is_{course}_{session}_day_{day}")
+                    terms.append(dur * on_day[course, session, day])
 
-                    model.Add(day_session[course, session] == day).OnlyEnforceIf(b)
-                    model.Add(day_session[course, session] != day).OnlyEnforceIf(b.Not())
-
-                    terms.append(dur * b)
+        # Load of the other components when one component of a decomposed run is rebalanced
+        if daily_offset:
+            terms.append(daily_offset.get(day, 0))
         
         if terms:
             model.Add(
                 daily_duration[day] == sum(terms)
             )
 
-    max_daily = model.NewIntVar(0, HORIZON * len(C), "max_daily")
-    min_daily = model.NewIntVar(0, HORIZON * len(C), "min_daily")
+    max_daily = model.NewIntVar(0, DAILY_BOUND, "max_daily")
+    min_daily = model.NewIntVar(0, DAILY_BOUND, "min_daily")
 
     for day in range(DAYS):
         model.Add(daily_duration[day] <= max_daily)
         model.Add(daily_duration[day] >= min_daily)
 
-    daily_imbalance = model.NewIntVar(0, HORIZON * len(C), "daily_imbalance")
+    daily_imbalance = model.NewIntVar(0, DAILY_BOUND, "daily_imbalance")
     model.Add(
         daily_imbalance == max_daily - min_daily
     )
 
 
     # --- Minimize Trainer Workload Imbalance ---
-    trainer_load = {}
-    for trainer in T:
-        trainer_load[trainer] = model.NewIntVar(0, HORIZON, f"trainer_load_{trainer}")
-
-        model.Add(
-            trainer_load[trainer] ==
-            sum(
-                C[course].course_batch_duration * trainer_session[course, session, trainer]
-                    for course in C
-                        for session in S.get(course, [])
-                    if (course, session, trainer) in trainer_session
+    # In matching mode the balance is the objective of the trainer matching instead
+    trainer_imbalance = 0
+
+    if not params.is_matching_trainers:
+        trainer_load = {}
+        for trainer in T:
+            trainer_load[trainer] = model.NewIntVar(0, HORIZON, f"trainer_load_{trainer}")
+
+            model.Add(
+                trainer_load[trainer] ==
+                sum(
+                    C[course].course_batch_duration * trainer_session[course, session, trainer]
+                        for course in ELIGIBLE.by_trainer[trainer]
+                            for session in S.get(course, [])
+                )
             )
-        )
 
-    max_load = model.NewIntVar(0, HORIZON, "max_trainer_load")
-    min_load = model.NewIntVar(0, HORIZON, "min_trainer_load")
+        max_load = model.NewIntVar(0, HORIZON, "max_trainer_load")
+        min_load = model.NewIntVar(0, HORIZON, "min_trainer_load")
 
-    for trainer in T:
-        model.Add(trainer_load[trainer] <= max_load)
-        model.Add(trainer_load[trainer] >= min_load)
+        for trainer in T:
+            model.Add(trainer_load[trainer] <= max_load)
+            model.Add(trainer_load[trainer] >= min_load)
 
-    trainer_imbalance = model.NewIntVar(0, HORIZON, "trainer_imbalance")
-    model.Add(trainer_imbalance == max_load - min_load)
+        trainer_imbalance = model.NewIntVar(0, HORIZON, "trainer_imbalance")
+        model.Add(trainer_imbalance == max_load - min_load)
 
 
     # --- Minimize Sessions on Virtual Rooms ---
-    virtual_venue_list = [venue.name for venue in V.values() if venue.is_virtual]
+    virtual_venue_list = [venue for venue in VENUE_CLASS if VENUE_CLASS[venue].is_virtual]
     virtual_venue_sessions = []
     for course in C:
         if course in S:
             for session in S[course]:
                 for venue in virtual_venue_list:
+                    if (course, session, venue) not in venue_session:
+                        continue
+
                     virtual_venue_sessions.append(
                         venue_session[course, session, venue]
                     )
@@ -644,281 +835,606 @@ def run_solver(params: ModelParams):
     #     trainer_imbalance
     # )
 
+    return ScheduleModel(
+        model=model,
+        sessions=S,
+        eligible=ELIGIBLE,
+        course_groups=COURSE_GROUPS,
+        start_domain=START_DOMAIN,
+        precedences=CHAIN_EDGES,
+        venue_rooms=VENUE_ROOMS,
+        venue_candidates=VENUE_CANDIDATES,
+        active_session=active_session,
+        start_session=start_session,
+        end_session=end_session,
+        day_session=day_session,
+        on_day=on_day,
+        venue_session=venue_session,
+        trainer_session=trainer_session,
+        assign=assign,
+        trainer_day_company=trainer_day_company,
+        daily_imbalance=daily_imbalance,
+        virtual_sessions=virtual_sessions,
+        trainer_imbalance=trainer_imbalance
+    )
+
+
+def run_solver(params: ModelParams, master: Optional[MasterData] = None, data: Optional[ModelInput] = None):
+    if data is None:
+        data = read_data(params, master)
+
+    if params.is_decomposing_scheduling:
+        result = run_decomposed(params, data)
+    else:
+        result = solve_schedule(params, data)
+
+    if result is not None:
+        S, solution = result
+        export_schedule(params, data, S, solution)
+
+
+def solve_schedule(
+    params: ModelParams,
+    data: ModelInput,
+    hints: Optional[dict[tuple, dict]] = None,
+    daily_offset: Optional[dict[int, int]] = None
+) -> Optional[tuple[dict[str, list[int]], ScheduleSolution]]:
+    """
+    Builds and solves the schedule of data, returns its session index and solution, None
+    when no solution was found. hints replace the warm start of the run, daily_offset is
+    passed on to build_model.
+    """
+    schedule = build_model(params, data, daily_offset)
+
+    model = schedule.model
+
+    C = data.courses
+    HOURS_PER_DAY = params.hours_per_day
+
+    S = schedule.sessions
+    ELIGIBLE = schedule.eligible
+    active_session = schedule.active_session
+    start_session = schedule.start_session
+    end_session = schedule.end_session
+
+
+    # ===============================
+    # GREEDY DRAFT
+    # ===============================
+    if params.scheduling_engine == "greedy":
+        return S, greedy_schedule(params, data, schedule)
+
+
+    # ===============================
+    # WARM START
+    # ===============================
+    # One hint source per solve, a variable hinted twice makes the model invalid
+    if hints is not None:
+        counts = add_schedule_hints(schedule, hints, HOURS_PER_DAY)
+
+        print(f"Warm start: {counts['start']} starts, {counts['venue']} venues, {counts['trainer']} trainers hinted")
+
+    elif params.file_previous_schedule is None and params.is_hinting_scheduling:
+        counts = add_schedule_hints(schedule, solution_hints(greedy_schedule(params, data, schedule)), HOURS_PER_DAY)
+
+        print(
+            f"Warm start: greedy draft, {counts['start']} starts, {counts['venue']} venues, "
+            f"{counts['trainer']} trainers hinted"
+        )
+
+    elif params.file_previous_schedule is not None:
+        hints = read_schedule_hints(params.file_previous_schedule, data, HOURS_PER_DAY)
+        counts = add_schedule_hints(schedule, hints, HOURS_PER_DAY)
+
+        print(
+            f"Warm start: {counts['sessions']} of {len(hints)} previous sessions matched, "
+            f"{counts['start']} starts, {counts['venue']} venues, {counts['trainer']} trainers hinted, "
+            f"{counts['skipped']} skipped"
+        )
+
 
     # ===============================
     # SOLVE
     # ===============================
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = params.max_time_in_seconds
-    solver.parameters.num_search_workers = params.num_search_workers
+    # Improving solutions are written while solving, the final export overwrites them
+    streamer = None
+    if params.is_streaming_solutions:
+        streamer = ScheduleStreamer(params, lambda value: stream_schedule(params, data, schedule, value))
 
     print("Solving starts at:", pd.Timestamp.now())
+    started = time.perf_counter()
+
+    if params.is_lexicographic_objective:
+        solver, status = solve_lexicographic(params, schedule, streamer)
 
-    status = solver.Solve(model)
+    else:
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = params.max_time_in_seconds
+        solver.parameters.num_search_workers = params.num_search_workers
+
+        status = solver.Solve(model) if streamer is None else streamer.solve(solver, model)
 
     print("Solving ends at:", pd.Timestamp.now())
 
+    if streamer is not None:
+        print(f"Streaming: {streamer.solutions} solutions, {streamer.exports} exported to export/")
+
     print("Status:", solver.StatusName(status))
-    print(f"Objective value: {solver.ObjectiveValue()}")
 
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        rows = []
-        detailed_rows = []
+    if params.is_lexicographic_objective and status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # Same weighting as the single-stage objective, so runs of both modes compare
+        print(
+            f"Objective value: {solver.Value(schedule.daily_imbalance) * 1000 + solver.Value(schedule.virtual_sessions) * 100 + solver.Value(schedule.trainer_imbalance)}"
+        )
+    else:
+        print(f"Objective value: {solver.ObjectiveValue()}")
 
-        for group in G:
-            trainees = len(G[group].trainees)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
 
-            for course in G[group].courses:
-                course_company = C[course].company
-                course_stream = C[course].stream
+    # ===============================
+    # TRAINER ASSIGNMENT
+    # ===============================
+    # Matched on the solved times in matching mode, with the full model as the fallback
+    trainer_of = None
 
-                # find chosen session
-                chosen_session = None
-                for session in S[course]:
-                    if solver.Value(assign[group, course, session]):
-                        chosen_session = session
-                        break
+    if params.is_matching_trainers:
+        times = {
+            (course, session): (solver.Value(start_session[course, session]), solver.Value(end_session[course, session]))
+                for course in C if course in S
+                    for session in S[course] if solver.Value(active_session[course, session])
+        }
 
-                if chosen_session is None:
-                    continue
+        # The matching runs within the solve budget, a share of what the solve left over
+        remaining = max(params.max_time_in_seconds - (time.perf_counter() - started), 0)
+        trainer_of = match_trainers(params, data, ELIGIBLE, times, max(1.0, remaining * params.matching_time_share))
 
-                # start/end
-                start = solver.Value(start_session[course, chosen_session])
-                end = solver.Value(end_session[course, chosen_session])
-
-                start_day = start // HOURS_PER_DAY
-                start_hour = start % HOURS_PER_DAY
-
-                end_day = (end - 1) // HOURS_PER_DAY
-                end_hour = (end - 1) % HOURS_PER_DAY + 1
-
-                # calendar mapping
-                date_str = CALENDAR.dates[start_day].date
-                day_name = datetime.datetime.strptime(
-                    str(date_str), "%Y-%m-%d"
-                ).strftime("%A")
-
-                start_time = hour_index_to_time(start_hour, is_start=True)
-                end_time = hour_index_to_time(end_hour, is_start=False)
-
-                # venue
-                venue_used = None
-                for venue in V:
-                    if solver.Value(venue_session[course, chosen_session, venue]):
-                        venue_used = venue
-                        break
-
-                # trainer
-                trainer_used = None
-                for trainer in T:
-                    key = (course, chosen_session, trainer)
-                    if key in trainer_session and solver.Value(trainer_session[key]):
-                        trainer_used = trainer
-                        break
-
-                # occupancy of session
-                occupancy = sum(
-                    len(G[g].trainees)
-                    for g in G
-                    if course in G[g].courses
-                    and solver.Value(assign[g, course, chosen_session])
-                )
+        if trainer_of is None:
+            print("Trainer matching failed, solving again with the trainers in the model")
+            return solve_schedule(params.model_copy(update={"is_matching_trainers": False}), data, hints, daily_offset)
+
+    return S, read_solution(params, data, schedule, solver.Value, trainer_of)
+
+
+def daily_load(params: ModelParams, data: ModelInput, solution: ScheduleSolution) -> dict[int, int]:
+    """Session hours per day, the daily_duration of the model."""
+    load = {day: 0 for day in range(params.days)}
+    for (course, _), slot in solution.sessions.items():
+        load[slot.start // params.hours_per_day] += data.courses[course].course_batch_duration
+
+    return load
+
+
+def run_decomposed(params: ModelParams, data: ModelInput) -> Optional[tuple[dict[str, list[int]], ScheduleSolution]]:
+    """
+    Components of the interaction graph share no group, trainer, venue or prerequisite, so
+    each one is solved as its own model, in parallel. Daily imbalance is the only term
+    spanning components: a rebalance pass then solves every component again, largest first,
+    with the daily load of the others as a fixed offset and its current solution as hints,
+    keeping the result when the overall daily imbalance does not get worse. Trainer
+    imbalance is balanced within each component.
+
+    Both passes share max_time_in_seconds: the rebalance gets rebalance_time_share of it,
+    the component solves the rest, divided by the number of rounds the pool needs.
+    """
+    components = interaction_components(data)
+
+    if len(components) <= 1:
+        return solve_schedule(params, data)
+
+    cores = os.cpu_count() or 1
+    processes = max(1, min(len(components), cores))
+    num_search_workers = max(1, min(params.num_search_workers, cores // processes))
+
+    print(
+        f"Solving {len(components)} independent components "
+        f"({', '.join(str(len(component.courses)) for component in components)} courses) "
+        f"on {processes} processes, {num_search_workers} workers each"
+    )
+
+    rounds = -(-len(components) // processes)
+    solve_time = params.max_time_in_seconds * (1 - params.rebalance_time_share) / rounds
+
+    # Components write no intermediate exports, the files would overwrite each other
+    component_params = params.model_copy(
+        update={
+            "num_search_workers": num_search_workers,
+            "max_time_in_seconds": solve_time,
+            "is_streaming_solutions": False
+        }
+    )
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(solve_schedule, component_params, component) for component in components]
+        results = [future.result() for future in futures]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        print(f"No schedule found for {len(missing)} of {len(components)} components")
+        return None
+
+    # ===============================
+    # DAILY REBALANCE
+    # ===============================
+    loads = [daily_load(params, component, solution) for component, (_, solution) in zip(components, results)]
+
+    def imbalance():
+        total = [sum(load[day] for load in loads) for day in range(params.days)]
+        return max(total) - min(total)
+
+    before = imbalance()
+
+    if params.scheduling_engine == "cpsat" and before > 0:
+        rebalance_params = params.model_copy(
+            update={
+                "max_time_in_seconds": params.max_time_in_seconds * params.rebalance_time_share / len(components),
+                "is_streaming_solutions": False
+            }
+        )
+
+        for i, component in enumerate(components):
+            offset = {day: sum(load[day] for j, load in enumerate(loads) if j != i) for day in range(params.days)}
+            current = imbalance()
+
+            result = solve_schedule(rebalance_params, component, solution_hints(results[i][1]), offset)
+            if result is None:
+                continue
+
+            previous = loads[i]
+            loads[i] = daily_load(params, component, result[1])
+
+            if imbalance() <= current:
+                results[i] = result
+            else:
+                loads[i] = previous
+
+    print(f"Daily imbalance: {before} after the component solves, {imbalance()} after rebalancing")
+
+    S = {}
+    solution = ScheduleSolution(sessions={}, assigned={})
+    for sessions, component_solution in results:
+        S.update(sessions)
+        solution.sessions.update(component_solution.sessions)
+        solution.assigned.update(component_solution.assigned)
+
+    return S, solution
+
+
+def read_solution(
+    params: ModelParams,
+    data: ModelInput,
+    schedule: ScheduleModel,
+    value: Callable,
+    trainer_of: Optional[dict[tuple, str]] = None
+) -> ScheduleSolution:
+    """
+    Reads the session times, rooms, trainers and group assignment of a solution, value is
+    solver.Value or the Value of a solution callback. Rooms are assigned per venue class by
+    interval graph coloring. Trainers come from trainer_of when given, otherwise from the
+    model, and stay empty in matching mode.
+    """
+    G = data.groups
+    C = data.courses
+    S = schedule.sessions
 
-                # -------- GROUP LEVEL ROW --------
-                rows.append([
+    active = {
+        (course, session)
+            for course in C if course in S
+                for session in S[course] if value(schedule.active_session[course, session])
+    }
+
+    # ===============================
+    # ROOM ASSIGNMENT
+    # ===============================
+    class_sessions = {}
+    for course, session in active:
+        for venue in schedule.venue_candidates[course]:
+            if value(schedule.venue_session[course, session, venue]):
+                class_sessions.setdefault(venue, []).append((
+                    (course, session),
+                    value(schedule.start_session[course, session]),
+                    value(schedule.end_session[course, session])
+                ))
+
+    room_session = {}
+    for venue, sessions in class_sessions.items():
+        room_session.update(assign_rooms(sessions, schedule.venue_rooms[venue]))
+
+    # ===============================
+    # TRAINER ASSIGNMENT
+    # ===============================
+    if trainer_of is None:
+        trainer_of = {
+            (course, session): trainer
+                for course, session in active
+                    for trainer in schedule.eligible.by_course.get(course, [])
+                        if (course, session, trainer) in schedule.trainer_session
+                        and value(schedule.trainer_session[course, session, trainer])
+        }
+
+    return ScheduleSolution(
+        sessions={
+            (course, session): SessionSlot(
+                start=value(schedule.start_session[course, session]),
+                end=value(schedule.end_session[course, session]),
+                venue=room_session.get((course, session)),
+                trainer=trainer_of.get((course, session))
+            )
+                for course, session in active
+        },
+        assigned={
+            (group, course): session
+                for group in G
+                    for course in G[group].courses if course in S
+                        for session in S[course] if value(schedule.assign[group, course, session])
+        }
+    )
+
+
+def stream_schedule(params: ModelParams, data: ModelInput, schedule: ScheduleModel, value: Callable):
+    """Intermediate export of a solver callback, the same files as export_schedule without the checks."""
+    df, df_detailed = schedule_frames(params, data, read_solution(params, data, schedule, value))
+
+    write_csv_atomic(df, f"export/{params.report_name}_schedule.csv")
+    write_csv_atomic(df_detailed, f"export/{params.report_name}_trainee_schedule.csv")
+
+
+def schedule_frames(params: ModelParams, data: ModelInput, solution: ScheduleSolution) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Group and trainee level schedule tables of a solution."""
+    G = data.groups
+    V = data.venues
+    C = data.courses
+    HOURS_PER_DAY = params.hours_per_day
+    CALENDAR = data.calendar
+
+    rows = []
+    detailed_rows = []
+
+    for group in G:
+        trainees = len(G[group].trainees)
+
+        for course in G[group].courses:
+            course_company = C[course].company
+            course_stream = C[course].stream
+
+            # chosen session
+            chosen_session = solution.assigned.get((group, course))
+
+            if chosen_session is None:
+                continue
+
+            # start/end
+            slot = solution.sessions[course, chosen_session]
+            start = slot.start
+            end = slot.end
+
+            start_day = start // HOURS_PER_DAY
+            start_hour = start % HOURS_PER_DAY
+
+            end_day = (end - 1) // HOURS_PER_DAY
+            end_hour = (end - 1) % HOURS_PER_DAY + 1
+
+            # calendar mapping
+            date_str = CALENDAR.dates[start_day].date
+            day_name = datetime.datetime.strptime(
+                str(date_str), "%Y-%m-%d"
+            ).strftime("%A")
+
+            start_time = hour_index_to_time(start_hour, is_start=True)
+            end_time = hour_index_to_time(end_hour, is_start=False)
+
+            # venue
+            venue_used = slot.venue
+
+            # trainer
+            trainer_used = slot.trainer
+
+            # occupancy of session
+            occupancy = sum(
+                len(G[g].trainees)
+                for g in G
+                if course in G[g].courses
+                and solution.assigned.get((g, course)) == chosen_session
+            )
+
+            # -------- GROUP LEVEL ROW --------
+            rows.append([
+                group,
+                trainees,
+                course,
+                course_company,
+                course_stream,
+                start_day,
+                start_hour,
+                end_day,
+                end_hour,
+                date_str,
+                day_name,
+                start_time,
+                end_time,
+                venue_used,
+                V[venue_used].capacity if venue_used else None,
+                occupancy,
+                trainer_used,
+                chosen_session
+            ])
+
+            # -------- TRAINEE LEVEL ROWS --------
+            for trainee_id in G[group].trainees:
+                detailed_rows.append([
+                    trainee_id,
                     group,
-                    trainees,
                     course,
                     course_company,
                     course_stream,
-                    start_day,
-                    start_hour,
-                    end_day,
-                    end_hour,
                     date_str,
                     day_name,
                     start_time,
                     end_time,
                     venue_used,
-                    V[venue_used].capacity if venue_used else None,
-                    occupancy,
                     trainer_used,
                     chosen_session
                 ])
 
-                # -------- TRAINEE LEVEL ROWS --------
-                for trainee_id in G[group].trainees:
-                    detailed_rows.append([
-                        trainee_id,
-                        group,
-                        course,
-                        course_company,
-                        course_stream,
-                        date_str,
-                        day_name,
-                        start_time,
-                        end_time,
-                        venue_used,
-                        trainer_used,
-                        chosen_session
-                    ])
-
-        # =========================
-        # GROUP LEVEL DF
-        # =========================
-        df = pd.DataFrame(rows, columns=[
-            "Group",
-            "Trainees",
-            "Course",
-            "Company",
-            "Stream",
-            "Start Day",
-            "Start Hour",
-            "End Day",
-            "End Hour",
-            "Date",
-            "Day",
-            "Start Time",
-            "End Time",
-            "Venue",
-            "Venue Max Capacity",
-            "Venue Occupancy",
-            "Trainer",
-            "Session"
-        ])
-
-        print("\nSCHEDULE (GROUP LEVEL):")
-        print(df)
-
-        df.to_csv(f"export/{params.report_name}_schedule.csv", index=False)
-
-        # =========================
-        # TRAINEE LEVEL DF
-        # =========================
-        df_detailed = pd.DataFrame(detailed_rows, columns=[
-            "Trainee ID",
-            "Group",
-            "Course",
-            "Company",
-            "Stream",
-            "Date",
-            "Day",
-            "Start Time",
-            "End Time",
-            "Venue",
-            "Trainer",
-            "Session"
-        ])
-
-        print("\nSCHEDULE (TRAINEE LEVEL):")
-        # print(df_detailed)
-
-        df_detailed.to_csv(
-            f"export/{params.report_name}_trainee_schedule.csv",
-            index=False
-        )
+    # =========================
+    # GROUP LEVEL DF
+    # =========================
+    df = pd.DataFrame(rows, columns=[
+        "Group",
+        "Trainees",
+        "Course",
+        "Company",
+        "Stream",
+        "Start Day",
+        "Start Hour",
+        "End Day",
+        "End Hour",
+        "Date",
+        "Day",
+        "Start Time",
+        "End Time",
+        "Venue",
+        "Venue Max Capacity",
+        "Venue Occupancy",
+        "Trainer",
+        "Session"
+    ])
+
+    # =========================
+    # TRAINEE LEVEL DF
+    # =========================
+    df_detailed = pd.DataFrame(detailed_rows, columns=[
+        "Trainee ID",
+        "Group",
+        "Course",
+        "Company",
+        "Stream",
+        "Date",
+        "Day",
+        "Start Time",
+        "End Time",
+        "Venue",
+        "Trainer",
+        "Session"
+    ])
+
+    return df, df_detailed
+
+
+def export_schedule(params: ModelParams, data: ModelInput, S: dict[str, list[int]], solution: ScheduleSolution):
+    """Writes the group and trainee level schedules of a solution and checks it for overlaps."""
+    G = data.groups
+    V = data.venues
+    C = data.courses
 
-        print("\nResult has been exported.")
+    df, df_detailed = schedule_frames(params, data, solution)
 
-        from collections import defaultdict
-        def get_interval(course, session):
-            start = solver.Value(start_session[course, session])
-            end = solver.Value(end_session[course, session])
-            return start, end
+    print("\nSCHEDULE (GROUP LEVEL):")
+    print(df)
 
+    write_csv_atomic(df, f"export/{params.report_name}_schedule.csv")
 
-        def overlap(a_start, a_end, b_start, b_end):
-            return not (a_end <= b_start or b_end <= a_start)
+    print("\nSCHEDULE (TRAINEE LEVEL):")
+    # print(df_detailed)
 
+    write_csv_atomic(df_detailed, f"export/{params.report_name}_trainee_schedule.csv")
 
-        # ===============================
-        # TRAINER OVERLAP CHECK
-        # ===============================
-        trainer_intervals = defaultdict(list)
+    print("\nResult has been exported.")
 
-        for c in C:
-            if c in S:
-                for s in S[c]:
-                    for t in T:
-                        key = (c, s, t)
-                        if key in trainer_session and solver.Value(trainer_session[key]):
-                            trainer_intervals[t].append((c, s, *get_interval(c, s)))
-
-        for t, sessions in trainer_intervals.items():
-            for i in range(len(sessions)):
-                for j in range(i + 1, len(sessions)):
-                    _, _, s1, e1 = sessions[i]
-                    _, _, s2, e2 = sessions[j]
-                    if overlap(s1, e1, s2, e2):
-                        print("🚨 TRAINER OVERLAP:", t, sessions[i], sessions[j])
-
-
-        # ===============================
-        # VENUE OVERLAP CHECK
-        # ===============================
-        venue_intervals = defaultdict(list)
-
-        for c in C:
-            if c in S:
-                for s in S[c]:
-                    for v in V:
-                        if solver.Value(venue_session[c, s, v]):
-                            venue_intervals[v].append((c, s, *get_interval(c, s)))
-
-        for v, sessions in venue_intervals.items():
-            for i in range(len(sessions)):
-                for j in range(i + 1, len(sessions)):
-                    _, _, s1, e1 = sessions[i]
-                    _, _, s2, e2 = sessions[j]
-                    if overlap(s1, e1, s2, e2):
-                        print("🚨 VENUE OVERLAP:", v, sessions[i], sessions[j])
-
-
-        # ===============================
-        # GROUP OVERLAP CHECK
-        # ===============================
-        group_intervals = defaultdict(list)
-
-        for g in G:
-            for c in G[g].courses:
-                if c in S:
-                    for s in S[c]:
-                        if solver.Value(assign[g, c, s]):
-                            group_intervals[g].append((c, s, *get_interval(c, s)))
-
-        for g, sessions in group_intervals.items():
-            for i in range(len(sessions)):
-                for j in range(i + 1, len(sessions)):
-                    _, _, s1, e1 = sessions[i]
-                    _, _, s2, e2 = sessions[j]
-                    if overlap(s1, e1, s2, e2):
-                        print("🚨 GROUP OVERLAP:", g, sessions[i], sessions[j])
-
-
-        # ===============================
-        # VENUE CAPACITY CHECK
-        # ===============================
-        for c in C:
+    from collections import defaultdict
+    def get_interval(course, session):
+        slot = solution.sessions[course, session]
+        return slot.start, slot.end
+
+
+    def overlap(a_start, a_end, b_start, b_end):
+        return not (a_end <= b_start or b_end <= a_start)
+
+
+    # ===============================
+    # TRAINER OVERLAP CHECK
+    # ===============================
+    trainer_intervals = defaultdict(list)
+
+    for c in C:
+        if c in S:
+            for s in S[c]:
+                if (c, s) in solution.sessions and solution.sessions[c, s].trainer:
+                    trainer_intervals[solution.sessions[c, s].trainer].append((c, s, *get_interval(c, s)))
+
+    for t, sessions in trainer_intervals.items():
+        for i in range(len(sessions)):
+            for j in range(i + 1, len(sessions)):
+                _, _, s1, e1 = sessions[i]
+                _, _, s2, e2 = sessions[j]
+                if overlap(s1, e1, s2, e2):
+                    print("🚨 TRAINER OVERLAP:", t, sessions[i], sessions[j])
+
+
+    # ===============================
+    # VENUE OVERLAP CHECK
+    # ===============================
+    venue_intervals = defaultdict(list)
+
+    for c in C:
+        if c in S:
+            for s in S[c]:
+                if (c, s) in solution.sessions and solution.sessions[c, s].venue:
+                    venue_intervals[solution.sessions[c, s].venue].append((c, s, *get_interval(c, s)))
+
+    for v, sessions in venue_intervals.items():
+        for i in range(len(sessions)):
+            for j in range(i + 1, len(sessions)):
+                _, _, s1, e1 = sessions[i]
+                _, _, s2, e2 = sessions[j]
+                if overlap(s1, e1, s2, e2):
+                    print("🚨 VENUE OVERLAP:", v, sessions[i], sessions[j])
+
+
+    # ===============================
+    # GROUP OVERLAP CHECK
+    # ===============================
+    group_intervals = defaultdict(list)
+
+    for g in G:
+        for c in G[g].courses:
             if c in S:
                 for s in S[c]:
+                    if solution.assigned.get((g, c)) == s:
+                        group_intervals[g].append((c, s, *get_interval(c, s)))
 
-                    # compute total occupancy for this session
-                    occupancy = sum(
-                        len(G[g].trainees)
-                        for g in G
-                        if c in G[g].courses
-                        and solver.Value(assign[g, c, s])
-                    )
+    for g, sessions in group_intervals.items():
+        for i in range(len(sessions)):
+            for j in range(i + 1, len(sessions)):
+                _, _, s1, e1 = sessions[i]
+                _, _, s2, e2 = sessions[j]
+                if overlap(s1, e1, s2, e2):
+                    print("🚨 GROUP OVERLAP:", g, sessions[i], sessions[j])
+
+
+    # ===============================
+    # VENUE CAPACITY CHECK
+    # ===============================
+    for c in C:
+        if c in S:
+            for s in S[c]:
+
+                # compute total occupancy for this session
+                occupancy = sum(
+                    len(G[g].trainees)
+                    for g in G
+                    if c in G[g].courses
+                    and solution.assigned.get((g, c)) == s
+                )
 
-                    # check assigned venue
-                    for v in V:
-                        if solver.Value(venue_session[c, s, v]):
-                            if occupancy > V[v].capacity:
-                                print(
-                                    "🚨 CAPACITY BREACH:",
-                                    c, s,
-                                    "venue", v,
-                                    "occupancy", occupancy,
-                                    "capacity", V[v].capacity
-                                )
\ No newline at end of file
+                # check assigned venue
+                v = solution.sessions[c, s].venue if (c, s) in solution.sessions else None
+                if v is not None and occupancy > V[v].capacity:
+                    print(
+                        "🚨 CAPACITY BREACH:",
+                        c, s,
+                        "venue", v,
+                        "occupancy", occupancy,
+                        "capacity", V[v].capacity
+                    )
\ No newline at end of file
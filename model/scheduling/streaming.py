@@ -0,0 +1,88 @@
+from ortools.sat.python import cp_model
+from typing import Callable
+import os
+import threading
+import time
+
+from schema import ModelParams
+
+
+class ScheduleStreamer(cp_model.CpSolverSolutionCallback):
+    """
+    Writes improving solutions to disk while the solver runs, so a killed run keeps its
+    latest schedule. export is called with a value function (the callback's Value) and does
+    the writing, at most once per stream_interval_seconds. Every solution is appended to
+    export/{report_name}_objective_log.csv.
+
+    The search stops early once the relative gap drops to stop_relative_gap, or when no
+    better solution was found for stop_no_improvement_seconds. The second one is checked by
+    a watchdog thread, the callback only runs when a solution comes in.
+    """
+
+    def __init__(self, params: ModelParams, export: Callable[[Callable], None]):
+        super().__init__()
+        self.params = params
+        self.export = export
+        self.log_file = f"export/{params.report_name}_objective_log.csv"
+        self.stage = "objective"
+
+        self.started = time.perf_counter()
+        self.last_improvement = self.started
+        self.last_export = None
+        self.solutions = 0
+        self.exports = 0
+
+        with open(self.log_file, "w") as f:
+            f.write("Time,Stage,Objective,Bound,Gap,Exported\n")
+
+    def OnSolutionCallback(self):
+        now = time.perf_counter()
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        gap = abs(objective - bound) / max(abs(objective), 1)
+
+        self.solutions += 1
+        self.last_improvement = now
+
+        is_exporting = self.last_export is None or now - self.last_export >= self.params.stream_interval_seconds
+        if is_exporting:
+            self.export(self.Value)
+            self.last_export = now
+            self.exports += 1
+
+        with open(self.log_file, "a") as f:
+            f.write(f"{now - self.started:.2f},{self.stage},{objective},{bound},{gap:.6f},{is_exporting}\n")
+
+        if self.params.stop_relative_gap is not None and gap <= self.params.stop_relative_gap:
+            print(f"Streaming: relative gap {gap:.4f} reached, stopping the search")
+            self.StopSearch()
+
+    def solve(self, solver: cp_model.CpSolver, model: cp_model.CpModel, stage: str = "objective") -> int:
+        """solver.Solve with this callback, and the no-improvement watchdog when configured."""
+        self.stage = stage
+        self.last_improvement = time.perf_counter()
+
+        done = threading.Event()
+        window = self.params.stop_no_improvement_seconds
+
+        def watchdog():
+            while not done.wait(1.0):
+                if time.perf_counter() - self.last_improvement >= window:
+                    print(f"Streaming: no improvement for {window}s, stopping the search")
+                    solver.StopSearch()
+                    return
+
+        if window is not None:
+            threading.Thread(target=watchdog, daemon=True).start()
+
+        try:
+            return solver.Solve(model, self)
+        finally:
+            done.set()
+
+
+def write_csv_atomic(df, path: str):
+    """Writes next to the target and renames it over, a reader never sees a partial file."""
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
@@ -1,4 +1,6 @@
-from .schema import Group
+from .schema import Group, CourseBatch, Calendar, Venue
+from typing import Optional
+import heapq
 import pandas as pd
 
 
@@ -50,6 +52,97 @@ def week_to_horizon_slots(week_groups: dict[int, list[int]], week_shifts: dict[i
     return valid_slots
 
 
+def compile_start_domain(
+    course: CourseBatch,
+    calendar: Calendar,
+    hours_per_day: int,
+    is_considering_shift: bool = False,
+    is_weekdays_only: bool = False,
+    blocked_start_time: Optional[set[int]] = None
+) -> list[int]:
+    """
+    Start slots of a course batch left by every restriction that does not depend on a decision:
+        - valid course dates (ISO strings, an empty window is reported and ignored)
+        - weekday cycle, no start on a weekend day
+        - same-day start, start hour + duration stays within the day
+        - shift domain of the batch
+        - unconditional blocked start slots
+    """
+    dur = course.course_batch_duration
+
+    valid_days = [
+        day for day, date in enumerate(calendar.dates)
+            if (course.valid_start_date is None or date.date >= course.valid_start_date)
+            and (course.valid_end_date is None or date.date <= course.valid_end_date)
+    ]
+
+    if not valid_days:
+        print(
+            f"\033[93mWarning: Course {course.id} has no day between {course.valid_start_date} "
+            f"and {course.valid_end_date} in the calendar. Ignoring its valid period.\033[0m"
+        )
+        valid_days = list(range(len(calendar.dates)))
+
+    if is_weekdays_only:
+        weekend = set(calendar.weekend_index)
+        valid_days = [day for day in valid_days if day not in weekend]
+
+    slots = [
+        day * hours_per_day + hour
+            for day in valid_days
+            for hour in range(hours_per_day - dur + 1)
+    ]
+
+    if is_considering_shift and course.valid_start_domain is not None:
+        shift_slots = set(course.valid_start_domain)
+        slots = [slot for slot in slots if slot in shift_slots]
+
+    if blocked_start_time:
+        slots = [slot for slot in slots if slot not in blocked_start_time]
+
+    return slots
+
+
+def venue_classes(venues: dict[str, Venue], is_pooling: bool = False) -> dict[str, list[str]]:
+    """
+    Class name -> rooms. Pooled, venues with the same companies, capacity and virtual flag
+    share a class, otherwise every venue is its own class.
+    """
+    classes = {}
+    for venue in venues.values():
+        key = (tuple(sorted(venue.company)), venue.capacity, venue.is_virtual) if is_pooling else venue.name
+        classes.setdefault(key, []).append(venue.name)
+
+    return {
+        rooms[0] if len(rooms) == 1 else f"{rooms[0]} +{len(rooms) - 1}": rooms
+            for rooms in classes.values()
+    }
+
+
+def assign_rooms(sessions: list[tuple], rooms: list[str]) -> dict:
+    """
+    Interval graph coloring of the (key, start, end) sessions of one venue class. In start
+    order every session takes the lowest free room, which never needs more rooms than the
+    most sessions overlapping at once, the class capacity the model enforces.
+    """
+    free = list(range(len(rooms)))
+    busy = []  # heap of (end, room index)
+    room_of = {}
+
+    for key, start, end in sorted(sessions, key=lambda x: (x[1], x[2])):
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+
+        if not free:
+            raise ValueError(f"More overlapping sessions than rooms in {rooms}")
+
+        room = heapq.heappop(free)
+        heapq.heappush(busy, (end, room))
+        room_of[key] = rooms[room]
+
+    return room_of
+
+
 def export_groups_trainee_to_df(groups: list[Group], report_name: str) -> pd.DataFrame:
     rows = []
 
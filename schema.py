@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Literal, Optional
 
 
@@ -16,6 +16,8 @@ class ModelParams(BaseModel):
     file_master_course_trainee: str
     file_master_course_batch: Optional[list[str]] = None
     file_blocked_schedule: Optional[str] = None
+    file_previous_schedule: Optional[str] = None  # export/{report_name}_schedule.csv of a previous run, used as hints
+    master_cache_dir: Optional[str] = None
 
     minimum_course_participant: int = 0
     maximum_group_size: int = 2000
@@ -30,6 +32,20 @@ class ModelParams(BaseModel):
     is_using_global_sequence: bool = True
     is_considering_shift: bool = False
     is_blocking_schedule: bool = False
+    is_limiting_trainer_company: bool = False
+    is_pooling_venues: bool = False
+    is_matching_trainers: bool = False
+    matching_time_share: float = 0.5  # of the time left by the solve, at least 1s, for the trainer matching
+    is_hinting_scheduling: bool = False
+    scheduling_engine: Literal["cpsat", "greedy"] = "cpsat"
+    is_lexicographic_objective: bool = False
+    lexicographic_time_shares: list[float] = [0.5, 0.25, 0.25]  # of max_time_in_seconds, daily imbalance, virtual sessions, trainer imbalance
+    is_streaming_solutions: bool = False
+    stream_interval_seconds: float = 60  # min time between two intermediate exports
+    stop_relative_gap: Optional[float] = None  # stop once |objective - bound| / objective reaches it
+    stop_no_improvement_seconds: Optional[float] = None  # stop after this long without a better solution
+    is_decomposing_scheduling: bool = False
+    rebalance_time_share: float = 0.25  # of max_time_in_seconds for the daily rebalance of a decomposed run
 
     course_stream: Optional[list[str]] = None
     companies: Optional[list[str]] = None
@@ -38,4 +54,22 @@ class ModelParams(BaseModel):
     num_search_workers: int = 8
 
     is_splitting_batch: bool = False
-    is_scheduling_course: bool = True
\ No newline at end of file
+    is_parallel_batching: bool = False
+    is_aggregating_shift_pattern: bool = False
+    is_decomposing_batching: bool = False
+    is_breaking_batch_symmetry: bool = False
+    is_hinting_batching: bool = False
+    batching_engine: Literal["cpsat", "greedy"] = "cpsat"
+    is_scheduling_course: bool = True
+
+    @field_validator("lexicographic_time_shares")
+    @classmethod
+    def check_lexicographic_time_shares(cls, shares: list[float]) -> list[float]:
+        # One positive share per objective stage, a stage is never dropped or left without time
+        if len(shares) != 3:
+            raise ValueError(f"lexicographic_time_shares needs 3 shares, one per objective stage, got {len(shares)}")
+
+        if any(share <= 0 for share in shares):
+            raise ValueError(f"lexicographic_time_shares must all be positive, got {shares}")
+
+        return shares
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Modules import the root schema.py as a top-level module, like main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def course_batch():
+    """CourseBatch factory, the fields a test does not set get neutral values."""
+    from model.scheduling.schema import CourseBatch
+
+    def make(
+        name: str = "Course",
+        company: str = "CO1",
+        duration: int = 2,
+        prerequisites: list[str] = (),
+        global_sequence: list[str] = (),
+        **kwargs
+    ) -> CourseBatch:
+        return CourseBatch(
+            company=company, name=name, stream="Operation", duration=duration,
+            prerequisites=list(prerequisites), global_sequence=list(global_sequence),
+            batch_number=kwargs.pop("batch_number", 1), **kwargs
+        )
+
+    return make
@@ -0,0 +1,181 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmark.synthetic import write_dataset
+from model.batching.data import read_data
+from model.batching.greedy import greedy_course
+from model.batching.schema import CourseStats
+from model.batching.solver import run_decomposed, run_solver, solve_company, trainee_units
+from model.master.data import read_master
+
+
+@pytest.fixture(scope="module")
+def params(tmp_path_factory):
+    return write_dataset(
+        str(tmp_path_factory.mktemp("batching")),
+        companies=2, trainees=40, courses=3, trainers=4, venues=2, courses_per_trainee=2,
+        is_splitting_batch=True, master_cache_dir=None, max_time_in_seconds=10, num_search_workers=1
+    )
+
+
+def enrolled(data) -> set[tuple[str, str, str]]:
+    """(company, course, trainee) of every enrollment in the batching input."""
+    return {
+        (company, course.name, trainee)
+            for company, partition in data.items()
+                for course in partition.courses.values()
+                    for trainee in course.trainees
+    }
+
+
+def test_read_data_partitions_by_company(params):
+    master = read_master(params)
+    data = read_data(params, master)
+
+    assert list(data) == params.companies
+
+    company_of = dict(zip(master.trainee["employee_id"].astype(str), master.trainee["company"]))
+    for company, partition in data.items():
+        assert partition.courses
+        assert all(course.company == company for course in partition.courses.values())
+        assert all(company_of[trainee] == company for trainee in partition.shifts)
+
+    assert all(company_of[trainee] == company for company, _, trainee in enrolled(data))
+
+
+def batch_file(params, path, **update) -> pd.DataFrame:
+    """Runs the batching in path and reads back its export."""
+    cwd = os.getcwd()
+    os.chdir(path)
+    os.makedirs("export", exist_ok=True)
+    try:
+        run_solver(params.model_copy(update=update))
+    finally:
+        os.chdir(cwd)
+
+    return pd.read_csv(path / "export" / f"{params.report_name}_batch.csv", dtype=str)
+
+
+def test_parallel_batching_batches_every_trainee_once(params, tmp_path):
+    sequential = batch_file(params, tmp_path, is_parallel_batching=False)
+    parallel = batch_file(params, tmp_path, is_parallel_batching=True)
+
+    expected = enrolled(read_data(params))
+    for df in (sequential, parallel):
+        rows = list(df[["company", "course_name", "trainee_id"]].itertuples(index=False, name=None))
+        assert len(rows) == len(set(rows))
+        assert set(rows) == expected
+
+    # Companies keep the params.companies order in the export
+    assert list(parallel["company"].drop_duplicates()) == params.companies
+
+
+def test_trainee_units_group_one_shift_pattern():
+    S = {"a": {0: 1, 1: 0}, "b": {0: 1, 1: 0}, "c": {0: 2, 1: 0}}
+
+    assert trainee_units(["a", "b", "c", "d"], S, True) == {
+        (1, 0): ((1, 0), ["a", "b"]),
+        (2, 0): ((2, 0), ["c"]),
+        None: (None, ["d"]),
+    }
+    assert list(trainee_units(["a", "b"], S, False)) == ["a", "b"]
+
+
+def optimal_objective(params, company, data, capsys) -> float:
+    """Objective printed by an optimal solve of one company."""
+    solve_company(params, company, data, params.num_search_workers)
+    out = capsys.readouterr().out
+
+    assert "Status: OPTIMAL" in out
+    return float(out.split("Objective value: ")[-1].split()[0])
+
+
+def test_shift_pattern_aggregation_keeps_the_optimum(params, capsys):
+    data = read_data(params)
+
+    for company, partition in data.items():
+        aggregated = params.model_copy(update={"is_aggregating_shift_pattern": True})
+        per_trainee = params.model_copy(update={"is_aggregating_shift_pattern": False})
+
+        assert optimal_objective(aggregated, company, partition, capsys) == optimal_objective(per_trainee, company, partition, capsys)
+
+
+def test_decomposed_batching_batches_every_trainee_once(params):
+    data = read_data(params)
+    frames = run_decomposed(params, data)
+
+    assert list(frames) == params.companies
+
+    rows = [
+        (company, row.course_name, row.trainee_id)
+            for company, df in frames.items()
+                for row in df.itertuples()
+    ]
+    assert len(rows) == len(set(rows))
+    assert set(rows) == enrolled(data)
+
+
+def test_symmetry_breaking_keeps_the_optimum(params, capsys):
+    data = read_data(params)
+
+    for company, partition in data.items():
+        breaking = params.model_copy(update={"is_breaking_batch_symmetry": True})
+        plain = params.model_copy(update={"is_breaking_batch_symmetry": False})
+
+        assert optimal_objective(breaking, company, partition, capsys) == optimal_objective(plain, company, partition, capsys)
+
+
+def course_stats(trainees: list[str], capacity: int, min_batches: int) -> CourseStats:
+    return CourseStats(
+        company="CO1", name="Course", trainees=trainees, count_trainee=len(trainees), count_trainers=1,
+        max_venue_capacity_available=capacity, min_batches=min_batches
+    )
+
+
+def test_greedy_course_stays_within_max_batches():
+    course = course_stats([str(i) for i in range(10)], capacity=4, min_batches=0)
+    assert course.max_batches == 3
+
+    batches = greedy_course(course, {})
+
+    assert [len(batch.trainees) for batch in batches] == [4, 3, 3]
+    assert {batch.week for batch in batches} == {0}
+
+
+def test_greedy_course_keeps_shift_1_and_shift_2_apart():
+    patterns = {"a": [1, 0, 0, 0], "b": [1, 0, 0, 0], "c": [2, 0, 0, 0], "d": [2, 0, 0, 0], "e": [0, 0, 0, 0]}
+
+    batches = greedy_course(course_stats(list(patterns), capacity=10, min_batches=3), patterns)
+
+    assert sorted(sorted(batch.trainees) for batch in batches) == [["a", "b", "e"], ["c", "d"]]
+    assert sorted(batch.week_shifts[0] for batch in batches) == [1, 2]
+
+
+def test_greedy_course_skips_shift_3_weeks():
+    patterns = {"a": [3, 3, 0, 0], "b": [0, 0, 0, 0]}
+
+    batches = greedy_course(course_stats(list(patterns), capacity=10, min_batches=3), patterns)
+
+    assert {batch.trainees[0]: batch.week for batch in batches} == {"b": 0, "a": 2}
+    assert next(batch for batch in batches if batch.trainees == ["a"]).week_shifts == [3, 3, 0, 0]
+
+
+def test_greedy_course_moves_a_full_budget_to_a_later_week():
+    patterns = {"a": [1, 0, 0, 0], "b": [1, 0, 0, 0], "c": [2, 0, 0, 0], "d": [2, 0, 0, 0]}
+
+    # One batch only: Shift 1 and Shift 2 can share it in the second week, where all are NonShift
+    batches = greedy_course(course_stats(list(patterns), capacity=4, min_batches=1), patterns)
+
+    assert len(batches) == 1
+    assert batches[0].week == 1
+    assert batches[0].trainees == ["a", "b", "c", "d"]
+
+
+def test_greedy_course_without_a_fit():
+    patterns = {"a": [3, 3, 3, 3]}
+    assert greedy_course(course_stats(list(patterns), capacity=10, min_batches=3), patterns) is None
+
+    patterns = {"a": [1, 1, 1, 1], "b": [2, 2, 2, 2]}
+    assert greedy_course(course_stats(list(patterns), capacity=10, min_batches=1), patterns) is None
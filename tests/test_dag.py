@@ -0,0 +1,33 @@
+import pytest
+
+from model.scheduling.dag import check_prerequisite_cycles, critical_path, find_cycle, start_bounds, topological_order
+
+
+def test_find_cycle():
+    assert find_cycle({"a": ["b"], "b": ["c"]}) is None
+    assert find_cycle({"a": ["b"], "b": ["c"], "c": ["a"]}) == ["a", "b", "c", "a"]
+
+
+def test_prerequisite_cycle_stops_the_run(course_batch):
+    a, b = "[CO1]-[A]-[1]", "[CO1]-[B]-[1]"
+
+    check_prerequisite_cycles({a: course_batch("A"), b: course_batch("B", prerequisites=[a])})
+
+    with pytest.raises(SystemExit):
+        check_prerequisite_cycles({a: course_batch("A", prerequisites=[b]), b: course_batch("B", prerequisites=[a])})
+
+
+def test_topological_order_and_critical_path():
+    edges = {("a", "b"): 2, ("b", "c"): 3, ("a", "c"): 1}
+
+    assert topological_order(["c", "b", "a"], edges) == ["a", "b", "c"]
+    assert critical_path(["a", "b", "c"], edges, {"a": 2, "b": 3, "c": 4}) == (9, ["a", "b", "c"])
+
+
+def test_start_bounds_snap_to_domains():
+    domains = {"a": [0, 1, 2, 8], "b": [0, 5, 9, 10]}
+
+    assert start_bounds(domains, {("a", "b"): 4}) == {"a": (0, 2), "b": (5, 10)}
+
+    # No start of b is 11 slots after a start of a
+    assert start_bounds(domains, {("a", "b"): 11}) == {"a": (None, None), "b": (None, None)}
@@ -0,0 +1,45 @@
+from model.scheduling.decomposition import interaction_components
+from model.scheduling.schema import Calendar, Group, ModelInput, Trainer, Venue
+
+
+def data(course_batch, trainers: dict[str, list[str]]) -> ModelInput:
+    courses = {
+        "A1": course_batch("A1", company="CO1"),
+        "A2": course_batch("A2", company="CO1", prerequisites=["A1"]),
+        "B1": course_batch("B1", company="CO2"),
+        "X": course_batch("X", company="CO3"),  # taken by no group
+    }
+
+    return ModelInput(
+        calendar=Calendar("2026-03-02", 5),
+        venues={
+            "R1": Venue(company=["CO1"], name="R1", capacity=10),
+            "R2": Venue(company=["CO2"], name="R2", capacity=10),
+        },
+        trainers={name: Trainer(name=name, eligible=eligible) for name, eligible in trainers.items()},
+        courses=courses,
+        groups={
+            "G1": Group(name="G1", courses=["A1"], trainees=["1"]),
+            "G2": Group(name="G2", courses=["A2"], trainees=["2"]),
+            "G3": Group(name="G3", courses=["B1"], trainees=["3"]),
+        }
+    )
+
+
+def test_companies_without_shared_resources_split(course_batch):
+    components = interaction_components(data(course_batch, {"T1": ["A1", "A2", "X"], "T2": ["B1"], "T3": []}))
+
+    assert [sorted(component.courses) for component in components] == [["A1", "A2"], ["B1"]]
+    assert [sorted(component.groups) for component in components] == [["G1", "G2"], ["G3"]]
+    assert [sorted(component.venues) for component in components] == [["R1"], ["R2"]]
+
+    # Trainers only keep the courses of their component, unused trainers are left out
+    assert {name: trainer.eligible for name, trainer in components[0].trainers.items()} == {"T1": ["A1", "A2"]}
+    assert list(components[1].trainers) == ["T2"]
+
+
+def test_a_shared_trainer_joins_components(course_batch):
+    components = interaction_components(data(course_batch, {"T1": ["A1", "B1"]}))
+
+    assert len(components) == 1
+    assert sorted(components[0].courses) == ["A1", "A2", "B1"]
@@ -0,0 +1,23 @@
+from model.scheduling.hints import read_schedule_hints
+from model.scheduling.schema import Calendar, ModelInput
+
+
+def test_read_schedule_hints(tmp_path):
+    file = tmp_path / "report_schedule.csv"
+    file.write_text(
+        "Group,Course,Date,Start Hour,Venue,Trainer,Session\n"
+        "G1,C1,2026-03-03,2,Room 1,5001,0\n"
+        "G2,C1,2026-03-03,2,Room 1,5001,0\n"
+        "G1,C2,2026-03-02,0,Room 2,,1\n"
+        "G1,C3,2027-01-01,0,,5002,0\n"
+    )
+    data = ModelInput(calendar=Calendar("2026-03-02", 5), venues={}, trainers={}, courses={}, groups={})
+
+    hints = read_schedule_hints(str(file), data, hours_per_day=8)
+
+    # One hint per session, starts from the date, empty cells and unknown dates are None
+    assert hints == {
+        ("C1", 0): {"start": 10, "venue": "Room 1", "trainer": "5001"},
+        ("C2", 1): {"start": 0, "venue": "Room 2", "trainer": None},
+        ("C3", 0): {"start": None, "venue": None, "trainer": "5002"},
+    }
@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import contextlib
+
+from benchmark.synthetic import write_dataset
+from model.master.data import read_master, read_master_file
+from model.scheduling.data import read_trainees
+
+
+def test_cache_is_invalidated_when_the_file_changes(tmp_path):
+    file = tmp_path / "venue.csv"
+    file.write_text("venue_name,company,capacity\n Room 1 ,CO1,10\n")
+    cache_dir = str(tmp_path / "cache")
+
+    first = read_master_file(str(file), ["venue_name", "company"], cache_dir)
+    assert first["venue_name"].tolist() == ["Room 1"]
+    assert os.listdir(cache_dir)
+
+    cached = read_master_file(str(file), ["venue_name", "company"], cache_dir)
+    assert cached.equals(first)
+
+    file.write_text("venue_name,company,capacity\nRoom 2,CO1,20\n")
+    changed = read_master_file(str(file), ["venue_name", "company"], cache_dir)
+    assert changed["venue_name"].tolist() == ["Room 2"]
+
+
+def test_corrupt_cache_meta_is_a_miss(tmp_path):
+    file = tmp_path / "venue.csv"
+    file.write_text("venue_name,company,capacity\nRoom 1,CO1,10\n")
+    cache_dir = tmp_path / "cache"
+
+    read_master_file(str(file), ["venue_name", "company"], str(cache_dir))
+    for meta_file in cache_dir.glob("*.json"):
+        meta_file.write_text('{"version": 1, "colu')
+
+    df = read_master_file(str(file), ["venue_name", "company"], str(cache_dir))
+    assert df["venue_name"].tolist() == ["Room 1"]
+
+    # The miss writes a readable cache again
+    assert all(json.loads(meta_file.read_text())["columns"] == ["venue_name", "company"] for meta_file in cache_dir.glob("*.json"))
+
+
+def test_eligibility_is_built_once(tmp_path):
+    params = write_dataset(str(tmp_path), companies=1, trainees=20, courses=3, master_cache_dir=None)
+    master = read_master(params)
+
+    assert master.eligibility is master.eligibility
+    assert master.eligibility.pairs
+
+
+def test_read_trainees_with_course_stream(tmp_path):
+    params = write_dataset(str(tmp_path), companies=2, trainees=60, courses=6, master_cache_dir=None)
+    master = read_master(params)
+    course = master.course
+
+    stream = sorted(course["stream"].unique())[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        groups = read_trainees(params.model_copy(update={"course_stream": [stream]}), master)
+
+    # The shared master frame is left untouched
+    assert master.course is course
+
+    # Course batch ids are [company]-[course name]-[batch number]
+    streams = dict(zip(course["course_name"], course["stream"]))
+    assert groups
+    assert all(streams[batch.split("]-[")[1]] == stream for group in groups.values() for batch in group.courses)
@@ -0,0 +1,54 @@
+from ortools.sat.python import cp_model
+
+from model.scheduling.precedence import PrecedenceRegistry
+
+
+A, B, C = ("a", 0), ("b", 0), ("c", 0)
+
+
+def test_duplicates_keep_the_largest_offset():
+    registry = PrecedenceRegistry()
+    registry.add(A, B, 1)
+    registry.add(A, B, 3)
+
+    assert registry.added == 2
+    assert registry.edges == {(A, B, ()): 3}
+
+
+def test_reduce_drops_edges_implied_by_a_chain():
+    model = cp_model.CpModel()
+    literal = model.NewBoolVar("assign")
+
+    registry = PrecedenceRegistry()
+    registry.add(A, B, 2)
+    registry.add(B, C, 2)
+    registry.add(A, C, 3)  # implied, the chain is 4
+    registry.add(A, C, 4, [literal])  # implied under any enforcement
+
+    assert registry.reduce() == 2
+    assert set(registry.edges) == {(A, B, ()), (B, C, ())}
+
+
+def test_reduce_keeps_a_longer_direct_edge():
+    registry = PrecedenceRegistry()
+    registry.add(A, B, 1)
+    registry.add(B, C, 1)
+    registry.add(A, C, 5)
+
+    assert registry.reduce() == 0
+    assert len(registry.edges) == 3
+
+
+def test_posted_precedences_hold_in_the_solution():
+    model = cp_model.CpModel()
+    start = {key: model.NewIntVar(0, 10, f"start_{key[0]}") for key in (A, B, C)}
+
+    registry = PrecedenceRegistry()
+    registry.add(A, B, 2)
+    registry.add(B, C, 3)
+    registry.post(model, start)
+    model.Minimize(start[C])
+
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.Value(start[C]) == 5
@@ -0,0 +1,284 @@
+import contextlib
+import io
+import os
+
+import pandas as pd
+import pytest
+from ortools.sat.python import cp_model
+
+from benchmark.synthetic import write_dataset
+from model.scheduling.greedy import greedy_schedule, solution_hints
+from model.scheduling.lexicographic import solve_lexicographic
+from model.scheduling.matching import match_trainers
+from model.scheduling.schema import Calendar, Group, ModelInput, Trainer, TrainerEligibility, Venue
+from model.scheduling.solver import build_model, run_solver
+from model.scheduling.streaming import ScheduleStreamer, write_csv_atomic
+from schema import ModelParams
+
+
+def test_trainer_eligibility_indexes_both_directions():
+    eligible = TrainerEligibility.from_trainers({
+        "T1": Trainer(name="T1", eligible=["A", "B", "A"]),
+        "T2": Trainer(name="T2", eligible=["B"]),
+        "T3": Trainer(name="T3", eligible=[]),
+    })
+
+    assert eligible.by_trainer == {"T1": ["A", "B"], "T2": ["B"], "T3": []}
+    assert eligible.by_course == {"A": ["T1"], "B": ["T1", "T2"]}
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    """Schedule of a small synthetic data set, with what the run printed."""
+    path = tmp_path_factory.mktemp("scheduling")
+    params = write_dataset(
+        str(path / "data"),
+        companies=2, trainees=30, courses=3, trainers=3, venues=2, courses_per_trainee=2, days=5,
+        master_cache_dir=None, max_time_in_seconds=20, num_search_workers=1
+    )
+
+    cwd = os.getcwd()
+    os.chdir(path)
+    os.makedirs("export")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            run_solver(params)
+    finally:
+        os.chdir(cwd)
+
+    return params, pd.read_csv(path / "export" / f"{params.report_name}_schedule.csv"), out.getvalue()
+
+
+def test_schedule_keeps_the_daily_limit(exported):
+    params, df, out = exported
+
+    assert not df.empty
+    assert "🚨" not in out
+    assert (df["Start Day"] == df["End Day"]).all()
+
+    hours = (df["End Hour"] - df["Start Hour"]).groupby([df["Group"], df["Start Day"]]).sum()
+    assert hours.max() <= params.maximum_session_length
+
+
+def test_sessions_use_a_venue_of_their_company(exported):
+    _, df, _ = exported
+
+    assert all(venue.startswith(f"{company} ") for venue, company in zip(df["Venue"], df["Company"]))
+    assert (df["Venue Occupancy"] <= df["Venue Max Capacity"]).all()
+
+
+def tiny_params(days: int, **kwargs) -> ModelParams:
+    files = {
+        f"file_master_{name}": "" for name in (
+            "venue", "trainer", "course", "trainee", "course_trainer", "course_sequence", "course_trainee"
+        )
+    }
+
+    return ModelParams(
+        **files, start_date="2026-03-02", days=days, max_time_in_seconds=10, num_search_workers=1, **kwargs
+    )
+
+
+def tiny_input(
+    course_batch,
+    days: int,
+    courses: dict[str, str],
+    groups: dict[str, list[str]],
+    trainers: dict[str, list[str]],
+    venues: dict[str, str],
+    duration: int = 2
+) -> ModelInput:
+    """Courses and venues by name -> company, groups and trainers by name -> course names."""
+    batches = {name: course_batch(name=name, company=company, duration=duration) for name, company in courses.items()}
+
+    return ModelInput(
+        calendar=Calendar("2026-03-02", days),
+        venues={name: Venue(company=[company], name=name, capacity=10) for name, company in venues.items()},
+        trainers={
+            name: Trainer(name=name, eligible=[batches[course].id for course in eligible])
+                for name, eligible in trainers.items()
+        },
+        courses={batch.id: batch for batch in batches.values()},
+        groups={
+            name: Group(name=name, courses=[batches[course].id for course in taken], trainees=[f"{name}-1"])
+                for name, taken in groups.items()
+        }
+    )
+
+
+def solve(params: ModelParams, data: ModelInput):
+    schedule = build_model(params, data)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = params.max_time_in_seconds
+    solver.parameters.num_search_workers = params.num_search_workers
+
+    return schedule, solver, solver.Solve(schedule.model)
+
+
+def test_trainer_serves_one_company_per_day(course_batch):
+    def run(days, is_limiting):
+        params = tiny_params(days, companies=["CO1", "CO2"], is_limiting_trainer_company=is_limiting)
+        data = tiny_input(
+            course_batch, days,
+            courses={"A": "CO1", "B": "CO2"},
+            groups={"G1": ["A"], "G2": ["B"]},
+            trainers={"T1": ["A", "B"]},
+            venues={"R1": "CO1", "R2": "CO2"}
+        )
+        return solve(params, data)
+
+    # One trainer, one course per company: on a single day only without the rule
+    assert run(1, False)[2] == cp_model.OPTIMAL
+    assert run(1, True)[2] == cp_model.INFEASIBLE
+
+    schedule, solver, status = run(2, True)
+    assert status == cp_model.OPTIMAL
+    assert len({solver.Value(schedule.start_session[course, 0]) // 8 for course in schedule.sessions}) == 2
+
+
+def test_single_session_courses_are_folded(course_batch):
+    params = tiny_params(2)
+    data = tiny_input(
+        course_batch, 2,
+        courses={"A": "CO1", "B": "CO1", "C": "CO1"},
+        groups={"G1": ["A", "B", "C"]},
+        trainers={"T1": ["A", "B", "C"]},
+        venues={"R1": "CO1"}
+    )
+
+    schedule, solver, status = solve(params, data)
+
+    assert all(schedule.assign["G1", course, 0] == 1 for course in data.courses)
+
+    # Three 2 hour courses over two days: 4 and 2 hours, the weighted daily imbalance
+    assert status == cp_model.OPTIMAL
+    assert solver.ObjectiveValue() == 2 * 1000
+
+
+def test_matching_mode_keeps_sessions_of_one_trainer_apart(course_batch):
+    params = tiny_params(1, is_matching_trainers=True)
+    data = tiny_input(
+        course_batch, 1,
+        courses={"A": "CO1", "B": "CO1"},
+        groups={"G1": ["A"], "G2": ["B"]},
+        trainers={"T1": ["A", "B"]},
+        venues={"R1": "CO1", "R2": "CO1"},
+        duration=4
+    )
+
+    schedule, solver, status = solve(params, data)
+    assert status == cp_model.OPTIMAL
+    assert not schedule.trainer_session
+
+    # The trainer pool allows one session at a time, the matching then finds the trainer
+    times = {
+        (course, 0): (solver.Value(schedule.start_session[course, 0]), solver.Value(schedule.end_session[course, 0]))
+            for course in schedule.sessions
+    }
+    (a_start, a_end), (b_start, b_end) = times.values()
+    assert a_end <= b_start or b_end <= a_start
+
+    assert match_trainers(params, data, schedule.eligible, times, params.max_time_in_seconds) == {key: "T1" for key in times}
+
+
+def test_greedy_schedule_places_every_session_without_overlap(course_batch):
+    params = tiny_params(2)
+    data = tiny_input(
+        course_batch, 2,
+        courses={"A": "CO1", "B": "CO1", "C": "CO1", "D": "CO1"},
+        groups={"G1": ["A", "B"], "G2": ["C", "D"]},
+        trainers={"T1": ["A", "B", "C", "D"]},
+        venues={"R1": "CO1", "R2": "CO1"}
+    )
+
+    schedule = build_model(params, data)
+    solution = greedy_schedule(params, data, schedule)
+
+    assert set(solution.sessions) == {(course, 0) for course in data.courses}
+    assert set(solution.assigned) == {(group, course) for group in data.groups for course in data.groups[group].courses}
+
+    # A single trainer runs every session, so none may overlap
+    slots = sorted((slot.start, slot.end) for slot in solution.sessions.values())
+    assert all(end <= start for (_, end), (start, _) in zip(slots, slots[1:]))
+
+    assert solution_hints(solution) == {
+        key: {"start": slot.start, "venue": slot.venue, "trainer": "T1"} for key, slot in solution.sessions.items()
+    }
+
+
+def test_lexicographic_stages_reach_the_weighted_optimum(course_batch):
+    params = tiny_params(2, is_lexicographic_objective=True)
+    data = tiny_input(
+        course_batch, 2,
+        courses={"A": "CO1", "B": "CO1", "C": "CO1"},
+        groups={"G1": ["A", "B", "C"]},
+        trainers={"T1": ["A", "B", "C"], "T2": ["A", "B", "C"]},
+        venues={"R1": "CO1"}
+    )
+
+    schedule = build_model(params, data)
+    solver, status = solve_lexicographic(params, schedule)
+
+    # Same daily imbalance as the weighted objective, then the trainers split 4 and 2 hours
+    assert status == cp_model.OPTIMAL
+    assert solver.Value(schedule.daily_imbalance) == 2
+    assert solver.Value(schedule.virtual_sessions) == 0
+    assert solver.Value(schedule.trainer_imbalance) == 2
+
+
+def test_streamer_exports_and_logs_every_solution(course_batch, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("export")
+
+    params = tiny_params(2, is_streaming_solutions=True, stream_interval_seconds=0, report_name="tiny")
+    data = tiny_input(
+        course_batch, 2,
+        courses={"A": "CO1", "B": "CO1", "C": "CO1"},
+        groups={"G1": ["A", "B", "C"]},
+        trainers={"T1": ["A", "B", "C"]},
+        venues={"R1": "CO1"}
+    )
+
+    schedule = build_model(params, data)
+    exported = []
+    streamer = ScheduleStreamer(params, lambda value: exported.append(value(schedule.daily_imbalance)))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 1
+    status = streamer.solve(solver, schedule.model)
+
+    # With no interval every solution is exported, the last one is the optimum
+    assert status == cp_model.OPTIMAL
+    assert len(exported) == streamer.solutions == streamer.exports > 0
+    assert exported[-1] == 2
+
+    log = pd.read_csv("export/tiny_objective_log.csv")
+    assert len(log) == streamer.solutions
+    assert log["Exported"].all()
+
+
+def test_csv_is_replaced_in_one_step(tmp_path):
+    path = str(tmp_path / "schedule.csv")
+    write_csv_atomic(pd.DataFrame({"Course": ["A"]}), path)
+    write_csv_atomic(pd.DataFrame({"Course": ["B", "C"]}), path)
+
+    assert pd.read_csv(path)["Course"].tolist() == ["B", "C"]
+    assert os.listdir(tmp_path) == ["schedule.csv"]
+
+
+def test_matching_mode_leaves_courses_without_trainers_out_of_the_pools(course_batch):
+    params = tiny_params(1, is_matching_trainers=True)
+    data = tiny_input(
+        course_batch, 1,
+        courses={"A": "CO1", "B": "CO1"},
+        groups={"G1": ["A"], "G2": ["B"]},
+        trainers={"T1": []},
+        venues={"R1": "CO1", "R2": "CO1"}
+    )
+
+    # No trainer for either course: no cumulative of capacity 0 makes the model infeasible
+    schedule, solver, status = solve(params, data)
+
+    assert status == cp_model.OPTIMAL
+    assert "cumulative" not in str(schedule.model.Proto())
@@ -0,0 +1,57 @@
+import pytest
+
+from model.scheduling.schema import Calendar, Venue
+from model.scheduling.utils import assign_rooms, compile_start_domain, venue_classes
+
+
+HOURS_PER_DAY = 8
+
+
+def test_start_domain_keeps_sessions_within_the_day(course_batch):
+    calendar = Calendar("2026-03-02", 2)  # Monday, Tuesday
+
+    assert compile_start_domain(course_batch(duration=6), calendar, HOURS_PER_DAY) == [0, 1, 2, 8, 9, 10]
+
+
+def test_start_domain_valid_dates_and_blocks(course_batch):
+    calendar = Calendar("2026-03-02", 3)
+
+    domain = compile_start_domain(
+        course_batch(duration=7, valid_start_date="2026-03-03"), calendar, HOURS_PER_DAY, blocked_start_time={9}
+    )
+
+    assert domain == [8, 16, 17]
+
+
+def test_start_domain_weekdays_only(course_batch):
+    calendar = Calendar("2026-03-06", 2)  # Friday, Saturday
+
+    domain = compile_start_domain(course_batch(duration=8), calendar, HOURS_PER_DAY, is_weekdays_only=True)
+
+    assert domain == [0]
+
+
+def test_venue_classes_pool_identical_rooms():
+    venues = {
+        "A": Venue(company=["CO1"], name="A", capacity=20),
+        "B": Venue(company=["CO1"], name="B", capacity=20),
+        "C": Venue(company=["CO1"], name="C", capacity=30),
+    }
+
+    assert venue_classes(venues) == {"A": ["A"], "B": ["B"], "C": ["C"]}
+    assert venue_classes(venues, is_pooling=True) == {"A +1": ["A", "B"], "C": ["C"]}
+
+
+def test_assign_rooms_colors_overlapping_sessions():
+    sessions = [("s1", 0, 4), ("s2", 2, 6), ("s3", 4, 8)]
+
+    room_of = assign_rooms(sessions, ["A", "B"])
+
+    assert room_of["s1"] != room_of["s2"]
+    assert room_of["s2"] != room_of["s3"]
+    assert room_of["s3"] == room_of["s1"]
+
+
+def test_assign_rooms_rejects_more_sessions_than_rooms():
+    with pytest.raises(ValueError):
+        assign_rooms([("s1", 0, 4), ("s2", 1, 5)], ["A"])